@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+from typing import Any, List
+
+from serialization import dump_json, load_json
+
+# Analiz çıktılarının (AI analizleri, bölüm dilleri, ilk stil rehberi) disk önbelleği.
+# Anahtar; kaynak dosyanın özeti, ilgili promptların özeti, model ve sonucu etkileyen ayarlardan üretilir,
+# böylece aynı kitabın yeniden analizi (hedef dil değişikliği, yeniden başlatma, çökme sonrası) API çağrısı
+# yapılmadan döner. Her kayıt ayrı bir dosyadır ("<tür>-<anahtar>.json") ve üretildiği promptların özetini taşır;
+# promptlar değiştiğinde invalidate_artifacts eski promptlarla üretilmiş kayıtları siler.
+
+_CACHE_LIMIT = 100  # Her tür için tutulan en fazla kayıt; aşılınca en eskiler silinir
+
+
+def fingerprint(*parts: Any) -> str:
+    """JSON'a dönüştürülebilen değerlerin kararlı özetini döndürür (sözlük anahtarlarının sırası önemsizdir)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _artifact_path(cache_dir: str, kind: str, key: str) -> str:
+    return os.path.join(cache_dir, f"{kind}-{key}.json")
+
+
+def load_artifact(cache_dir: str, kind: str, key: str) -> Any | None:
+    """Önbellekteki kaydın değerini döndürür; yoksa veya okunamazsa None."""
+    try:
+        with open(_artifact_path(cache_dir, kind, key), 'r', encoding='utf-8') as f:
+            return load_json(f).get("value")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def store_artifact(cache_dir: str, kind: str, key: str, value: Any, prompts_fingerprint: str = ""):
+    """Kaydı atomik olarak yazar; tür başına _CACHE_LIMIT aşılırsa en eski kayıtlar silinir."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _artifact_path(cache_dir, kind, key)
+    temp_file = path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        dump_json({"prompts": prompts_fingerprint, "value": value}, f)
+    os.replace(temp_file, path)
+
+    entries = sorted(_kind_entries(cache_dir, kind), key=os.path.getmtime)
+    for stale in entries[:-_CACHE_LIMIT]:
+        _remove(stale)
+
+
+def invalidate_artifacts(cache_dir: str, kind: str, prompts_fingerprint: str) -> int:
+    """Türün, verilen prompt özetinden farklı promptlarla üretilmiş kayıtlarını siler; silinen kayıt sayısını döndürür."""
+    removed = 0
+    for path in _kind_entries(cache_dir, kind):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = load_json(f).get("prompts")
+        except (OSError, ValueError, AttributeError):
+            stored = None
+        if stored != prompts_fingerprint and _remove(path):
+            removed += 1
+    return removed
+
+
+def _kind_entries(cache_dir: str, kind: str) -> List[str]:
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return []
+    return [os.path.join(cache_dir, name) for name in names if name.startswith(kind + "-") and name.endswith(".json")]
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,177 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from language_detection import sample_paragraphs
+
+# Analizden önce türün tahmini için çok dilli anahtar kelime sözlüğü.
+# Her tür için, uygulamanın desteklediği her dilde ağırlıklı anahtar kelimeler tutulur ("kelime:ağırlık", ağırlık
+# verilmezse 1). Kelimeler kök olarak yazılır ve kelime başından eşleşir ("murder" -> "murdered", "cinayet" -> "cinayeti").
+# Bir dilin tüm kelimeleri tek bir desende birleştirilir; metnin örneklenmiş hâli tek geçişte taranır.
+# Tür adları uygulamadaki tür listesindeki adlardır.
+
+GENRE_LEXICON = {
+    "Polisiye": {
+        "en": "detective:2, murder:2, inspector:2, homicide:2, suspect, police, clue, alibi, corpse, forensic",
+        "tr": "dedektif:2, cinayet:2, komiser:2, katil:2, şüpheli, polis, ipucu, ceset, cesed, otopsi",
+        "de": "detektiv:2, mord:2, kommissar:2, mörder:2, verdächtig, polizei, leiche, alibi, spur",
+        "fr": "détective:2, meurtre:2, inspecteur:2, assassin:2, enquête, suspect, police, cadavre, indice, alibi",
+        "es": "detective:2, asesin:2, inspector:2, homicidio:2, sospechos, policía, cadáver, pista, coartada",
+        "it": "detective:2, omicidi:2, ispettore:2, assassin:2, sospett, polizia, cadavere, indizi, alibi",
+        "pt": "detetive:2, assassin:2, inspetor:2, homicídio:2, suspeit, polícia, cadáver, pista, álibi",
+        "ru": "детектив:2, убийств:2, следовател:2, убийц:2, подозрева, полици, труп, улик, алиби",
+        "ja": "刑事:2, 探偵:2, 殺人:2, 容疑者:2, 警察, 事件, 犯人, 死体, アリバイ",
+        "zh": "侦探:2, 谋杀:2, 凶手:2, 嫌疑:2, 警察, 案件, 尸体, 线索, 不在场",
+        "ko": "형사:2, 탐정:2, 살인:2, 용의자:2, 경찰, 사건, 범인, 시체, 알리바이",
+        "ar": "محقق:2, جريمة:2, قاتل:2, مشتبه:2, شرطة, جثة, دليل",
+        "hi": "जासूस:2, हत्या:2, हत्यारा:2, इंस्पेक्टर:2, पुलिस, संदिग्ध, लाश, सुराग",
+    },
+    "Romantik": {
+        "en": "kiss:2, lover:2, romance:2, beloved:2, heart, wedding, darling, passion, embrace",
+        "tr": "aşk:2, sevgili:2, öpücük:2, öptü:2, kalbi, kalbim, sevgi, düğün, tutku",
+        "de": "liebe:2, kuss:2, küsste:2, geliebte:2, herz, hochzeit, leidenschaft, zärtlich",
+        "fr": "amour:2, baiser:2, amoureu:2, embrass:2, cœur, mariage, passion, tendre",
+        "es": "amor:2, beso:2, besó:2, enamorad:2, corazón, boda, pasión, cariño",
+        "it": "amore:2, bacio:2, baciò:2, innamorat:2, cuore, matrimonio, passione",
+        "pt": "amor:2, beijo:2, beijou:2, apaixonad:2, coração, casamento, paixão",
+        "ru": "любовь:2, любви:2, поцелу:2, влюбл:2, сердц, свадьб, страсть, нежн",
+        "ja": "恋:2, 愛してる:2, キス:2, 恋人:2, 結婚, 告白",
+        "zh": "爱情:2, 恋人:2, 亲吻:2, 吻:2, 婚礼, 心动, 思念",
+        "ko": "사랑:2, 키스:2, 연인:2, 결혼, 고백, 설렘",
+        "ar": "الحب:2, حبيبي:2, حبيبت:2, قبلة:2, عشق:2, زفاف, قلبي, شوق",
+        "hi": "प्यार:2, प्रेम:2, चुंबन:2, प्रेमी:2, दिल, शादी, मोहब्बत",
+    },
+    "Bilim Kurgu": {
+        "en": "spaceship:2, starship:2, robot:2, android:2, galax:2, planet, alien, laser, orbit, cyborg",
+        "tr": "uzay:2, robot:2, gezegen:2, galaksi:2, uzaylı, android, lazer, yörünge",
+        "de": "raumschiff:2, roboter:2, galaxi:2, planet:2, außerirdisch, android, laser, umlaufbahn",
+        "fr": "vaisseau:2, robot:2, galaxie:2, planète:2, extraterrestre, androïde, laser, orbite",
+        "es": "nave espacial:2, robot:2, galaxia:2, planeta:2, alienígena, androide, láser, órbita",
+        "it": "astronave:2, robot:2, galassia:2, pianeta:2, alieno, androide, laser, orbita",
+        "pt": "nave espacial:2, robô:2, galáxia:2, planeta:2, alienígena, androide, laser, órbita",
+        "ru": "космическ:2, робот:2, галакти:2, планет:2, инопланет, андроид, лазер, орбит",
+        "ja": "宇宙船:2, ロボット:2, 銀河:2, 惑星:2, 宇宙人, アンドロイド, レーザー, 軌道",
+        "zh": "飞船:2, 机器人:2, 银河:2, 星球:2, 外星, 激光, 轨道, 星际",
+        "ko": "우주선:2, 로봇:2, 은하:2, 행성:2, 외계인, 안드로이드, 레이저, 궤도",
+        "ar": "مركبة فضائية:2, روبوت:2, مجرة:2, كوكب:2, فضائي, ليزر, مدار",
+        "hi": "अंतरिक्ष:2, रोबोट:2, आकाशगंगा:2, ग्रह:2, एलियन, लेज़र",
+    },
+    "Fantastik": {
+        "en": "wizard:2, sorcer:2, dragon:2, spell:2, magic, elf, elves, enchant, kingdom",
+        "tr": "büyücü:2, ejderha:2, sihir:2, büyüsü, cüce, krallık, kılıç, tılsım, elf",
+        "de": "zauber:2, drache:2, hexe:2, magie:2, elben, zwerg, königreich, schwert",
+        "fr": "sorcier:2, dragon:2, magie:2, sortilège:2, elfe, nain, royaume, épée, enchant",
+        "es": "hechicer:2, dragón:2, magia:2, hechizo:2, elfo, enano, reino, espada, encantam",
+        "it": "stregon:2, drago:2, magia:2, incantesim:2, elfo, elfi, regno, spada",
+        "pt": "feiticeir:2, dragão:2, magia:2, feitiço:2, elfo, anão, reino, espada, encantam",
+        "ru": "волшебн:2, дракон:2, магия:2, магии:2, заклинан:2, эльф, гном, королевств, колдун",
+        "ja": "魔法:2, ドラゴン:2, 魔術:2, 呪文:2, エルフ, 王国, 剣, 竜",
+        "zh": "魔法:2, 巫师:2, 咒语:2, 精灵, 王国, 剑, 法术, 龙",
+        "ko": "마법:2, 드래곤:2, 마법사:2, 엘프, 왕국, 주문",
+        "ar": "ساحر:2, تنين:2, تعويذة:2, سحر, قزم, مملكة, سيف",
+        "hi": "जादू:2, जादूगर:2, ड्रैगन:2, मंत्र:2, परी, राज्य, तलवार",
+    },
+    "Korku": {
+        "en": "ghost:2, demon:2, vampire:2, haunt:2, scream, blood, corpse, terror, nightmare, creature",
+        "tr": "hayalet:2, cinler:2, şeytan:2, vampir:2, çığlık, kanlı, dehşet, kabus, yaratık, lanet",
+        "de": "dämon:2, vampir:2, spuk:2, gespenst:2, geist, schrei, blut, grauen, albtraum, kreatur, fluch",
+        "fr": "fantôme:2, démon:2, vampire:2, hanté:2, sang, terreur, cauchemar, créature, malédiction",
+        "es": "fantasma:2, demonio:2, vampiro:2, embrujad:2, grito, sangre, terror, pesadilla, criatura, maldición",
+        "it": "fantasm:2, demon:2, vampir:2, infestat:2, urlo, sangue, terrore, incubo, creatura, maledizione",
+        "pt": "fantasma:2, demônio:2, vampiro:2, assombrad:2, grito, sangue, terror, pesadelo, criatura, maldição",
+        "ru": "призрак:2, демон:2, вампир:2, нечист:2, крик, кровь, ужас, кошмар, тварь, прокля",
+        "ja": "幽霊:2, 悪魔:2, 吸血鬼:2, 怨霊:2, 悲鳴, 血, 恐怖, 悪夢, 呪い",
+        "zh": "鬼魂:2, 恶魔:2, 吸血鬼:2, 闹鬼:2, 尖叫, 鲜血, 恐怖, 噩梦, 诅咒",
+        "ko": "유령:2, 악마:2, 뱀파이어:2, 귀신:2, 비명, 피투성이, 공포, 악몽, 저주",
+        "ar": "شبح:2, شيطان:2, مصاص دماء:2, مسكون:2, صرخة, دماء, رعب, كابوس, لعنة",
+        "hi": "भूत:2, राक्षस:2, पिशाच:2, चुड़ैल:2, चीख, खून, डर, दुःस्वप्न, श्राप",
+    },
+    "Tarihi": {
+        "en": "emperor:2, sultan:2, empire:2, knight:2, throne, castle, duke, pasha, century, battle",
+        "tr": "padişah:2, sultan:2, imparator:2, paşa:2, saray, tahtı, osmanlı, vezir, savaş, yüzyıl",
+        "de": "kaiser:2, sultan:2, ritter:2, thron, burg, herzog, jahrhundert, schlacht",
+        "fr": "empereur:2, sultan:2, empire:2, chevalier:2, trône, château, duc, siècle, bataille",
+        "es": "emperador:2, sultán:2, imperio:2, caballero, trono, castillo, duque, siglo, batalla",
+        "it": "imperatore:2, sultano:2, impero:2, cavalier:2, trono, castello, duca, secolo, battaglia",
+        "pt": "imperador:2, sultão:2, império:2, cavaleiro:2, trono, castelo, duque, século, batalha",
+        "ru": "император:2, султан:2, импери:2, рыцар:2, трон, замок, герцог, век, битв",
+        "ja": "天皇:2, 将軍:2, 皇帝:2, 武士:2, 城, 大名, 幕府, 戦",
+        "zh": "皇帝:2, 朝廷:2, 王朝:2, 将军:2, 宫廷, 大臣, 战役, 陛下",
+        "ko": "황제:2, 임금:2, 왕조:2, 장군:2, 궁궐, 대신, 전투, 조선",
+        "ar": "السلطان:2, الإمبراطور:2, الخليفة:2, إمبراطورية:2, العرش, قلعة, الباشا, معركة",
+        "hi": "सम्राट:2, सुल्तान:2, साम्राज्य:2, बादशाह:2, सिंहासन, किला, युद्ध, सदी",
+    },
+    "Macera": {
+        "en": "treasure:2, expedition:2, pirate:2, voyage:2, island, jungle, map, quest, explorer",
+        "tr": "hazine:2, keşif:2, korsan:2, yolculuk:2, adaya, adada, orman, harita, serüven",
+        "de": "schatz:2, expedition:2, pirat:2, reise:2, insel, dschungel, karte, abenteuer",
+        "fr": "trésor:2, expédition:2, pirate:2, voyage:2, île, jungle, carte, aventure, explorat",
+        "es": "tesoro:2, expedición:2, pirata:2, travesía:2, isla, selva, mapa, aventura, explorador",
+        "it": "tesoro:2, spedizione:2, pirat:2, viaggio:2, isola, giungla, mappa, avventura, esplorat",
+        "pt": "tesouro:2, expedição:2, pirata:2, viagem:2, ilha, selva, mapa, aventura, explorador",
+        "ru": "сокровищ:2, экспедици:2, пират:2, путешеств:2, остров, джунгл, приключени",
+        "ja": "宝:2, 探検:2, 海賊:2, 冒険:2, 島, 地図, 航海, ジャングル",
+        "zh": "宝藏:2, 探险:2, 海盗:2, 冒险:2, 岛, 地图, 航行, 丛林",
+        "ko": "보물:2, 탐험:2, 해적:2, 모험:2, 섬, 지도, 항해, 정글",
+        "ar": "كنز:2, رحلة استكشافية:2, قراصنة:2, مغامرة:2, جزيرة, غابة, خريطة, بحار",
+        "hi": "खज़ाना:2, खजाना:2, अभियान:2, समुद्री डाकू:2, रोमांच, द्वीप, जंगल, नक्शा",
+    },
+    "Gerilim": {
+        "en": "conspiracy:2, assassin:2, hostage:2, agent:2, spy, bomb, chase, escape, threat, kidnap",
+        "tr": "komplo:2, suikast:2, rehine:2, ajan:2, casus, bomba, kaçış, tehdit, kaçırıl",
+        "de": "verschwörung:2, attentat:2, geisel:2, agent:2, spion, bombe, verfolgung, flucht, bedrohung, entführ",
+        "fr": "complot:2, attentat:2, otage:2, agent:2, espion, bombe, poursuite, fuite, menace, enlèvement",
+        "es": "conspiración:2, atentado:2, rehén:2, agente:2, espía, bomba, persecución, fuga, amenaza, secuestr",
+        "it": "cospirazione:2, attentato:2, ostaggi:2, agente:2, spia, bomba, inseguimento, fuga, minaccia, rapiment",
+        "pt": "conspiração:2, atentado:2, refém:2, agente:2, espião, bomba, perseguição, fuga, ameaça, sequestr",
+        "ru": "заговор:2, покушени:2, заложни:2, агент:2, шпион, бомб, погон, побег, угроз, похищ",
+        "ja": "陰謀:2, 暗殺:2, 人質:2, スパイ:2, 爆弾, 追跡, 逃亡, 脅迫, 誘拐",
+        "zh": "阴谋:2, 暗杀:2, 人质:2, 特工:2, 间谍, 炸弹, 追捕, 逃亡, 威胁, 绑架",
+        "ko": "음모:2, 암살:2, 인질:2, 요원:2, 스파이, 폭탄, 추격, 도주, 협박, 납치",
+        "ar": "مؤامرة:2, اغتيال:2, رهينة:2, عميل:2, جاسوس, قنبلة, مطاردة, هروب, تهديد, اختطاف",
+        "hi": "साज़िश:2, साजिश:2, बंधक:2, एजेंट:2, बम, पीछा, धमकी, अपहरण",
+    },
+}
+DEFAULT_GENRE = "Roman"  # Yeterli kanıt yoksa
+MIN_GENRE_SCORE = 5.0  # Bundan az toplam puan, tür tahmini için yetersiz sayılır
+GENRE_SAMPLE_SIZE = 64  # Tür tahmini için metin boyunca seçilen örnek blok sayısı
+# Kelime başında sınır aranmayan diller: boşluksuz yazılanlar ve öneklerin kelimeye bitiştiği Arapça
+_NO_WORD_BOUNDARY = {"ja", "zh", "ar"}
+
+_compiled = {}
+
+
+def _compile(language: str | None) -> Tuple[re.Pattern, Dict[str, List[Tuple[str, float]]]]:
+    """Dilin (None ise tüm dillerin) anahtar kelimelerini tek bir desende birleştirir; sonuç önbelleğe alınır."""
+    if language not in _compiled:
+        keywords = {}
+        for genre, languages in GENRE_LEXICON.items():
+            for lexicon_language, entries in languages.items():
+                if language and lexicon_language != language:
+                    continue
+                for entry in entries.split(","):
+                    keyword, _, weight = entry.strip().partition(":")
+                    keywords.setdefault(keyword.casefold(), []).append((genre, float(weight or 1)))
+        alternation = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        boundary = "" if language in _NO_WORD_BOUNDARY else r'(?<!\w)'
+        _compiled[language] = (re.compile(boundary + "(?:" + alternation + ")"), keywords)
+    return _compiled[language]
+
+
+def rank_genres(texts: Iterable[str], language: str = None, sample_size: int = GENRE_SAMPLE_SIZE, seed: int = 0) -> List[Tuple[str, float]]:
+    """
+    Metinlerin örneklenmiş hâlini tek geçişte puanlar ve (tür, güven) listesini en olası türden başlayarak döndürür.
+    Güven, türün toplam puandaki payıdır. Dil sözlükte yoksa tüm dillerin kelimeleri kullanılır;
+    yeterli kanıt yoksa boş liste döner.
+    """
+    language = (language or "").split("-")[0].lower()
+    pattern, keywords = _compile(language if any(language in languages for languages in GENRE_LEXICON.values()) else None)
+    sample = "\n\n".join(sample_paragraphs(texts, sample_size=sample_size, seed=seed)).casefold()
+    scores = Counter()
+    for match in pattern.finditer(sample):
+        for genre, weight in keywords[match.group()]:
+            scores[genre] += weight
+    total = sum(scores.values())
+    if total < MIN_GENRE_SCORE:
+        return []
+    return [(genre, round(score / total, 2)) for genre, score in scores.most_common()]
@@ -0,0 +1,92 @@
+import os
+import mmap
+import codecs
+import hashlib
+import logging
+from typing import Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Roman dosyasını tamamını belleğe okumadan işlemek için yardımcılar.
+# Dosya bellek eşlemeli (mmap) açılır, satırlar bayt aralıklarıyla birlikte tek tek çözülür;
+# böylece onlarca MB'lık derleme ciltler ve web romanı dökümleri sınırlı bellekle bölümlere ayrılır.
+
+# UTF-8 değilse denenecek varsayılan kodlama (Türkçe Windows metinleri için cp1254)
+DEFAULT_FALLBACK_ENCODING = "cp1254"
+_VALIDATION_CHUNK = 1 << 20  # Kodlama doğrulaması için okunan parça (bayt)
+
+
+def detect_encoding(file_path: str) -> str:
+    """
+    Dosyanın kodlamasını belirler: BOM varsa ona göre, yoksa dosya parça parça UTF-8 olarak doğrulanır.
+    Geçerli UTF-8 değilse NOVEL_FALLBACK_ENCODING ortam değişkenindeki (yoksa DEFAULT_FALLBACK_ENCODING) kodlama döndürülür.
+    Değişken çağrı anında okunur; böylece .env dosyası modül yüklendikten sonra yüklense de geçerli olur.
+    """
+    with open(file_path, 'rb') as file:
+        head = file.read(4)
+        if head.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        if head.startswith(codecs.BOM_UTF32_LE) or head.startswith(codecs.BOM_UTF32_BE):
+            return "utf-32"
+        if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+            return "utf-16"
+        file.seek(0)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            while True:
+                chunk = file.read(_VALIDATION_CHUNK)
+                if not chunk:
+                    break
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+            return "utf-8"
+        except UnicodeDecodeError:
+            fallback_encoding = os.getenv("NOVEL_FALLBACK_ENCODING") or DEFAULT_FALLBACK_ENCODING
+            logger.info(f"{os.path.basename(file_path)} is not valid UTF-8, falling back to {fallback_encoding}.")
+            return fallback_encoding
+
+
+def file_sha256(file_path: str) -> str:
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesaplar (önbellek anahtarı olarak kullanılır)."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while True:
+            chunk = file.read(_VALIDATION_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_file_lines(file_path: str, encoding: str) -> Iterator[Tuple[str, Tuple[int, int] | None]]:
+    """
+    Dosyanın satırlarını (satır metni, (başlangıç baytı, bitiş baytı)) olarak üretir.
+    ASCII uyumlu kodlamalarda dosya mmap ile taranır ve bayt aralıkları verilir; UTF-16/32 dosyalarda
+    satırlar akış olarak okunur ve aralık None olur.
+    """
+    start = 0
+    if encoding == "utf-8-sig":
+        encoding, start = "utf-8", len(codecs.BOM_UTF8)
+    if "\n".encode(encoding) != b"\n":
+        with open(file_path, 'r', encoding=encoding, errors='replace') as file:
+            for line in file:
+                yield line.rstrip("\r\n"), None
+        return
+    if os.path.getsize(file_path) == 0:
+        return
+
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        size = len(mapped)
+        while start < size:
+            end = mapped.find(b"\n", start)
+            if end == -1:
+                end = size
+            yield mapped[start:end].decode(encoding, errors='replace').rstrip("\r"), (start, end)
+            start = end + 1
+
+
+def read_text_prefix(file_path: str, encoding: str, max_chars: int) -> str:
+    """Dosyanın ilk max_chars karakterini döndürür (AI analizi ve dil tespiti için)."""
+    with open(file_path, 'r', encoding=encoding, errors='replace') as file:
+        return file.read(max_chars)
+
@@ -0,0 +1,146 @@
+import os
+import re
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from langdetect import DetectorFactory, detect_langs
+from langdetect.lang_detect_exception import LangDetectException
+
+from serialization import dump_json, load_json
+
+# Bölüm bazında dil tespiti. Karışık dilli romanlarda (yabancı dilde mektuplar, zaten hedef dilde olan pasajlar)
+# her bölüm kendi kaynak diliyle çevrilir; hedef dildeki bölümler tam çeviri yerine yalnızca düzenlenir veya aynen geçirilir.
+# langdetect saf Python olduğundan bölümler süreç havuzunda parçalar hâlinde işlenir.
+# Romanın genel dili ise tüm metin yerine, kitap boyunca eşit aralıklı dilimlerden seçilen paragraf örnekleriyle
+# çoğunluk oylamasıyla belirlenir; sonuç dosya özetine (hash) göre önbelleğe alınır.
+
+# langdetect her çağrıda rastgele örnekleme yapar; sabit tohum aynı metin için her çalıştırmada aynı sonucu verir.
+# İşçi süreçler bu modülü yeniden yüklediğinde tohum orada da ayarlanır.
+DetectorFactory.seed = 0
+
+_CHUNK_SIZE = 32  # Süreçler arası aktarım maliyetini azaltmak için her işe verilen bölüm sayısı
+_PARAGRAPH_SEPARATOR = re.compile(r'\n\s*\n')
+_CACHE_LIMIT = 200  # Önbellekte tutulan en fazla dosya
+
+
+def detect_text_language(text: str) -> Tuple[str | None, float]:
+    """Metnin en olası dilini ve olasılığını döndürür; tespit edilemezse (None, 0.0)."""
+    try:
+        best = detect_langs(text)[0]
+        return best.lang, best.prob
+    except LangDetectException:
+        return None, 0.0
+
+
+def _detect_chunk(texts: List[str], min_chars: int) -> List[Tuple[str | None, float]]:
+    # İşçi süreçte çalışır; modül düzeyinde olmalı (pickle)
+    return [detect_text_language(text) if len(text.strip()) >= min_chars else (None, 0.0) for text in texts]
+
+
+def detect_section_languages(texts: List[str], workers: int = None, min_chars: int = 200, min_confidence: float = 0.8) -> List[str | None]:
+    """
+    Her bölümün dil kodunu döndürür. min_chars'tan kısa veya min_confidence'tan düşük olasılıkla tespit edilen
+    bölümler için None döner (çağıran romanın genel dilini kullanır). workers=1 ise veya tek parça varsa havuz açılmaz.
+    """
+    chunks = [texts[i:i + _CHUNK_SIZE] for i in range(0, len(texts), _CHUNK_SIZE)]
+    detect_chunk = partial(_detect_chunk, min_chars=min_chars)
+    if workers == 1 or len(chunks) <= 1:
+        results = [result for chunk in chunks for result in detect_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [result for chunk_results in executor.map(detect_chunk, chunks) for result in chunk_results]
+    return [language if language and confidence >= min_confidence else None for language, confidence in results]
+
+
+def same_language(first: str | None, second: str | None) -> bool:
+    """Dil kodlarını bölge ekini yok sayarak karşılaştırır ("zh-cn" ile "zh" aynıdır)."""
+    if not first or not second:
+        return False
+    return first.split("-")[0].lower() == second.split("-")[0].lower()
+
+
+def sample_paragraphs(texts: Iterable[str], sample_size: int = 24, min_chars: int = 200, seed: int = 0) -> List[str]:
+    """
+    Metinlerden dil tespiti için örnek bloklar seçer. Ardışık paragraflar en az min_chars uzunluğunda bloklara
+    birleştirilir (kısa diyalog satırları tek başına güvenilir sonuç vermez); bloklar sample_size eşit dilime
+    ayrılır ve her dilimden sabit tohumla bir blok seçilir. Böylece örnek kitabın başına değil tamamına yayılır.
+    """
+    blocks = list(_iter_blocks(texts, min_chars))
+    return [blocks[index] for index in _sample_indices(len(blocks), sample_size, seed)]
+
+
+def stream_sample_paragraphs(open_texts: Callable[[], Iterable[str]], sample_size: int = 24, min_chars: int = 200, seed: int = 0) -> List[str]:
+    """
+    sample_paragraphs ile aynı örneği, metnin tamamını belleğe almadan seçer. open_texts her çağrıldığında metinleri
+    baştan üreten bir akış döndürmelidir (ör. dosya satırları): ilk geçişte bloklar sayılır, ikincide seçilenler toplanır.
+    """
+    chosen = set(_sample_indices(sum(1 for _ in _iter_blocks(open_texts(), min_chars)), sample_size, seed))
+    return [block for index, block in enumerate(_iter_blocks(open_texts(), min_chars)) if index in chosen]
+
+
+def _iter_blocks(texts: Iterable[str], min_chars: int) -> Iterator[str]:
+    """Ardışık paragrafları en az min_chars uzunluğunda bloklar hâlinde üretir; kalan kısa parça yalnızca hiç blok yoksa üretilir."""
+    current, current_chars, produced = [], 0, False
+    for text in texts:
+        for paragraph in _PARAGRAPH_SEPARATOR.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            current.append(paragraph)
+            current_chars += len(paragraph)
+            if current_chars >= min_chars:
+                yield "\n\n".join(current)
+                current, current_chars, produced = [], 0, True
+    if current and not produced:
+        yield "\n\n".join(current)
+
+
+def _sample_indices(block_count: int, sample_size: int, seed: int) -> List[int]:
+    """block_count bloğu sample_size eşit dilime ayırır ve her dilimden sabit tohumla seçilen bloğun sırasını döndürür."""
+    if block_count <= sample_size:
+        return list(range(block_count))
+    rng = random.Random(seed)
+    stratum = block_count / sample_size
+    return [int(i * stratum) + rng.randrange(max(1, int((i + 1) * stratum) - int(i * stratum))) for i in range(sample_size)]
+
+
+def detect_novel_language(texts: Iterable[str], sample_size: int = 24, seed: int = 0) -> Tuple[str, float]:
+    """
+    Romanın genel dilini örnek bloklar üzerinde çoğunluk oylamasıyla belirler.
+    (dil kodu, güven) döndürür; güven, kazanan dile oy veren örneklerin oranıdır. Hiçbir örnek tespit edilemezse ("unknown", 0.0).
+    """
+    samples = sample_paragraphs(texts, sample_size=sample_size, seed=seed)
+    votes = Counter(language for language, _ in map(detect_text_language, samples) if language)
+    if not votes:
+        return "unknown", 0.0
+    language, count = votes.most_common(1)[0]
+    return language, round(count / len(samples), 2)
+
+
+def load_cached_language(cache_file: str, key: str) -> Tuple[str, float] | None:
+    """Önbellekteki dil tespiti sonucunu döndürür; yoksa veya önbellek okunamazsa None."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            entry = load_json(f).get(key)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return (entry["language"], entry["confidence"]) if entry else None
+
+
+def store_cached_language(cache_file: str, key: str, language: str, confidence: float):
+    """Sonucu önbelleğe yazar; en eski kayıtlar _CACHE_LIMIT aşılınca silinir. Dosya yerine atomik olarak konur."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = load_json(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache.pop(key, None)
+    cache[key] = {"language": language, "confidence": confidence}
+    cache = dict(list(cache.items())[-_CACHE_LIMIT:])
+    temp_file = cache_file + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        dump_json(cache, f)
+    os.replace(temp_file, cache_file)
@@ -0,0 +1,86 @@
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+# Karakterlerin (ad, lakap, takma adlar) ve sözlük terimlerinin bölüm bazında geçiş dizini.
+# Tüm biçimler tek bir düzenli ifadede birleştirilir ve her bölüm tek geçişte taranır; her biçim için
+# metni ayrı ayrı saymaya gerek kalmaz. Sonuç bölüme "mentions" ({varlık: sayı}) olarak yazılır, böylece
+# bölümle birlikte kaydedilir, bölüm değiştiğinde yalnızca o bölüm yeniden taranır ve toplamlar
+# bellekteki meta verilerden metin okumadan hesaplanır.
+
+_FORM_SEPARATOR = re.compile(r'\s*[,;/]\s*')  # "Lakap1, Lakap2" gibi birden çok biçim içeren alanlar
+MIN_FORM_CHARS = 2  # Daha kısa biçimler (baş harfler vb.) çok fazla yanlış eşleşme üretir
+
+
+def _split_forms(value: Any) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    return [form for item in values if isinstance(item, str) for form in _FORM_SEPARATOR.split(item.strip()) if form]
+
+
+def mention_entities(characters: Dict[str, Dict[str, Any]], terms: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """Dizinlenecek varlıkları ve metindeki biçimlerini döndürür: karakter adı -> [ad, lakaplar, takma adlar], terim -> [terim]."""
+    entities = {}
+    for name, data in characters.items():
+        entities[name] = [name] + _split_forms(data.get("nickname", "")) + _split_forms(data.get("aliases", []))
+    for term in terms:
+        entities.setdefault(term, [term])
+    return entities
+
+
+def _form_pattern(form: str) -> str:
+    # Latin, Kiril vb. yazılarda kelime sınırı aranır ("Ali" "Alice" içinde sayılmaz);
+    # boşluksuz yazılan dillerde (CJK) sınır olmadığından biçim olduğu gibi aranır.
+    pattern = re.escape(form)
+    if form[0].isalnum() and ord(form[0]) < 0x3000:
+        pattern = r'(?<!\w)' + pattern
+    if form[-1].isalnum() and ord(form[-1]) < 0x3000:
+        pattern += r'(?!\w)'
+    return pattern
+
+
+class MentionScanner:
+    """Varlıkların tüm biçimlerini tek bir desende birleştirip metinleri tek geçişte tarar."""
+
+    def __init__(self, entities: Dict[str, List[str]]):
+        self._entity_by_form = {}
+        for entity, forms in entities.items():
+            for form in forms:
+                form = form.strip()
+                if len(form) >= MIN_FORM_CHARS:
+                    self._entity_by_form.setdefault(form, entity)
+        # Uzun biçimler önce denenir: "Anna Maria" geçişi "Anna" olarak da sayılmaz
+        forms = sorted(self._entity_by_form, key=len, reverse=True)
+        self._pattern = re.compile("|".join(_form_pattern(form) for form in forms)) if forms else None
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Metindeki varlık geçişlerini {varlık: sayı} olarak döndürür."""
+        if not self._pattern or not text:
+            return {}
+        return dict(Counter(self._entity_by_form[match.group()] for match in self._pattern.finditer(text)))
+
+
+def index_sections(sections: Iterable[Any], scanner: MentionScanner) -> Counter:
+    """
+    Bölümleri tarar, her bölüme "mentions" yazar ve toplam geçiş sayılarını döndürür.
+    Değeri değişmeyen bölümlere yazılmaz (bölüm deposunda gereksiz yazma olmaz).
+    """
+    totals = Counter()
+    for section in sections:
+        mentions = scanner.scan(section.get("text", ""))
+        if section.get("mentions") != mentions:
+            section["mentions"] = mentions
+        totals.update(mentions)
+    return totals
+
+
+def mention_totals(sections: Iterable[Any]) -> Counter:
+    """Bölümlerde kayıtlı "mentions" değerlerinden toplam geçiş sayılarını hesaplar (metinler okunmaz)."""
+    totals = Counter()
+    for section in sections:
+        totals.update(section.get("mentions") or {})
+    return totals
+
+
+def sections_mentioning(sections: Iterable[Any], entity: str) -> List[int]:
+    """Varlığın geçtiği bölümlerin indekslerini döndürür."""
+    return [index for index, section in enumerate(sections) if (section.get("mentions") or {}).get(entity)]
@@ -1,8 +1,5 @@
-import re
 import time # Added for sleep
 from typing import List, Dict, Tuple, Any # Added Any for type hinting
-from langdetect import detect
-from langdetect.lang_detect_exception import LangDetectException
 import os
 from dotenv import load_dotenv
 import json5 # json yerine json5 kullanıldı
@@ -15,6 +12,13 @@ import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 import openai
 
+from segmentation import section_token_target, iter_sections_from_lines
+from ingestion import detect_encoding, iter_file_lines, read_text_prefix, file_sha256
+from mention_index import MentionScanner, mention_entities, index_sections
+from genre_lexicon import rank_genres, DEFAULT_GENRE, GENRE_SAMPLE_SIZE
+from language_detection import detect_section_languages, detect_novel_language, load_cached_language, store_cached_language, stream_sample_paragraphs
+from analysis_cache import fingerprint, load_artifact, store_artifact, invalidate_artifacts
+
 class NovelAnalyzer:
     def __init__(self):
         load_dotenv()
@@ -22,10 +26,30 @@ class NovelAnalyzer:
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.allowed_model = os.getenv("ALLOWED_MODEL", None)
+        self.analysis_model = os.getenv("MODEL_ANALYSIS") or None # Analiz için ayrı model (boşsa varsayılan)
+        # Büyük dosyalarda AI analizine gönderilecek en fazla karakter (bölümleme tüm dosyayı kapsar)
+        self.analysis_max_chars = int(os.getenv("ANALYSIS_MAX_CHARS", "1000000"))
+        # Bölüm bazında dil tespitinde kullanılacak süreç sayısı (boşsa CPU sayısı, 1 ise havuz açılmaz)
+        self.section_language_workers = int(os.getenv("SECTION_LANGUAGE_WORKERS", "0")) or None
+        self.section_language_min_chars = int(os.getenv("SECTION_LANGUAGE_MIN_CHARS", "200")) # Daha kısa bölümler romanın dilini kullanır
+        self.section_language_min_confidence = float(os.getenv("SECTION_LANGUAGE_MIN_CONFIDENCE", "0.8"))
+        # Romanın dili bu kadar örnek paragraf bloğuyla, sabit tohumla tespit edilir; sonuç dosya özetine göre önbelleğe alınır
+        self.language_sample_size = int(os.getenv("LANGUAGE_SAMPLE_SIZE", "24"))
+        self.language_detection_seed = int(os.getenv("LANGUAGE_DETECTION_SEED", "0"))
+        self.language_cache_file = os.getenv("LANGUAGE_CACHE_FILE", "language_cache.json")
+        # AI analizleri ve bölüm dilleri dosya özeti, prompt özeti ve modele göre önbelleğe alınır (bkz. analysis_cache)
+        self.analysis_cache_enabled = os.getenv("ANALYSIS_CACHE", "true").lower() == "true"
+        self.analysis_cache_dir = os.getenv("ANALYSIS_CACHE_DIR", "analysis_cache")
+        self.source_encoding = None
+        self.source_hash = None # Son analiz edilen dosyanın SHA-256 özeti
+        self.analysis_from_cache = False
 
         self.style_guide = {} # This might be removed or changed later if style guide generation moves
         self.detected_language = None
+        self.detected_language_confidence = None
+        self.genre_candidates = [] # (tür, güven) listesi, en olası tür başta
         self.characters = {}
+        self.mention_terms = [] # Geçiş dizinine karakterlerle birlikte eklenecek terimler (kullanıcı sözlüğü)
         self.cultural_context = {}
         self.main_themes = {}
         self.setting_atmosphere = {}
@@ -51,8 +75,9 @@ class NovelAnalyzer:
             if not self.gemini_api_key:
                 raise ValueError("error_gemini_api_key_not_found")
             genai.configure(api_key=self.gemini_api_key)
-            model_name = self.allowed_model if (self.allowed_model and self.ai_model == "gemini") else "gemini-1.5-flash-latest"
+            model_name = self.analysis_model or (self.allowed_model if (self.allowed_model and self.ai_model == "gemini") else "gemini-1.5-flash-latest")
             self.model = genai.GenerativeModel(model_name)
+            self.model_name = model_name
             # Güvenlik ayarlarını tanımla: Tüm kategoriler için engellemeyi devre dışı bırak
             self.safety_settings = {
                 HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
@@ -65,35 +90,60 @@ class NovelAnalyzer:
             if not self.openai_api_key:
                 raise ValueError("error_openai_api_key_not_found")
             openai.api_key = self.openai_api_key
-            model_name = self.allowed_model if (self.allowed_model and self.ai_model == "chatgpt") else "gpt-4o-mini"
+            model_name = self.analysis_model or (self.allowed_model if (self.allowed_model and self.ai_model == "chatgpt") else "gpt-4o-mini")
             self.model = model_name
+            self.model_name = model_name
             logger.debug(f"Using OpenAI model for analysis: {model_name}.")
         else:
             raise ValueError(f"error_unsupported_ai_model:{self.ai_model}")
         
+    def set_analysis_model(self, model_name: str):
+        """Analiz aşamasında kullanılacak modeli değiştirir. Boş değer varsayılan modele döner."""
+        model_name = (model_name or "").strip() or None
+        if model_name != self.analysis_model:
+            self.analysis_model = model_name
+            self._setup_ai_model()
+
     def _detect_language(self, text: str) -> str:
         """
         Detects the language of the given text.
+        Metnin tamamı yerine örnek paragraf blokları üzerinde çoğunluk oylaması yapılır (bkz. detect_novel_language).
         """
-        try:
-            return detect(text)
-        except LangDetectException:
-            return "unknown"
+        return self._detect_language_from_texts([text])
+
+    def _detect_language_from_texts(self, texts: List[str]) -> str:
+        language, confidence = detect_novel_language(texts, sample_size=self.language_sample_size, seed=self.language_detection_seed)
+        self.detected_language_confidence = confidence
+        logger.info(f"Romanın dili: {language} (güven: {confidence})")
+        return language
 
     def _detect_genre(self, text: str) -> str:
         """
-        Detects the genre of the given text (placeholder for now).
+        Detects the genre of the given text.
+        Metnin örneği, tespit edilen dilin anahtar kelime sözlüğüyle tek geçişte puanlanır (bkz. genre_lexicon);
+        sıralı adaylar genre_candidates'te tutulur. Yeterli kanıt yoksa varsayılan tür döner.
         """
-        # This is a placeholder. A real implementation would use NLP models.
-        # For now, it returns a default or a very basic heuristic.
-        if "aşk" in text.lower() or "sevgi" in text.lower():
-            return "Romantik"
-        elif "cinayet" in text.lower() or "dedektif" in text.lower():
-            return "Polisiye"
-        elif "uzay" in text.lower() or "robot" in text.lower():
-            return "Bilim Kurgu"
-        else:
-            return "Roman"
+        self.genre_candidates = rank_genres([text], self.detected_language, seed=self.language_detection_seed)
+        return self.genre_candidates[0][0] if self.genre_candidates else DEFAULT_GENRE
+
+    def suggest_genre(self, file_path: str) -> List[Tuple[str, float]]:
+        """
+        Analizden önce tür ön seçimi için dosyanın tamamına yayılan örnekten sıralı (tür, güven) adaylarını döndürür.
+        Dil, dosya özetine göre önbellekten alınır veya örnekten tespit edilir; AI çağrısı yapılmaz.
+        Dosya belleğe alınmaz, örnekler satır akışından seçilir. Arka planda analizle aynı anda çalışabildiği için
+        analizcinin durumu (genre_candidates, detected_language_confidence) değiştirilmez.
+        """
+        encoding = detect_encoding(file_path)
+
+        def open_lines():
+            return (line for line, _ in iter_file_lines(file_path, encoding))
+
+        language, _ = self._file_language(
+            file_sha256(file_path),
+            lambda: stream_sample_paragraphs(open_lines, sample_size=self.language_sample_size, seed=self.language_detection_seed)
+        )
+        samples = stream_sample_paragraphs(open_lines, sample_size=GENRE_SAMPLE_SIZE, seed=self.language_detection_seed)
+        return rank_genres(samples, language, seed=self.language_detection_seed)
 
     def _analyze_characters(self, text: str) -> Tuple[Dict[str, Dict[str, str]], str | None]:
         """
@@ -136,7 +186,7 @@ class NovelAnalyzer:
                 name = char_data.get("name")
                 if name:
                     # AI'dan gelen veriye mention ve notes ekle (varsayılan değerlerle)
-                    char_data["mentions"] = text.count(name) # Karakterin metinde geçiş sayısını hesapla
+                    char_data["mentions"] = 0 # Bölümler oluşturulduktan sonra geçiş dizininden doldurulur (build_mention_index)
                     char_data["notes"] = char_data.get("notes", "") # AI doğrudan notes vermeyeceği için varsayılan boş string olarak başlat
                     # Meslek ve Lakap için varsayılan değerleri ayarla (eğer AI vermezse)
                     char_data["occupation"] = char_data.get("occupation", "")
@@ -272,42 +322,97 @@ class NovelAnalyzer:
             logger.error(error_msg, exc_info=True)
             return {}, error_msg
 
-    def analyze(self, content: str, genre_input: str, characters_input: str, custom_splitter: str = None) -> Tuple[str, List[Dict[str, str]], Dict[str, str], Dict[str, List[str]], Dict[str, str], str | None]:
+    def analyze_file(self, file_path: str, genre_input: str, characters_input: str, custom_splitter: str = None, max_tokens_per_section: int = None) -> Tuple[str, List[Dict[str, str]], Dict[str, str], Dict[str, List[str]], Dict[str, str], str | None]:
+        """
+        Roman dosyasını tamamını tek bir metin olarak okumadan analiz eder.
+        Kodlama tespit edilir, bölümler dosyadan akış halinde üretilir (her bölüm "source_span" bayt aralığını taşır);
+        AI analizine dosyanın ilk `analysis_max_chars` karakteri gönderilir.
+        """
+        encoding = detect_encoding(file_path)
+        self.source_encoding = encoding
+        if not max_tokens_per_section:
+            max_tokens_per_section = section_token_target(self.model_name)
+        sections = list(iter_sections_from_lines(iter_file_lines(file_path, encoding), max_tokens_per_section, custom_splitter, encoding=encoding.replace("-sig", "")))
+        content = read_text_prefix(file_path, encoding, self.analysis_max_chars)
+
+        self.source_hash = file_sha256(file_path)
+        detected_language = self._detect_file_language(self.source_hash, [section["text"] for section in sections])
+        return self.analyze(content, genre_input, characters_input, custom_splitter, max_tokens_per_section, sections=sections, detected_language=detected_language, source_hash=self.source_hash)
+
+    def _detect_file_language(self, source_hash: str, texts: List[str]) -> str:
+        """Romanın dili: aynı dosya ve aynı örnekleme ayarları için önbellekten, yoksa metnin tamamına yayılan örneklerden."""
+        detected_language, self.detected_language_confidence = self._file_language(source_hash, lambda: texts)
+        return detected_language
+
+    def _file_language(self, source_hash: str, get_texts) -> Tuple[str, float]:
+        """
+        (dil, güven) çiftini önbellekten veya get_texts() ile alınan metinlerden döndürür; analizcinin durumunu değiştirmez.
+        Metinler yalnızca önbellekte kayıt yoksa istenir.
+        """
+        cache_key = f"{source_hash}:{self.language_sample_size}:{self.language_detection_seed}"
+        cached = load_cached_language(self.language_cache_file, cache_key)
+        if cached:
+            logger.info(f"Romanın dili önbellekten alındı: {cached[0]} (güven: {cached[1]})")
+            return cached
+        language, confidence = detect_novel_language(get_texts(), sample_size=self.language_sample_size, seed=self.language_detection_seed)
+        logger.info(f"Romanın dili: {language} (güven: {confidence})")
+        try:
+            store_cached_language(self.language_cache_file, cache_key, language, confidence)
+        except OSError as e:
+            logger.warning(f"Dil tespiti önbelleğe yazılamadı: {e}")
+        return language, confidence
+
+    def analyze(self, content: str, genre_input: str, characters_input: str, custom_splitter: str = None, max_tokens_per_section: int = None, sections: List[Dict[str, Any]] = None, detected_language: str = None, source_hash: str = None) -> Tuple[str, List[Dict[str, str]], Dict[str, str], Dict[str, List[str]], Dict[str, str], str | None]:
         """
         Analyze the novel content and break it into sections based on genre and characters.
         Returns a summary and the segmented sections.
+        `max_tokens_per_section` verilmezse analiz modelinin hedef bölüm boyutu kullanılır.
+        `sections` verilirse (analyze_file) metin yeniden bölümlere ayrılmaz; `detected_language` verilirse dil yeniden tespit edilmez.
+        `source_hash` verilirse AI analizleri ve bölüm dilleri önbellekten alınır veya hatasız tamamlanınca önbelleğe yazılır.
         """
         all_errors = []
 
         # Detect language
-        detected_language = self._detect_language(content)
+        if not detected_language:
+            detected_language = self._detect_language(content)
         self.detected_language = detected_language
 
         # Use pre-defined genre if provided, otherwise detect
         genre = genre_input if genre_input else self._detect_genre(content)
 
-        # Karakter analizi yap (tamamen AI ile)
-        self.characters, char_error = self._analyze_characters(content)
-        if char_error:
-            all_errors.append(char_error)
-        
-        # Kültürel Bağlam analizi yap
-        self.cultural_context, cultural_error = self._analyze_cultural_context(content)
-        if cultural_error:
-            all_errors.append(cultural_error)
-
-        # Temalar ve Motifler analizi yap
-        self.main_themes, themes_error = self._analyze_main_themes_and_motifs(content)
-        if themes_error:
-            all_errors.append(themes_error)
-
-        # Ortam ve Atmosfer analizi yap
-        self.setting_atmosphere, setting_error = self._analyze_setting_and_atmosphere(content)
-        if setting_error:
-            all_errors.append(setting_error)
+        # AI analizleri: aynı dosya, promptlar ve model için önbellekten, yoksa dört ayrı istekle
+        analysis_key = fingerprint(source_hash, self.prompts_fingerprint(), self.model_name, self.analysis_max_chars) if source_hash else None
+        self.analysis_from_cache = self._load_cached_analysis(analysis_key)
+        if not self.analysis_from_cache:
+            all_errors = self._run_ai_analyses(content)
+            if analysis_key and not all_errors:
+                self._store_cached_artifact("analysis", analysis_key, {
+                    "characters": self.characters, "cultural_context": self.cultural_context,
+                    "main_themes": self.main_themes, "setting_atmosphere": self.setting_atmosphere,
+                }, self.prompts_fingerprint())
 
         # Segment into sections
-        sections = self.get_sections(content, custom_splitter=custom_splitter)
+        if sections is None:
+            sections = self.get_sections(content, max_tokens_per_section=max_tokens_per_section, custom_splitter=custom_splitter)
+
+        # Bölüm bazında dil tespiti (karışık dilli romanlar için); tespit edilemeyen bölümler romanın dilini kullanır
+        languages_key = fingerprint(source_hash, len(sections), max_tokens_per_section, custom_splitter, self.section_language_min_chars, self.section_language_min_confidence) if source_hash else None
+        section_languages = self._load_cached_artifact("section_languages", languages_key)
+        if not isinstance(section_languages, list) or len(section_languages) != len(sections):
+            section_languages = detect_section_languages(
+                [section["text"] for section in sections], workers=self.section_language_workers,
+                min_chars=self.section_language_min_chars, min_confidence=self.section_language_min_confidence
+            )
+            if languages_key:
+                self._store_cached_artifact("section_languages", languages_key, section_languages)
+        for section, language in zip(sections, section_languages):
+            section["language"] = language
+        other_language_count = sum(1 for language in section_languages if language and language != detected_language)
+        if other_language_count:
+            logger.info(f"{other_language_count} bölüm romanın genel dilinden ({detected_language}) farklı bir dilde tespit edildi.")
+
+        # Karakter ve terim geçişleri (bölüm bazında), tek geçişte
+        self.build_mention_index(sections)
 
         # Karakter bilgilerini formatla
         character_info = "\n".join([
@@ -349,6 +454,73 @@ Bölüm Sayısı: {len(sections)}
 
         return analysis_summary, sections, self.cultural_context, self.main_themes, self.setting_atmosphere, final_error_message
 
+    def _run_ai_analyses(self, content: str) -> List[str]:
+        """Karakter, kültürel bağlam, tema/motif ve ortam/atmosfer analizlerini yapar; hata mesajlarını döndürür."""
+        errors = []
+        # Karakter analizi yap (tamamen AI ile)
+        self.characters, char_error = self._analyze_characters(content)
+        if char_error:
+            errors.append(char_error)
+        
+        # Kültürel Bağlam analizi yap
+        self.cultural_context, cultural_error = self._analyze_cultural_context(content)
+        if cultural_error:
+            errors.append(cultural_error)
+
+        # Temalar ve Motifler analizi yap
+        self.main_themes, themes_error = self._analyze_main_themes_and_motifs(content)
+        if themes_error:
+            errors.append(themes_error)
+
+        # Ortam ve Atmosfer analizi yap
+        self.setting_atmosphere, setting_error = self._analyze_setting_and_atmosphere(content)
+        if setting_error:
+            errors.append(setting_error)
+        return errors
+
+    def prompts_fingerprint(self) -> str:
+        """Geçerli analiz promptlarının özeti; önbellek anahtarına girer ve prompt değişince eski kayıtları ayırt eder."""
+        return fingerprint(self.get_all_prompts())
+
+    def invalidate_analysis_cache(self) -> int:
+        """Geçerli promptlardan farklı promptlarla üretilmiş analiz kayıtlarını önbellekten siler."""
+        return invalidate_artifacts(self.analysis_cache_dir, "analysis", self.prompts_fingerprint())
+
+    def _load_cached_analysis(self, cache_key: str) -> bool:
+        cached = self._load_cached_artifact("analysis", cache_key)
+        if not isinstance(cached, dict):
+            return False
+        self.characters = cached.get("characters", {})
+        self.cultural_context = cached.get("cultural_context", {})
+        self.main_themes = cached.get("main_themes", {})
+        self.setting_atmosphere = cached.get("setting_atmosphere", {})
+        logger.info("Roman analizi önbellekten alındı (aynı dosya, promptlar ve model).")
+        return True
+
+    def _load_cached_artifact(self, kind: str, cache_key: str) -> Any:
+        if not cache_key or not self.analysis_cache_enabled:
+            return None
+        return load_artifact(self.analysis_cache_dir, kind, cache_key)
+
+    def _store_cached_artifact(self, kind: str, cache_key: str, value: Any, prompts_fingerprint: str = ""):
+        if not self.analysis_cache_enabled:
+            return
+        try:
+            store_artifact(self.analysis_cache_dir, kind, cache_key, value, prompts_fingerprint)
+        except OSError as e:
+            logger.warning(f"Analiz sonucu önbelleğe yazılamadı: {e}")
+
+    def build_mention_index(self, sections: List[Dict[str, Any]], terms: List[str] = None) -> Dict[str, int]:
+        """
+        Karakter adları, lakapları, takma adları ve terimler için bölümleri tek geçişte tarar.
+        Her bölüme "mentions" yazılır ve karakterlerin "mentions" alanı toplamlarla güncellenir.
+        """
+        terms = self.mention_terms if terms is None else terms
+        totals = index_sections(sections, MentionScanner(mention_entities(self.characters, terms)))
+        for name, char_data in self.characters.items():
+            char_data["mentions"] = totals.get(name, 0)
+        return totals
+
     def get_detected_language(self) -> str:
         """
         Get the detected language of the novel.
@@ -379,78 +551,27 @@ Bölüm Sayısı: {len(sections)}
         """
         return self.setting_atmosphere
 
-    def get_sections(self, text: str, max_words_per_section: int = 1000, custom_splitter: str = None) -> List[Dict[str, str]]:
+    def get_sections(self, text: str, max_tokens_per_section: int = None, custom_splitter: str = None) -> List[Dict[str, str]]:
         """
         Metni, çeviri için optimal boyutlarda bölümlere ayırır.
 
         1.  Metni önce "Chapter", "Bölüm", "***" gibi yapısal ayraçlara veya kullanıcı 
             tanımlı bir ayraca göre ana bölümlere ayırır.
-        2.  Her ana bölümü, kelime sayısını dikkate alarak daha küçük ve yönetilebilir 
-            alt bölümlere ayırır. Bir alt bölüm `max_words_per_section` sınırını 
+        2.  Her ana bölümü, tahmini token sayısını dikkate alarak daha küçük ve yönetilebilir 
+            alt bölümlere ayırır. Bir alt bölüm `max_tokens_per_section` sınırını 
             aştığında, yeni bir alt bölüm başlatılır. Bu bölme işlemi, bir paragrafın 
             ortasında değil, paragrafların arasında yapılır.
+            Tek başına sınırı aşan paragraflar cümle sınırlarından parçalara bölünür; parçalar
+            "split_paragraph" ({"id", "part", "parts"}) bilgisini taşır ve dışa aktarımda yeniden birleştirilir.
+            Token sayısı yazı sistemine göre tahmin edilir, böylece boşluksuz yazılan dillerde
+            (Çince, Japonca) de bölümler diğer dillerle aynı büyüklükte olur.
         """
         if not text.strip():
             return []
-
-        # Adım 1: Metni yapısal ayraçlara göre ana bölümlere ayır
-        if custom_splitter:
-            splitter_pattern = f'({re.escape(custom_splitter)})'
-        else:
-            splitter_pattern = r'(\b(?:chapter|bölüm|kısım|part)\s*\d+\b.*?$|^\s*\*+\s*$|^\s*#+\s*$)'
-        
-        parts = re.split(splitter_pattern, text, flags=re.MULTILINE | re.IGNORECASE)
-        
-        main_sections_text = []
-        current_section_content = ""
-        for i, part in enumerate(parts):
-            if i % 2 == 1:  # Ayraç
-                if current_section_content.strip():
-                    main_sections_text.append(current_section_content.strip())
-                current_section_content = part
-            else:  # Metin
-                current_section_content += part
-        
-        if current_section_content.strip():
-            main_sections_text.append(current_section_content.strip())
-
-        if not main_sections_text:
-            main_sections_text.append(text.strip())
-
-        # Adım 2: Her ana bölümü kelime limitine göre alt bölümlere ayır
-        final_sections = []
-        for section_text in main_sections_text:
-            # Paragrafları bir veya daha fazla yeni satır karakterine göre böl.
-            # Bu, hem boş satırla ayrılmış hem de sadece alt satıra geçerek
-            # oluşturulmuş paragrafları yakalar.
-            paragraphs = re.split(r'\n+', section_text.strip())
-            
-            current_sub_section_paragraphs = []
-            current_word_count = 0
-
-            for paragraph in paragraphs:
-                paragraph_word_count = len(paragraph.split())
-                
-                # Eğer mevcut alt bölüme bu paragrafı eklemek kelime limitini aşacaksa
-                # ve alt bölüm boş değilse, mevcut alt bölümü kaydet ve yenisini başlat.
-                if current_word_count > 0 and (current_word_count + paragraph_word_count) > max_words_per_section:
-                    sub_section_content = "\n\n".join(current_sub_section_paragraphs)
-                    final_sections.append({"type": "novel_section", "text": sub_section_content})
-                    
-                    # Yeni alt bölümü bu paragrafla başlat
-                    current_sub_section_paragraphs = [paragraph]
-                    current_word_count = paragraph_word_count
-                else:
-                    # Paragrafı mevcut alt bölüme ekle
-                    current_sub_section_paragraphs.append(paragraph)
-                    current_word_count += paragraph_word_count
-
-            # Döngü bittikten sonra kalan son alt bölümü de ekle
-            if current_sub_section_paragraphs:
-                sub_section_content = "\n\n".join(current_sub_section_paragraphs)
-                final_sections.append({"type": "novel_section", "text": sub_section_content})
-
-        return final_sections
+        if not max_tokens_per_section:
+            max_tokens_per_section = section_token_target(self.model_name)
+        lines = ((line, None) for line in text.split("\n"))
+        return list(iter_sections_from_lines(lines, max_tokens_per_section, custom_splitter))
 
     # Prompt güncelleme metodları
     def update_character_analysis_prompt(self, new_prompt: str):
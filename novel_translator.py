@@ -6,25 +6,38 @@ import tkinter.font as tkFont
 import datetime
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from novel_analyzer import NovelAnalyzer
 from translator import NovelTranslator
+from segmentation import section_token_target, join_section_texts, find_repeated_paragraphs, translate_trivial_section, estimate_tokens, pack_texts
+from section_store import SectionStore
+from language_detection import same_language
+from mention_index import MentionScanner, mention_entities, mention_totals, sections_mentioning
+from term_extraction import extract_candidate_terms
+from analysis_cache import fingerprint, load_artifact, store_artifact, invalidate_artifacts
+from quality_checks import check_translation, parse_glossary, format_issues, score_back_translations, rank_by_divergence
 from dotenv import load_dotenv
-import json5 # json yerine json5 kullanıldı
+from serialization import dumps_json, dump_json, dump_json_list, load_json
 import logging
+import multiprocessing
 
 # Loglama yapılandırması
 # Program her çalıştığında log dosyasını sıfırlamak için mode='w' kullanılıyor.
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("app.log", mode='w', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Dil tespiti süreç havuzundaki işçiler (spawn) bu modülü yeniden yüklediğinde log dosyası sıfırlanmaz.
+if multiprocessing.current_process().name == "MainProcess":
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("app.log", mode='w', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
 logger = logging.getLogger(__name__)
 
 PROMPT_FILE = "prompts.json"
+PROJECT_FILE_EXTENSION = ".ntproj"
+DEFAULT_PROJECT_AUTOSAVE_SECONDS = 30 # Proje durumunun otomatik kaydedilme aralığı (PROJECT_AUTOSAVE_SECONDS ile değiştirilebilir)
 
 class NovelTranslatorApp:
     def __init__(self, root):
@@ -33,6 +46,7 @@ class NovelTranslatorApp:
         self.root.geometry("1200x800")
         
         load_dotenv()
+        self.project_autosave_ms = self._read_autosave_interval_ms()
 
         self.ui_texts = {}
         self.app_languages = {}
@@ -88,7 +102,9 @@ class NovelTranslatorApp:
         self.analyzer = NovelAnalyzer()
         self.translator = NovelTranslator(target_country=os.getenv("TARGET_COUNTRY", "US")) 
         self.stop_event = threading.Event()
-        self.novel_sections = []
+        self.store_workers = [] # Bölüm deposuna yazan arka plan iş parçacıkları (çeviri, geri çeviri)
+        self.novel_sections = SectionStore() # Bölümler ve aşama metinleri diskte (SQLite), bellekte yalnızca meta veriler
+        self.project_path = None # Proje dosyası kaydedilene kadar depo geçici bir dosyadadır
         self.translated_sections = []
         self.back_translated_sections = []
         self.novel_analyzed = False
@@ -99,6 +115,44 @@ class NovelTranslatorApp:
         self.setting_atmosphere = {}
         self.original_detected_language_code = None
         self.user_defined_terms = "" # Kullanıcı tanımlı terimler için
+        self._mention_scanner = None # Geçiş dizini tarayıcısı; karakterler veya terimler değişince yeniden oluşturulur
+        self.translation_settings = {
+            "style_guide_update_mode": self.translator.style_guide_update_mode,
+            "style_guide_batch_sections": self.translator.style_guide_batch_sections,
+            "style_guide_batch_words": self.translator.style_guide_batch_words,
+            # "sequential": bölümler sırayla, güncellenen stil rehberiyle çevrilir
+            # "two_pass": önce tüm bölümler paralel taslak çevrilir, sonra tutarlılık geçişi yapılır
+            "translation_mode": os.getenv("TRANSLATION_MODE", "sequential").lower(),
+            "parallel_workers": int(os.getenv("TRANSLATION_WORKERS", "4")),
+            # "full": üç ayrı çağrı (ilk çeviri, satır düzenleme, yerelleştirme); "fast": tek çağrı
+            "pipeline_profile": os.getenv("PIPELINE_PROFILE", "full").lower(),
+            # Geri çeviri, ana çeviriden sonra ayrı bir geçiş olarak çalışır:
+            # "disabled", "all", "every_k" (her k. bölüm) veya "flagged" (incelemeye işaretlenen bölümler)
+            "back_translation_mode": os.getenv("BACK_TRANSLATION_MODE", "all").lower(),
+            "back_translation_every_k": int(os.getenv("BACK_TRANSLATION_EVERY_K", "5")),
+            # Yerel kalite kontrolleri ve incelemeye işaretleme eşiği (skor bunun altındaysa bölüm işaretlenir)
+            "qa_enabled": self.translator.qa_enabled,
+            "qa_flag_threshold": float(os.getenv("QA_FLAG_THRESHOLD", "0.7")),
+            # Roman genelinde tekrarlanan paragraflar çeviriden önce bir kez çevrilip bölümlerde yeniden kullanılır
+            "dedup_repeated_paragraphs": os.getenv("DEDUP_REPEATED_PARAGRAPHS", "true").lower() == "true",
+            "dedup_min_chars": int(os.getenv("DEDUP_MIN_PARAGRAPH_CHARS", "40")),
+            # Ardışık kısa bölümler (başlıklar, epigraflar, tek satırlık sahneler) tek bir istekte birlikte çevrilir
+            "pack_small_sections": os.getenv("PACK_SMALL_SECTIONS", "true").lower() == "true",
+            "pack_small_section_tokens": int(os.getenv("PACK_SMALL_SECTION_TOKENS", "150")),
+            # Zaten hedef dilde olan bölümler: "edit" (yalnızca satır düzenlemesi), "pass_through" (aynen) veya "translate"
+            "same_language_sections": self.translator.same_language_mode,
+            # Analizden sonra romanda yinelenen terimler yerel olarak çıkarılır, tek istekte çevrilip stil rehberine eklenir
+            "seed_glossary_terms": os.getenv("SEED_GLOSSARY_TERMS", "true").lower() == "true",
+            "term_candidates_limit": int(os.getenv("TERM_CANDIDATES_LIMIT", "80")),
+            # Aynı kitabın analizi ve ilk stil rehberi dosya, prompt ve model özetine göre önbellekten alınır
+            "analysis_cache": self.analyzer.analysis_cache_enabled,
+            # Aşamaya özel modeller (boş = varsayılan model)
+            "stage_models": {
+                **{stage: model_name or "" for stage, model_name in self.translator.stage_models.items()},
+                "analysis": self.analyzer.analysis_model or "",
+            },
+        }
+        self.sort_sections_by_divergence = False  # Bölüm listesi geri çeviri sapmasına (chrF) göre sıralı mı
         
         lang_texts_init = self.ui_texts.get(self.current_app_language, self.ui_texts.get("en", {}))
         self.input_analysis_frame = ttk.LabelFrame(self.main_frame, text=lang_texts_init.get("input_analysis_frame_title", "Input & Analysis"), padding="5")
@@ -135,6 +189,7 @@ class NovelTranslatorApp:
         self._update_translation_progress("log_app_init_start")
         self.load_prompts_from_file()
         self.update_ui_texts() 
+        self.root.after(self.project_autosave_ms, self._autosave_project_state)
         self._update_translation_progress("log_app_init_complete")
         
     def _load_languages_from_files(self):
@@ -160,7 +215,7 @@ class NovelTranslatorApp:
                 filepath = os.path.join(lang_dir, filename)
                 try:
                     with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json5.load(f)
+                        data = load_json(f)
                         lang_name = data.get("_language_name_", lang_code.capitalize())
                         self.ui_texts[lang_code] = data
                         self.app_languages[lang_name] = lang_code
@@ -210,6 +265,10 @@ class NovelTranslatorApp:
         
         if hasattr(self, 'select_novel_button'):
             self.select_novel_button.config(text=lang_texts.get("select_novel_file_button", "Select Novel File"))
+        if hasattr(self, 'open_project_button'):
+            self.open_project_button.config(text=lang_texts.get("open_project_button", "Open Project"))
+        if hasattr(self, 'save_project_as_button'):
+            self.save_project_as_button.config(text=lang_texts.get("save_project_as_button", "Save Project As"))
         if hasattr(self, 'app_language_label_widget'):
             self.app_language_label_widget.config(text=lang_texts.get("app_language_label", "App Language:"))
         
@@ -274,6 +333,8 @@ class NovelTranslatorApp:
             self.stop_translation_button_widget.config(text=lang_texts.get("stop_translation_button", "Stop Translation"))
         if hasattr(self, 'view_log_button_widget'):
             self.view_log_button_widget.config(text=lang_texts.get("view_log_button", "View Logs"))
+        if hasattr(self, 'translation_settings_button_widget'):
+            self.translation_settings_button_widget.config(text=lang_texts.get("translation_settings_button", "Translation Settings"))
             
         if hasattr(self, 'char_window') and self.char_window.winfo_exists():
             self.char_window.title(lang_texts.get("character_editor_title", "Character Editor"))
@@ -309,6 +370,8 @@ class NovelTranslatorApp:
                 self.prompt_notebook_widget.tab(self.cultural_tab_widget, text=lang_texts.get("cultural_localization_prompt_tab", "Cultural Localization"))
                 if hasattr(self, 'back_translation_tab_widget'):
                     self.prompt_notebook_widget.tab(self.back_translation_tab_widget, text=lang_texts.get("back_translation_prompt_tab", "Back-Translation Prompt"))
+                if hasattr(self, 'fast_translation_tab_widget'):
+                    self.prompt_notebook_widget.tab(self.fast_translation_tab_widget, text=lang_texts.get("fast_translation_prompt_tab", "Fast Mode (Single Call)"))
             if hasattr(self.prompt_window_widget, 'export_button'): self.prompt_window_widget.export_button.config(text=lang_texts.get("export_button", "Export"))
             if hasattr(self.prompt_window_widget, 'import_button'): self.prompt_window_widget.import_button.config(text=lang_texts.get("import_button", "Import"))
             if hasattr(self.prompt_window_widget, 'reset_button'): self.prompt_window_widget.reset_button.config(text=lang_texts.get("reset_to_default_button", "Reset Defaults"))
@@ -328,6 +391,8 @@ class NovelTranslatorApp:
             if hasattr(self.section_window_widget, 'save_button'): self.section_window_widget.save_button.config(text=lang_texts.get("save_changes_button", "Save Changes"))
             if hasattr(self.section_window_widget, 'export_button'): self.section_window_widget.export_button.config(text=lang_texts.get("export_button", "Export"))
             if hasattr(self.section_window_widget, 'import_button'): self.section_window_widget.import_button.config(text=lang_texts.get("import_button", "Import"))
+            if hasattr(self.section_window_widget, 'back_translate_button'): self.section_window_widget.back_translate_button.config(text=lang_texts.get("back_translate_button", "Back-Translate"))
+            if hasattr(self.section_window_widget, 'pipeline_profile_label'): self.section_window_widget.pipeline_profile_label.config(text=lang_texts.get("pipeline_profile_label", "Pipeline Profile:"))
 
         if hasattr(self, 'analysis_prompt_window_widget') and self.analysis_prompt_window_widget.winfo_exists():
             self.analysis_prompt_window_widget.title(lang_texts.get("edit_analysis_prompts_title", "Edit Analysis Prompts"))
@@ -346,6 +411,8 @@ class NovelTranslatorApp:
             if hasattr(self, 'style_guide_notebook_widget'):
                 self.style_guide_notebook_widget.tab(self.style_guide_generation_tab_widget, text=lang_texts.get("style_guide_generation_tab", "Generation"))
                 self.style_guide_notebook_widget.tab(self.style_guide_update_tab_widget, text=lang_texts.get("style_guide_update_tab", "Update"))
+                self.style_guide_notebook_widget.tab(self.style_guide_harmonization_tab_widget, text=lang_texts.get("style_guide_harmonization_tab", "Harmonization"))
+                self.style_guide_notebook_widget.tab(self.style_guide_term_translation_tab_widget, text=lang_texts.get("style_guide_term_translation_tab", "Term Translation"))
             if hasattr(self.style_guide_prompt_window_widget, 'export_button'): self.style_guide_prompt_window_widget.export_button.config(text=lang_texts.get("export_button", "Export"))
             if hasattr(self.style_guide_prompt_window_widget, 'import_button'): self.style_guide_prompt_window_widget.import_button.config(text=lang_texts.get("import_button", "Import"))
             if hasattr(self.style_guide_prompt_window_widget, 'reset_button'): self.style_guide_prompt_window_widget.reset_button.config(text=lang_texts.get("reset_to_default_button", "Reset Defaults"))
@@ -356,6 +423,11 @@ class NovelTranslatorApp:
             if hasattr(self.style_guide_viewer_window_widget, 'close_button'): 
                  self.style_guide_viewer_window_widget.close_button.config(text=lang_texts.get("close_button", "Close"))
 
+        if hasattr(self, 'translation_settings_window') and self.translation_settings_window.winfo_exists():
+            self.translation_settings_window.title(lang_texts.get("translation_settings_title", "Translation Settings"))
+            if hasattr(self.translation_settings_window, 'save_button'):
+                self.translation_settings_window.save_button.config(text=lang_texts.get("save_button", "Save"))
+
         if hasattr(self, 'log_viewer_window') and self.log_viewer_window.winfo_exists():
             self.log_viewer_window.title(lang_texts.get("log_viewer_title", "Application Logs"))
             if hasattr(self.log_viewer_window, 'refresh_button'):
@@ -379,7 +451,7 @@ class NovelTranslatorApp:
 
         try:
             with open(PROMPT_FILE, 'r', encoding='utf-8') as f:
-                data = json5.load(f)
+                data = load_json(f)
         except Exception as e:
             logger.error(f"Prompt dosyası yüklenirken hata: {e}", exc_info=True)
             self._update_translation_progress("log_prompts_load_error", filename=PROMPT_FILE, error=str(e))
@@ -396,6 +468,7 @@ class NovelTranslatorApp:
             "style_guide_text", "original_section_text"
         }
         initial_prompt_vars = translator_base_vars.union({"mandatory_terms_section"})
+        fast_translation_vars = initial_prompt_vars
         line_edit_vars = translator_base_vars.union({"initial_translation"})
         cultural_localization_vars = translator_base_vars.union({"line_edited"})
         back_translation_vars = {"source_language", "target_language", "translated_text"}
@@ -405,6 +478,11 @@ class NovelTranslatorApp:
             "formatted_themes_motifs", "formatted_setting_atmosphere"
         }
         style_update_vars = style_gen_vars.union({"current_style_guide_json", "original_text", "translated_text"})
+        harmonization_vars = {
+            "source_language", "target_language", "target_country", "style_guide_text",
+            "violations", "original_section_text", "translated_text"
+        }
+        term_translation_vars = {"genre", "source_language", "target_language", "target_country", "terms"}
 
         validation_map = {
             "all_analyzer_prompts": {
@@ -417,9 +495,12 @@ class NovelTranslatorApp:
                 "initial_translation": initial_prompt_vars,
                 "line_edit": line_edit_vars,
                 "cultural_localization": cultural_localization_vars,
+                "fast_translation": fast_translation_vars,
                 "back_translation": back_translation_vars,
                 "style_guide_generation": style_gen_vars,
                 "style_guide_update": style_update_vars,
+                "harmonization": harmonization_vars,
+                "term_translation": term_translation_vars,
             }
         }
 
@@ -473,8 +554,9 @@ class NovelTranslatorApp:
         }
         try:
             with open(PROMPT_FILE, 'w', encoding='utf-8') as f:
-                json5.dump(data, f, ensure_ascii=False, indent=4)
+                dump_json(data, f, indent=4)
             self._update_translation_progress("log_prompts_save_success", filename=PROMPT_FILE)
+            self._invalidate_prompt_caches()
         except Exception as e:
             logger.error(f"Prompt dosyası kaydedilirken hata: {e}", exc_info=True)
             self._update_translation_progress("log_prompts_save_error", filename=PROMPT_FILE, error=str(e))
@@ -533,6 +615,13 @@ class NovelTranslatorApp:
         self.custom_splitter_var = tk.StringVar()
         self.custom_splitter_entry = ttk.Entry(details_frame, textvariable=self.custom_splitter_var)
         self.custom_splitter_entry.grid(row=6, column=1, padx=5, pady=2)
+
+        project_frame = ttk.Frame(self.input_frame_widget)
+        project_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
+        self.open_project_button = ttk.Button(project_frame, text=current_lang_texts.get("open_project_button", "Open Project"), command=self.open_project)
+        self.open_project_button.pack(side=tk.LEFT, padx=5)
+        self.save_project_as_button = ttk.Button(project_frame, text=current_lang_texts.get("save_project_as_button", "Save Project As"), command=self.save_project_as)
+        self.save_project_as_button.pack(side=tk.LEFT, padx=5)
         
     def create_analysis_section(self, frame, column):
         current_lang_texts = self.ui_texts.get(self.current_app_language, {})
@@ -592,6 +681,8 @@ class NovelTranslatorApp:
 
         self.user_terms_button_widget = ttk.Button(button_frame, text=current_lang_texts.get("user_terms_button", "User-Defined Terms"), command=self.show_user_terms_editor)
         self.user_terms_button_widget.pack(side=tk.LEFT, padx=5, pady=5)
+        self.translation_settings_button_widget = ttk.Button(button_frame, text=current_lang_texts.get("translation_settings_button", "Translation Settings"), command=self.show_translation_settings_editor)
+        self.translation_settings_button_widget.pack(side=tk.LEFT, padx=5, pady=5)
 
         self.translate_button_widget = ttk.Button(button_frame, text=current_lang_texts.get("translate_button", "Translate"), command=self.translate_novel)
         self.translate_button_widget.pack(side=tk.LEFT, padx=5, pady=5)
@@ -616,7 +707,156 @@ class NovelTranslatorApp:
             self.file_path_var.set(file_path)
             self.status_var.set(f"Loaded: {os.path.basename(file_path)}") 
             self._update_translation_progress("log_novel_file_selected", filename=os.path.basename(file_path))
-            
+            if not self.genre_var.get():
+                threading.Thread(target=self._suggest_genre, args=(file_path,), daemon=True).start()
+
+    def _suggest_genre(self, file_path):
+        """Tür seçilmemişse, dosyanın örneğinden yerel olarak tahmin edilen türü ön seçer (AI çağrısı yapılmaz)."""
+        try:
+            candidates = self.analyzer.suggest_genre(file_path)
+        except Exception as e:
+            logger.warning(f"Tür tahmini yapılamadı: {e}")
+            return
+        if not candidates or self.genre_var.get() or file_path != self.file_path_var.get():
+            return
+        genre, confidence = candidates[0]
+        self.root.after(0, self.genre_var.set, genre)
+        self._update_translation_progress("log_genre_suggested", genre=genre, confidence=confidence)
+
+    def _save_project_state(self):
+        """
+        Analiz, kullanıcı terimleri, promptlar, ayarlar ve stil rehberini proje deposuna yazar.
+        Depo yalnızca değişen kayıtları diske yazdığı için her bölümden sonra çağrılması ucuzdur.
+        """
+        try:
+            state = {
+                "novel": {
+                    "file_path": self.file_path_var.get(),
+                    "genre": self.genre_var.get(),
+                    "target_language": self.target_language_var.get(),
+                    "target_country": self.target_country_var.get(),
+                    "custom_splitter": self.custom_splitter_var.get(),
+                },
+                "analysis": {
+                    "analyzed": self.novel_analyzed,
+                    "summary": self.analysis_text.get("1.0", tk.END).strip(),
+                    "detected_language": self.original_detected_language_code,
+                    "characters": self.analyzer.characters,
+                    "cultural_context": self.cultural_context,
+                    "main_themes": self.main_themes,
+                    "setting_atmosphere": self.setting_atmosphere,
+                },
+                "user_defined_terms": self.user_defined_terms,
+                "prompts": {
+                    "all_translator_prompts": self.translator.get_all_prompts(),
+                    "all_analyzer_prompts": self.analyzer.get_all_prompts()
+                },
+                "translation_settings": self.translation_settings,
+            }
+            for key, value in state.items():
+                self.novel_sections.set_state(key, value)
+            with self.translator.style_guide_lock:
+                self.novel_sections.add_style_guide_version(self.translator.style_guide)
+        except Exception as e:
+            logger.error(f"Proje durumu kaydedilirken hata: {e}", exc_info=True)
+
+    @staticmethod
+    def _read_autosave_interval_ms():
+        """PROJECT_AUTOSAVE_SECONDS değerini milisaniyeye çevirir; geçersiz veya pozitif olmayan değerde varsayılan kullanılır."""
+        value = os.getenv("PROJECT_AUTOSAVE_SECONDS", str(DEFAULT_PROJECT_AUTOSAVE_SECONDS))
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = 0
+        if seconds <= 0:
+            logger.warning(f"Geçersiz PROJECT_AUTOSAVE_SECONDS değeri: {value!r}; varsayılan {DEFAULT_PROJECT_AUTOSAVE_SECONDS} saniye kullanılıyor.")
+            seconds = DEFAULT_PROJECT_AUTOSAVE_SECONDS
+        return int(seconds * 1000)
+
+    def _autosave_project_state(self):
+        self._save_project_state()
+        self.root.after(self.project_autosave_ms, self._autosave_project_state)
+
+    def _load_project_state(self):
+        """Açılan proje deposundaki durumu uygulamaya ve arayüze geri yükler."""
+        store = self.novel_sections
+        novel = store.get_state("novel", {})
+        self.file_path_var.set(novel.get("file_path", ""))
+        self.genre_var.set(novel.get("genre", ""))
+        if novel.get("target_language") in self.available_languages:
+            self.target_language_var.set(novel["target_language"])
+        if novel.get("target_country") in self.available_countries:
+            self.target_country_var.set(novel["target_country"])
+        self.custom_splitter_var.set(novel.get("custom_splitter", ""))
+
+        analysis = store.get_state("analysis", {})
+        self.analyzer.characters = analysis.get("characters", {})
+        self.characters = self.analyzer.get_characters()
+        self.cultural_context = analysis.get("cultural_context", {})
+        self.main_themes = analysis.get("main_themes", {})
+        self.setting_atmosphere = analysis.get("setting_atmosphere", {})
+        self.original_detected_language_code = analysis.get("detected_language")
+        self.analyzer.detected_language = self.original_detected_language_code
+        self.novel_analyzed = analysis.get("analyzed", len(store) > 0)
+        self.analysis_text.delete(1.0, tk.END)
+        self.analysis_text.insert(tk.END, analysis.get("summary", ""))
+
+        self.user_defined_terms = store.get_state("user_defined_terms", "")
+        self._mention_scanner = None
+        prompts = store.get_state("prompts", {})
+        if "all_translator_prompts" in prompts:
+            self.translator.set_all_prompts(prompts["all_translator_prompts"])
+        if "all_analyzer_prompts" in prompts:
+            self.analyzer.set_all_prompts(prompts["all_analyzer_prompts"])
+        settings = store.get_state("translation_settings")
+        if settings:
+            self.translation_settings.update(settings)
+            self._apply_translation_settings()
+        style_guide = store.latest_style_guide()
+        if style_guide is not None:
+            with self.translator.style_guide_lock:
+                self.translator.style_guide = style_guide
+
+    def open_project(self):
+        lang_texts = self.ui_texts.get(self.current_app_language, {})
+        file_path = filedialog.askopenfilename(filetypes=[(lang_texts.get("project_file_type", "Translation Project"), "*" + PROJECT_FILE_EXTENSION), ("All files", "*.*")])
+        if not file_path:
+            return
+        if self._store_workers_running():
+            # Çalışan işler eski depoya yazmaya devam eder; depo kapatılırsa yazmalar hata verir veya kaybolur
+            messagebox.showwarning(lang_texts.get("warning_message_box_title", "Warning"), lang_texts.get("project_open_busy_warning", "A translation is still running. Stop it and wait for it to finish before opening another project."))
+            return
+        try:
+            store = SectionStore(file_path)
+        except Exception as e:
+            logger.error(f"Proje açılırken hata: {e}", exc_info=True)
+            self._update_translation_progress("log_project_open_error", filename=os.path.basename(file_path), error=str(e))
+            messagebox.showerror(lang_texts.get("error_message_box_title", "Error"), lang_texts.get("project_open_error_message", "Could not open project: {error}").format(error=str(e)))
+            return
+        self.novel_sections.close()
+        self.novel_sections = store
+        self.project_path = file_path
+        self._load_project_state()
+        if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
+            self.update_section_listbox()
+        self.status_var.set(lang_texts.get("project_opened_status", "Project opened: {filename}").format(filename=os.path.basename(file_path)))
+        self._update_translation_progress("log_project_opened", filename=os.path.basename(file_path), sections=len(store))
+
+    def save_project_as(self):
+        lang_texts = self.ui_texts.get(self.current_app_language, {})
+        file_path = filedialog.asksaveasfilename(defaultextension=PROJECT_FILE_EXTENSION, filetypes=[(lang_texts.get("project_file_type", "Translation Project"), "*" + PROJECT_FILE_EXTENSION)])
+        if not file_path:
+            return
+        try:
+            self._save_project_state()
+            self.novel_sections.save_as(file_path)
+            self.project_path = file_path
+            self.status_var.set(lang_texts.get("project_saved_status", "Project saved: {filename}").format(filename=os.path.basename(file_path)))
+            self._update_translation_progress("log_project_saved", filename=os.path.basename(file_path))
+        except Exception as e:
+            logger.error(f"Proje kaydedilirken hata: {e}", exc_info=True)
+            messagebox.showerror(lang_texts.get("error_message_box_title", "Error"), lang_texts.get("export_error_message", "Error during export: {error}").format(error=str(e)))
+
     def analyze_novel(self):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         if not self.file_path_var.get():
@@ -630,16 +870,19 @@ class NovelTranslatorApp:
                 messagebox.showerror(lang_texts.get("error_message_box_title", "Error"), lang_texts.get("select_genre_error", "Please select a genre!"))
                 return
                 
-            with open(self.file_path_var.get(), 'r', encoding='utf-8') as file:
-                content = file.read()
-            
             custom_splitter = self.custom_splitter_var.get()
+            # Bölüm boyutu, analiz modeline değil bölümleri çevirecek modele göre belirlenir
+            max_tokens_per_section = section_token_target(self.translator.stage_models.get("initial_translation") or self.translator.model_name)
                 
-            analysis_summary, sections, self.cultural_context, self.main_themes, self.setting_atmosphere, error_message = self.analyzer.analyze(content, genre, "", custom_splitter)
+            self.analyzer.mention_terms = self._mention_terms()
+            self._mention_scanner = None
+            analysis_summary, sections, self.cultural_context, self.main_themes, self.setting_atmosphere, error_message = self.analyzer.analyze_file(self.file_path_var.get(), genre, "", custom_splitter, max_tokens_per_section=max_tokens_per_section)
+            if self.analyzer.analysis_from_cache:
+                self._update_translation_progress("log_analysis_loaded_from_cache")
 
-            self.novel_sections = []
+            new_sections = []
             for section in sections:
-                self.novel_sections.append({
+                new_sections.append({
                     "type": section.get("type", "unknown"),
                     "text": section.get("text", ""),
                     "translation_successful": False,
@@ -649,6 +892,16 @@ class NovelTranslatorApp:
                     "line_edited_text": "",
                     "localized_text": ""
                 })
+                if section.get("split_paragraph"):
+                    # Uzun paragrafın parçası: dışa aktarımda aynı paragraf olarak birleştirilir
+                    new_sections[-1]["split_paragraph"] = section["split_paragraph"]
+                if section.get("source_span"):
+                    new_sections[-1]["source_span"] = section["source_span"]  # Kaynak dosyadaki bayt aralığı
+                if section.get("language"):
+                    new_sections[-1]["language"] = section["language"]  # Bölüm bazında tespit edilen kaynak dil
+                if section.get("mentions"):
+                    new_sections[-1]["mentions"] = section["mentions"]  # Bölümdeki karakter/terim geçişleri
+            self.novel_sections.replace_all(new_sections)
 
             self.characters = self.analyzer.get_characters()
             self.analysis_text.delete(1.0, tk.END)
@@ -694,19 +947,31 @@ class NovelTranslatorApp:
             selected_country_name = self.target_country_var.get()
             target_country_code = self.available_countries.get(selected_country_name, "US")
 
-            self.translator.generate_style_guide_with_ai(
-                genre, self.characters, self.cultural_context, self.main_themes, self.setting_atmosphere,
-                self.original_detected_language_code, self.available_languages[self.target_language_var.get()],
-                target_country_code, lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
-                max_retries=self.retries_var.get(),
-                stop_event=self.stop_event
-            )
+            style_guide_key = self._style_guide_cache_key(genre, self.available_languages[self.target_language_var.get()], target_country_code)
+            cached_style_guide = load_artifact(self.analyzer.analysis_cache_dir, "style_guide", style_guide_key) if style_guide_key else None
+            if isinstance(cached_style_guide, dict):
+                with self.translator.style_guide_lock:
+                    self.translator.style_guide = cached_style_guide
+                self._update_translation_progress("log_style_guide_loaded_from_cache")
+            else:
+                style_guide_generated = self.translator.generate_style_guide_with_ai(
+                    genre, self.characters, self.cultural_context, self.main_themes, self.setting_atmosphere,
+                    self.original_detected_language_code, self.available_languages[self.target_language_var.get()],
+                    target_country_code, lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+                    max_retries=self.retries_var.get(),
+                    stop_event=self.stop_event
+                )
+                if self.translation_settings["seed_glossary_terms"]:
+                    self._seed_glossary_terms(genre, target_country_code)
+                if style_guide_generated and style_guide_key:
+                    self._store_cached_style_guide(style_guide_key)
             self._update_translation_progress("style_guide_updated_by_ai_progress") 
 
             self.status_var.set(lang_texts.get("analysis_complete_status", "Novel analysis complete. Ready for translation."))
             if not error_message:
                 messagebox.showinfo(lang_texts.get("analysis_complete_title", "Analysis Complete"), lang_texts.get("analysis_complete_message", "Analysis is complete."))
             self.novel_analyzed = True
+            self._save_project_state()
             self._update_translation_progress("log_novel_analysis_finished")
         except Exception as e:
             detailed_error = f"{lang_texts.get('unexpected_analysis_error', 'An unexpected error occurred during analysis')}: {str(e)}"
@@ -742,13 +1007,28 @@ class NovelTranslatorApp:
             selected_country_name = self.target_country_var.get()
             target_country_code = self.available_countries.get(selected_country_name, "US")
             self.translator.target_country = target_country_code
+            self._apply_translation_settings()
             
-            threading.Thread(target=self._run_translation_in_background, args=(max_retries, target_country_code, self.user_defined_terms), daemon=True).start()
+            if self.translation_settings["translation_mode"] == "two_pass":
+                target = self._run_two_pass_translation_in_background
+            else:
+                target = self._run_translation_in_background
+            self._start_store_worker(target, max_retries, target_country_code, self.user_defined_terms)
         except Exception as e:
             error_msg = f"{lang_texts.get('generic_error_occurred', 'An error occurred')}: {str(e)}"
             messagebox.showerror(lang_texts.get("error_message_box_title", "Error"), error_msg)
             self._update_translation_progress("log_translation_process_error", error=str(e))
 
+    def _start_store_worker(self, target, *args):
+        """Bölüm deposuna yazan bir arka plan işi başlatır; proje değiştirilmeden önce bitmesi beklenir."""
+        self.store_workers = [worker for worker in self.store_workers if worker.is_alive()]
+        worker = threading.Thread(target=target, args=args, daemon=True)
+        self.store_workers.append(worker)
+        worker.start()
+
+    def _store_workers_running(self) -> bool:
+        return any(worker.is_alive() for worker in self.store_workers)
+
     def stop_translation_process(self):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         self.stop_event.set()
@@ -761,7 +1041,10 @@ class NovelTranslatorApp:
         sections_to_translate = [
             (i, s) for i, s in enumerate(self.novel_sections) if not s.get("translation_successful")
         ]
+        self._translate_small_sections(sections_to_translate, max_retries, target_country_code, user_defined_terms)
+        sections_to_translate = [(i, s) for i, s in sections_to_translate if not s.get("translation_successful")]
         total_sections_to_translate = len(sections_to_translate)
+        repeated_paragraphs = self._translate_repeated_paragraphs(sections_to_translate, max_retries, target_country_code, user_defined_terms)
 
         for idx, (current_section_index, section) in enumerate(sections_to_translate):
             if self.stop_event.is_set():
@@ -786,18 +1069,21 @@ class NovelTranslatorApp:
                     line_edit_override=line_edit_override,
                     localization_override=localization_override,
                     genre=self.genre_var.get(),
-                    characters_json_str=json5.dumps(self.characters),
-                    cultural_context_json_str=json5.dumps(self.cultural_context),
-                    main_themes_json_str=json5.dumps(self.main_themes),
-                    setting_atmosphere_json_str=json5.dumps(self.setting_atmosphere),
-                    source_language=self.original_detected_language_code,
+                    characters_json_str=dumps_json(self.characters),
+                    cultural_context_json_str=dumps_json(self.cultural_context),
+                    main_themes_json_str=dumps_json(self.main_themes),
+                    setting_atmosphere_json_str=dumps_json(self.setting_atmosphere),
+                    source_language=self._section_source_language(section),
                     target_language=self.available_languages[self.target_language_var.get()],
                     target_country=target_country_code,
                     progress_callback=lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, idx + 1, total_sections_to_translate, **kwargs),
                     stop_event=self.stop_event,
                     max_retries=max_retries,
                     user_defined_terms=user_defined_terms,
-                    intermediate_callback=intermediate_update_callback
+                    intermediate_callback=intermediate_update_callback,
+                    pipeline_profile=self._get_pipeline_profile(section),
+                    repeated_paragraphs=repeated_paragraphs,
+                    section_index=current_section_index
                 )
 
                 if self.stop_event.is_set():
@@ -810,25 +1096,19 @@ class NovelTranslatorApp:
                 section["localized_text"] = translation_results.get("final", "")
                 final_translation = translation_results.get("final", "")
                 
-                back_translated = ""
                 # Sadece çeviri durdurulmadıysa ve başarılıysa bölümü güncelle
                 if not self.stop_event.is_set() and final_translation:
                     section["translated_text"] = final_translation
                     section["translation_successful"] = True
-                    if final_translation and final_translation != original_text:
-                        back_translated = self.translator.back_translate(
-                            final_translation, self.available_languages[self.target_language_var.get()],
-                            self.analyzer.get_detected_language(),
-                            lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, idx + 1, total_sections_to_translate, **kwargs),
-                            max_retries=max_retries
-                        )
-                    section["back_translated_text"] = back_translated
+                    section["translation_error"] = ""
+                    self._update_section_quality(section, translation_results.get("qa"))
                 else:
                     # Çeviri durdurulduysa veya başarısızsa, başarı durumunu false yap
                     section["translation_successful"] = False
-                    section["back_translated_text"] = "" # Geri çeviriyi de temizle
+                # Geri çeviri ana çeviriden sonra ayrı geçişte yapılır; eski geri çeviri artık geçersiz
+                section["back_translated_text"] = ""
                 
-                self.root.after(0, self._append_translated_chapter, original_text, final_translation, back_translated)
+                self.root.after(0, self._append_translated_chapter, original_text, final_translation, "")
                 
                 # "Bölümleri Düzenle" penceresi açıksa, UI'ı güncelle
                 if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
@@ -844,8 +1124,10 @@ class NovelTranslatorApp:
                         pass
                 
             except Exception as e:
+                logger.error(f"Bölüm {current_section_index + 1} çevrilemedi: {e}", exc_info=True)
+                # Hata çeviri metnine yazılmaz; aksi halde dışa aktarmaya ve bağlam olarak sonraki bölümlere girer
                 section["translation_successful"] = False
-                section["translated_text"] = f"HATA: {e}"
+                section["translation_error"] = str(e)
                 self._update_translation_progress("translation_error_progress", current_section=idx + 1, total_sections=total_sections_to_translate, error=str(e))
                 if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
                     self.root.after(0, self.update_section_listbox)
@@ -855,6 +1137,16 @@ class NovelTranslatorApp:
                     progress_percent = ((idx + 1) / total_sections_to_translate) * 100
                     self.progress_var.set(progress_percent)
                     self._update_translation_progress("section_completed_progress", idx + 1, total_sections_to_translate, current=idx + 1, total=total_sections_to_translate)
+                self.root.after(0, self._save_project_state) # Stil rehberindeki değişiklikler bölüm bölüm projeye yazılır
+
+        # Toplu modda bekleyen stil rehberi güncellemelerini uygula
+        self.translator.flush_style_guide_updates(
+            progress_callback=lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+            stop_event=self.stop_event
+        )
+
+        # Geri çeviri, birincil çıktı tamamlandıktan sonra düşük öncelikli bir geçiş olarak çalışır
+        self._run_back_translation_pass(max_retries)
 
         if not self.stop_event.is_set():
             self.status_var.set(lang_texts.get("translation_complete_status", "Translation complete."))
@@ -862,6 +1154,452 @@ class NovelTranslatorApp:
             messagebox.showinfo(lang_texts.get("translation_complete_title", "Translation Complete"), lang_texts.get("translation_complete_message", "The translation process has finished."))
             self._update_translation_progress("log_translation_process_finished")
 
+    def _run_two_pass_translation_in_background(self, max_retries, target_country_code, user_defined_terms):
+        """
+        İki geçişli çeviri: 1. geçişte tüm bölümler sabit stil rehberiyle paralel çevrilir,
+        2. geçişte tüm çıktılardan birleştirilmiş stil rehberi türetilir ve yalnızca
+        rehbere uymayan bölümler uyumlaştırılır.
+        """
+        lang_texts = self.ui_texts.get(self.current_app_language, {})
+        sections_to_translate = [
+            (i, s) for i, s in enumerate(self.novel_sections) if not s.get("translation_successful")
+        ]
+        total_sections_to_translate = len(sections_to_translate)
+        max_workers = max(1, int(self.translation_settings["parallel_workers"]))
+        genre = self.genre_var.get()
+        source_language = self.original_detected_language_code
+        target_language = self.available_languages[self.target_language_var.get()]
+        characters_json_str = dumps_json(self.characters)
+        cultural_context_json_str = dumps_json(self.cultural_context)
+        main_themes_json_str = dumps_json(self.main_themes)
+        setting_atmosphere_json_str = dumps_json(self.setting_atmosphere)
+        progress_callback = lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs)
+
+        self._translate_small_sections(sections_to_translate, max_retries, target_country_code, user_defined_terms)
+        sections_to_translate = [(i, s) for i, s in sections_to_translate if not s.get("translation_successful")]
+        total_sections_to_translate = len(sections_to_translate)
+        repeated_paragraphs = self._translate_repeated_paragraphs(sections_to_translate, max_retries, target_country_code, user_defined_terms)
+
+        # 1. Geçiş: taslak çeviri (stil rehberi dondurulmuş)
+        self._update_translation_progress("log_two_pass_draft_started", sections=total_sections_to_translate, workers=max_workers)
+
+        def translate_draft(current_section_index, section):
+            if self.stop_event.is_set():
+                return
+            def intermediate_update_callback(stage, text):
+                self.root.after(0, self._update_section_stage, current_section_index, stage, text)
+            try:
+                translation_results, stages = self.translator.translate_section(
+                    section_data=section,
+                    initial_translation_override=section.get("initial_translation_text", ""),
+                    line_edit_override=section.get("line_edited_text", ""),
+                    localization_override=section.get("localized_text", ""),
+                    genre=genre,
+                    characters_json_str=characters_json_str,
+                    cultural_context_json_str=cultural_context_json_str,
+                    main_themes_json_str=main_themes_json_str,
+                    setting_atmosphere_json_str=setting_atmosphere_json_str,
+                    source_language=self._section_source_language(section),
+                    target_language=target_language,
+                    target_country=target_country_code,
+                    progress_callback=progress_callback,
+                    stop_event=self.stop_event,
+                    max_retries=max_retries,
+                    user_defined_terms=user_defined_terms,
+                    intermediate_callback=intermediate_update_callback,
+                    update_style_guide=False,
+                    pipeline_profile=self._get_pipeline_profile(section),
+                    repeated_paragraphs=repeated_paragraphs,
+                    section_index=current_section_index
+                )
+                section["initial_translation_text"] = translation_results.get("initial", "")
+                section["line_edited_text"] = translation_results.get("edited", "")
+                section["localized_text"] = translation_results.get("final", "")
+                final_translation = translation_results.get("final", "")
+                if not self.stop_event.is_set() and final_translation:
+                    section["translated_text"] = final_translation
+                    section["translation_successful"] = True
+                    section["translation_error"] = ""
+                    self._update_section_quality(section, translation_results.get("qa"))
+                else:
+                    section["translation_successful"] = False
+                section["back_translated_text"] = ""
+            except Exception as e:
+                logger.error(f"Bölüm {current_section_index + 1} taslak çevirisi başarısız: {e}", exc_info=True)
+                section["translation_successful"] = False
+                section["translation_error"] = str(e)
+                self._update_translation_progress("translation_error_progress", error=str(e))
+
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(translate_draft, i, s) for i, s in sections_to_translate]
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                if not self.stop_event.is_set():
+                    self.progress_var.set((completed / max(total_sections_to_translate, 1)) * 50)
+                    self._update_translation_progress("section_completed_progress", completed, total_sections_to_translate, current=completed, total=total_sections_to_translate)
+                if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
+                    self.root.after(0, self.update_section_listbox)
+
+        if self.stop_event.is_set():
+            self._update_translation_progress("log_translation_process_stopped")
+            return
+
+        # 2. Geçiş: stil rehberini tüm çıktılardan birleştir ve tutarsız bölümleri uyumlaştır
+        translated_sections = [s for s in self.novel_sections if s.get("translation_successful") and s.get("translated_text")]
+        self.translator.consolidate_style_guide(
+            [(s["text"], s["translated_text"]) for s in translated_sections],
+            genre, self.characters, self.cultural_context, self.main_themes, self.setting_atmosphere,
+            source_language, target_language, target_country_code,
+            progress_callback=progress_callback, max_retries=max_retries, stop_event=self.stop_event
+        )
+        if self.stop_event.is_set():
+            self._update_translation_progress("log_translation_process_stopped")
+            return
+
+        sections_to_harmonize = []
+        for section in translated_sections:
+            violations = self.translator.find_style_guide_violations(section["text"], section["translated_text"])
+            if violations:
+                sections_to_harmonize.append((section, violations))
+        self._update_translation_progress("log_two_pass_harmonize_started", sections=len(sections_to_harmonize), total=len(translated_sections))
+
+        def harmonize(section, violations):
+            harmonized_text = self.translator.harmonize_section(
+                section["text"], section["translated_text"], violations,
+                self._section_source_language(section), target_language, target_country_code,
+                section_type=section["type"], progress_callback=progress_callback,
+                max_retries=max_retries, stop_event=self.stop_event
+            )
+            if harmonized_text and harmonized_text != section["translated_text"] and not self.stop_event.is_set():
+                section["translated_text"] = harmonized_text
+                section["localized_text"] = harmonized_text
+                section["back_translated_text"] = ""
+                self._update_section_quality(section)
+
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(harmonize, section, violations) for section, violations in sections_to_harmonize]
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                if not self.stop_event.is_set():
+                    self.progress_var.set(50 + (completed / max(len(sections_to_harmonize), 1)) * 50)
+
+        if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
+            self.root.after(0, self.update_section_listbox)
+        self.root.after(0, self._save_project_state)
+
+        self._run_back_translation_pass(max_retries)
+
+        if not self.stop_event.is_set():
+            self.status_var.set(lang_texts.get("translation_complete_status", "Translation complete."))
+            self.progress_var.set(100)
+            messagebox.showinfo(lang_texts.get("translation_complete_title", "Translation Complete"), lang_texts.get("translation_complete_message", "The translation process has finished."))
+            self._update_translation_progress("log_translation_process_finished")
+
+    def _translate_small_sections(self, sections_to_translate, max_retries, target_country_code, user_defined_terms):
+        """
+        Ardışık kısa bölümleri (bölüm başlıkları, epigraflar, tek satırlık sahne parçaları) bölüm boyutuna kadar
+        tek bir istekte toplar ve çıktıyı bölümlere geri dağıtır; böylece bağlam bloğu her kısa bölüm için ayrı gönderilmez.
+        Çevrilen bölümler başarılı olarak işaretlenir; ana döngü yalnızca kalanları çevirir.
+        """
+        if not self.translation_settings["pack_small_sections"] or self.stop_event.is_set():
+            return
+        target_language = self.available_languages[self.target_language_var.get()]
+        small_limit = self.translation_settings["pack_small_section_tokens"]
+
+        def is_packable(section):
+            text = section["text"]
+            return (
+                estimate_tokens(text) <= small_limit
+                and not section.get("split_paragraph") and not section.get("pipeline_profile")
+                and not (section.get("initial_translation_text") or section.get("line_edited_text") or section.get("localized_text"))
+                and translate_trivial_section(text, target_language) is None
+                and self._section_source_language(section) == self.original_detected_language_code
+            )
+
+        # Yalnızca romanda art arda gelen kısa bölümler birlikte paketlenir
+        runs, run = [], []
+        for section_index, section in sections_to_translate:
+            if run and section_index != run[-1][0] + 1:
+                runs.append(run)
+                run = []
+            if is_packable(section):
+                run.append((section_index, section))
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+        max_tokens = section_token_target(self.translator.stage_models.get("initial_translation") or self.translator.model_name)
+        groups = [
+            [run[i] for i in pack]
+            for run in runs for pack in pack_texts([section["text"] for _, section in run], max_tokens)
+            if len(pack) > 1
+        ]
+        if not groups:
+            return
+
+        self._update_translation_progress("log_small_sections_packing", sections=sum(len(group) for group in groups), requests=len(groups))
+        for group_number, group in enumerate(groups, 1):
+            if self.stop_event.is_set():
+                break
+            try:
+                results = self.translator.translate_section_batch(
+                    [section["text"] for _, section in group],
+                    genre=self.genre_var.get(),
+                    characters_json_str=dumps_json(self.characters),
+                    cultural_context_json_str=dumps_json(self.cultural_context),
+                    main_themes_json_str=dumps_json(self.main_themes),
+                    setting_atmosphere_json_str=dumps_json(self.setting_atmosphere),
+                    source_language=self.original_detected_language_code,
+                    target_language=target_language,
+                    target_country=target_country_code,
+                    progress_callback=lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+                    stop_event=self.stop_event,
+                    max_retries=max_retries,
+                    user_defined_terms=user_defined_terms,
+                    pipeline_profile=self.translation_settings["pipeline_profile"]
+                )
+            except Exception as e:
+                # Paket çevrilemezse (kota, ağ, kalite kontrolü) bölümleri işaretlenmeden kalır ve ana döngüde tek tek çevrilir
+                logger.error(f"Kısa bölüm paketi {group_number}/{len(groups)} çevrilemedi: {e}", exc_info=True)
+                self._update_translation_progress("log_small_sections_batch_failed", current=group_number, total=len(groups), error=str(e))
+                continue
+            translated = 0
+            for (_, section), result in zip(group, results):
+                if not result or self.stop_event.is_set():
+                    continue # İşareti kaybolan bölüm ana döngüde tek başına çevrilir
+                section["initial_translation_text"] = result["initial"]
+                section["line_edited_text"] = result["edited"]
+                section["localized_text"] = result["final"]
+                section["translated_text"] = result["final"]
+                section["translation_successful"] = True
+                section["translation_error"] = ""
+                section["back_translated_text"] = ""
+                self._update_section_quality(section)
+                translated += 1
+            self._update_translation_progress("log_small_sections_batch_done", current=group_number, total=len(groups), translated=translated, sections=len(group))
+
+        if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
+            self.root.after(0, self.update_section_listbox)
+
+    def _translate_repeated_paragraphs(self, sections_to_translate, max_retries, target_country_code, user_defined_terms):
+        """
+        Çeviri öncesi geçiş: çevrilecek bölümlerde tekrarlanan paragrafları bulur ve her birini bir kez çevirir.
+        Kullanıcının aşama metni girdiği bölümler bu metinler korunacağı için hesaba katılmaz.
+        """
+        if not self.translation_settings["dedup_repeated_paragraphs"] or self.stop_event.is_set():
+            return {}
+        texts = (
+            section["text"] for _, section in sections_to_translate
+            if not (section.get("initial_translation_text") or section.get("line_edited_text") or section.get("localized_text"))
+            and self._section_source_language(section) == self.original_detected_language_code
+        )
+        paragraphs = find_repeated_paragraphs(texts, min_chars=self.translation_settings["dedup_min_chars"])
+        if not paragraphs:
+            return {}
+        self._update_translation_progress("log_repeated_paragraphs_found", paragraphs=len(paragraphs))
+        translations = self.translator.translate_repeated_paragraphs(
+            paragraphs,
+            section_token_target(self.translator.stage_models.get("initial_translation") or self.translator.model_name),
+            genre=self.genre_var.get(),
+            characters_json_str=dumps_json(self.characters),
+            cultural_context_json_str=dumps_json(self.cultural_context),
+            main_themes_json_str=dumps_json(self.main_themes),
+            setting_atmosphere_json_str=dumps_json(self.setting_atmosphere),
+            source_language=self.original_detected_language_code,
+            target_language=self.available_languages[self.target_language_var.get()],
+            target_country=target_country_code,
+            progress_callback=lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+            stop_event=self.stop_event,
+            max_retries=max_retries,
+            user_defined_terms=user_defined_terms,
+            pipeline_profile=self.translation_settings["pipeline_profile"]
+        )
+        self._update_translation_progress("log_repeated_paragraphs_translated", translated=len(translations), paragraphs=len(paragraphs))
+        return translations
+
+    def _section_source_language(self, section):
+        """Bölümün kaynak dili: bölüm bazında tespit edilen dil, yoksa romanın genel dili."""
+        return section.get("language") or self.original_detected_language_code
+
+    def _mention_terms(self):
+        """Geçiş dizinine eklenecek terimler: kullanıcı sözlüğündeki kaynak terimler."""
+        return list(parse_glossary(self.user_defined_terms))
+
+    def _style_guide_prompts_fingerprint(self):
+        prompts = self.translator.get_all_prompts()
+        return fingerprint(prompts["style_guide_generation"], prompts["term_translation"])
+
+    def _style_guide_cache_key(self, genre, target_language, target_country_code):
+        """
+        İlk stil rehberinin önbellek anahtarı: kaynak dosya, analiz sonuçları, tür, diller, hedef ülke, promptlar,
+        stil rehberi modeli ve terim ön hazırlığı ayarları. Önbellek kapalıysa veya dosya özeti yoksa None.
+        """
+        if not self.translation_settings["analysis_cache"] or not self.analyzer.source_hash:
+            return None
+        seed_settings = (self.translation_settings["term_candidates_limit"], self._mention_terms()) if self.translation_settings["seed_glossary_terms"] else None
+        return fingerprint(
+            self.analyzer.source_hash, self.characters, self.cultural_context, self.main_themes, self.setting_atmosphere,
+            genre, self.original_detected_language_code, target_language, target_country_code,
+            self._style_guide_prompts_fingerprint(), self.translator.stage_models.get("style_guide") or self.translator.model_name, seed_settings
+        )
+
+    def _store_cached_style_guide(self, cache_key):
+        try:
+            with self.translator.style_guide_lock:
+                store_artifact(self.analyzer.analysis_cache_dir, "style_guide", cache_key, self.translator.style_guide, self._style_guide_prompts_fingerprint())
+        except OSError as e:
+            logger.warning(f"Stil rehberi önbelleğe yazılamadı: {e}")
+
+    def _invalidate_prompt_caches(self):
+        """Promptlar değiştiğinde eski promptlarla üretilmiş analiz ve stil rehberi kayıtlarını önbellekten siler."""
+        removed = self.analyzer.invalidate_analysis_cache()
+        removed += invalidate_artifacts(self.analyzer.analysis_cache_dir, "style_guide", self._style_guide_prompts_fingerprint())
+        if removed:
+            self._update_translation_progress("log_analysis_cache_invalidated", count=removed)
+
+    def _seed_glossary_terms(self, genre, target_country_code):
+        """
+        Romandaki yinelenen adları, unvanları, uydurma kelimeleri ve sık ifadeleri yerel olarak tek geçişte çıkarır,
+        tek bir istekle çevirtir ve stil rehberinin tutarlı terimlerine ekler. Karakter adları ile kullanıcı
+        sözlüğünde veya rehberde zaten olan terimler aday sayılmaz.
+        """
+        exclude = {form for forms in mention_entities(self.analyzer.characters, self._mention_terms()).values() for form in forms}
+        with self.translator.style_guide_lock:
+            exclude.update(self.translator.style_guide.get("consistent_terms", {}))
+        candidates = extract_candidate_terms(
+            (section.get("text", "") for section in self.novel_sections),
+            max_terms=max(1, int(self.translation_settings["term_candidates_limit"])), exclude=exclude
+        )
+        self._update_translation_progress("log_term_candidates_extracted", count=len(candidates))
+        if not candidates:
+            return
+        translations = self.translator.translate_terms(
+            candidates, genre, self.original_detected_language_code, self.available_languages[self.target_language_var.get()],
+            target_country_code, lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+            max_retries=self.retries_var.get(), stop_event=self.stop_event
+        )
+        added = self.translator.seed_consistent_terms(translations)
+        self._update_translation_progress("log_glossary_terms_seeded", count=added)
+
+    def _rebuild_mention_index(self):
+        """Karakterler veya terimler değiştiğinde geçiş dizinini tüm bölümler için yeniden oluşturur (tek geçiş)."""
+        self._mention_scanner = None
+        self.analyzer.build_mention_index(self.novel_sections, self._mention_terms())
+        self._update_translation_progress("log_mention_index_rebuilt", sections=len(self.novel_sections))
+
+    def _update_section_mentions(self, section_index):
+        """
+        Metni değişen tek bir bölümü yeniden tarar; karakter toplamları bölümlerde kayıtlı sayılardan
+        hesaplandığı için diğer bölümlerin metinleri okunmaz.
+        """
+        if self._mention_scanner is None:
+            self._mention_scanner = MentionScanner(mention_entities(self.analyzer.characters, self._mention_terms()))
+        if section_index is not None:
+            section = self.novel_sections[section_index]
+            mentions = self._mention_scanner.scan(section.get("text", ""))
+            if section.get("mentions") != mentions:
+                section["mentions"] = mentions
+        totals = mention_totals(self.novel_sections)
+        for name, char_data in self.analyzer.characters.items():
+            char_data["mentions"] = totals.get(name, 0)
+
+    def _update_section_quality(self, section, report=None):
+        """
+        Bölümün yerel kalite raporunu saklar ve skor eşiğin altındaysa veya ciddi sorun varsa bölümü incelemeye işaretler.
+        Rapor verilmezse mevcut çeviri üzerinden yeniden hesaplanır.
+        """
+        if not report:
+            report = check_translation(
+                section.get("text", ""), section.get("translated_text", ""),
+                self._section_source_language(section) or "", self.available_languages.get(self.target_language_var.get(), ""),
+                glossary=parse_glossary(self.user_defined_terms), names=list(self.characters.keys())
+            )
+        section["qa_score"] = report["score"]
+        section["qa_issues"] = report["issues"]
+        section["flagged_for_review"] = report["severe"] or report["score"] < self.translation_settings["qa_flag_threshold"]
+        return report
+
+    def _should_back_translate(self, section_index, section):
+        """Bölümün, ayarlardaki geri çeviri moduna göre geri çevrilip çevrilmeyeceğini belirler."""
+        if not section.get("translation_successful") or not section.get("translated_text"):
+            return False
+        if translate_trivial_section(section.get("text", ""), self.available_languages.get(self.target_language_var.get(), "")) is not None:
+            return False # Yerel olarak çevrilen ayraç/başlık bölümlerinin geri çevirisi anlamsızdır
+        if same_language(self._section_source_language(section), self.available_languages.get(self.target_language_var.get(), "")):
+            return False # Zaten hedef dilde olan bölüm çevrilmedi, yalnızca düzenlendi
+        mode = self.translation_settings["back_translation_mode"]
+        if mode == "all":
+            return True
+        if mode == "every_k":
+            return section_index % max(1, int(self.translation_settings["back_translation_every_k"])) == 0
+        if mode == "flagged":
+            return bool(section.get("flagged_for_review"))
+        return False
+
+    def _run_back_translation_pass(self, max_retries):
+        """
+        Ana çeviri bittikten sonra, seçilen bölümleri geri çevirir.
+        Zaten geri çevirisi olan bölümler tekrar çevrilmez.
+        """
+        if self.stop_event.is_set():
+            return
+        if self.translation_settings["back_translation_mode"] == "disabled":
+            self._update_translation_progress("log_back_translation_pass_disabled")
+            return
+
+        targets = [
+            (i, s) for i, s in enumerate(self.novel_sections)
+            if self._should_back_translate(i, s) and not s.get("back_translated_text")
+        ]
+        if not targets:
+            return
+        self._update_translation_progress("log_back_translation_pass_started", sections=len(targets))
+        target_language = self.available_languages[self.target_language_var.get()]
+        for n, (section_index, section) in enumerate(targets, 1):
+            if self.stop_event.is_set():
+                break
+            back_translated = self.translator.back_translate(
+                section["translated_text"], target_language, self._section_source_language(section),
+                lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, n, len(targets), **kwargs),
+                max_retries=max_retries
+            )
+            self.root.after(0, self._update_section_stage, section_index, "back_translation", back_translated)
+        self._update_translation_progress("log_back_translation_pass_finished")
+        # Geri çeviriler ana iş parçacığında yazıldığı için puanlama da onlardan sonra sıraya alınır
+        self.root.after(0, self._score_back_translations)
+
+    def _score_back_translations(self):
+        """
+        Geri çevirisi olan tüm bölümleri kaynak metinle chrF ile karşılaştırır (toplu, vektörize).
+        Sonuçlar bölüme "chrf_score" ve "bt_length_ratio" olarak yazılır; bölüm listesi açıksa yenilenir.
+        """
+        indices = [i for i, s in enumerate(self.novel_sections) if s.get("back_translated_text")]
+        if not indices:
+            return
+        scores = score_back_translations(
+            [self.novel_sections[i].get("text", "") for i in indices],
+            [self.novel_sections[i]["back_translated_text"] for i in indices]
+        )
+        for i, score in zip(indices, scores):
+            self.novel_sections[i]["chrf_score"] = score["chrf"] if score else None
+            self.novel_sections[i]["bt_length_ratio"] = score["length_ratio"] if score else None
+        ranked = rank_by_divergence(scores)
+        if ranked:
+            worst = self.novel_sections[indices[ranked[0]]]
+            self._update_translation_progress("log_back_translation_scored", sections=len(ranked), index=indices[ranked[0]] + 1, chrf=worst["chrf_score"])
+        if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
+            self.update_section_listbox()
+
+    def toggle_section_divergence_sort(self):
+        """Bölüm listesini, kaynaktan en çok sapan geri çeviriler üstte olacak şekilde sıralar veya eski sırasına döndürür."""
+        self.sort_sections_by_divergence = not self.sort_sections_by_divergence
+        self.update_section_listbox()
+
     def _update_translation_progress(self, message_key_or_raw_message, current_section=0, total_sections=0, **format_args):
         lang_texts = self.ui_texts.get(self.current_app_language, self.ui_texts.get("en", {}))
         message_template = lang_texts.get(message_key_or_raw_message, str(message_key_or_raw_message))
@@ -953,18 +1691,24 @@ class NovelTranslatorApp:
                 line_edit_override=line_edit_override,
                 localization_override=localization_override,
                 genre=self.genre_var.get(),
-                characters_json_str=json5.dumps(self.characters),
-                cultural_context_json_str=json5.dumps(self.cultural_context),
-                main_themes_json_str=json5.dumps(self.main_themes),
-                setting_atmosphere_json_str=json5.dumps(self.setting_atmosphere),
-                source_language=self.original_detected_language_code,
+                characters_json_str=dumps_json(self.characters),
+                cultural_context_json_str=dumps_json(self.cultural_context),
+                main_themes_json_str=dumps_json(self.main_themes),
+                setting_atmosphere_json_str=dumps_json(self.setting_atmosphere),
+                source_language=self._section_source_language(section),
                 target_language=self.available_languages[self.target_language_var.get()],
                 target_country=self.available_countries.get(self.target_country_var.get(), "US"),
                 progress_callback=lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
                 stop_event=self.stop_event,
                 max_retries=self.retries_var.get(),
                 user_defined_terms=self.user_defined_terms,
-                intermediate_callback=intermediate_update_callback
+                intermediate_callback=intermediate_update_callback,
+                pipeline_profile=self._get_pipeline_profile(section),
+                section_index=section_index
+            )
+            self.translator.flush_style_guide_updates(
+                progress_callback=lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+                stop_event=self.stop_event
             )
 
             # Çeviri aşamalarının sonuçlarını kaydet
@@ -972,13 +1716,21 @@ class NovelTranslatorApp:
             section["line_edited_text"] = translation_results.get("edited", "")
             section["localized_text"] = translation_results.get("final", "")
             final_translation = translation_results.get("final", "")
-            back_translated = translation_results.get("back_translation", "") # Geri çeviri sonucunu al
 
             # Sadece çeviri durdurulmadıysa ve başarılıysa bölümü güncelle
             if not self.stop_event.is_set() and final_translation:
                 section["translated_text"] = final_translation
                 section["translation_successful"] = True
-                section["back_translated_text"] = back_translated
+                section["translation_error"] = ""
+                section["back_translated_text"] = ""
+                self._update_section_quality(section, translation_results.get("qa"))
+                if self._should_back_translate(section_index, section):
+                    section["back_translated_text"] = self.translator.back_translate(
+                        final_translation, self.available_languages[self.target_language_var.get()],
+                        self._section_source_language(section),
+                        lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+                        max_retries=self.retries_var.get()
+                    )
             else:
                 # Çeviri durdurulduysa veya başarısızsa, başarı durumunu false yap
                 section["translation_successful"] = False
@@ -1004,13 +1756,15 @@ class NovelTranslatorApp:
             self.root.after(0, update_ui)
 
         except Exception as e:
+            logger.error(f"Bölüm {section_index + 1} çevrilemedi: {e}", exc_info=True)
             section["translation_successful"] = False
-            section["translated_text"] = f"HATA: {e}"
+            section["translation_error"] = str(e)
             self._update_translation_progress("translation_error_progress", error=str(e))
             if hasattr(self, 'section_window_widget') and self.section_window_widget.winfo_exists():
                 self.root.after(0, self.update_section_listbox)
         finally:
             self._update_translation_progress("section_completed_progress", current=section_index + 1, total=len(self.novel_sections))
+            self.root.after(0, self._save_project_state)
 
     def _update_section_stage(self, section_index, stage, text):
         """
@@ -1066,8 +1820,7 @@ class NovelTranslatorApp:
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as file:
-                    for section in self.novel_sections:
-                        file.write(section.get("translated_text", "") + "\n\n")
+                    file.write(join_section_texts(self.novel_sections, "translated_text"))
                 self.status_var.set(lang_texts.get("translation_saved_to_status", "Translation saved to: {filename}").format(filename=os.path.basename(file_path)))
                 messagebox.showinfo(lang_texts.get("save_complete_title", "Save Complete"), lang_texts.get("save_complete_message", "File saved successfully."))
                 self._update_translation_progress("log_saving_translation_success", filename=os.path.basename(file_path))
@@ -1086,8 +1839,7 @@ class NovelTranslatorApp:
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as file:
-                    for section in self.novel_sections:
-                        file.write(section.get("back_translated_text", "") + "\n\n")
+                    file.write(join_section_texts(self.novel_sections, "back_translated_text"))
                 self.status_var.set(lang_texts.get("back_translation_saved_to_status", "Back-translation saved to: {filename}").format(filename=os.path.basename(file_path)))
                 messagebox.showinfo(lang_texts.get("save_complete_title", "Save Complete"), lang_texts.get("back_translation_saved_message", "Back-translation saved successfully."))
                 self._update_translation_progress("log_saving_back_translation_success", filename=os.path.basename(file_path))
@@ -1106,7 +1858,7 @@ class NovelTranslatorApp:
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as file:
-                    json5.dump(self.translator.style_guide, file, ensure_ascii=False, indent=2)
+                    dump_json(self.translator.style_guide, file, indent=2)
                 self.status_var.set(lang_texts.get("style_guide_saved_to_status", "Style guide saved to: {filename}").format(filename=os.path.basename(file_path)))
                 messagebox.showinfo(lang_texts.get("save_complete_title", "Save Complete"), lang_texts.get("style_guide_saved_message", "Style guide saved successfully."))
                 self._update_translation_progress("log_saving_style_guide_success", filename=os.path.basename(file_path))
@@ -1122,7 +1874,7 @@ class NovelTranslatorApp:
             self._update_translation_progress("log_import_style_guide_start", filename=os.path.basename(file_path))
             try:
                 with open(file_path, 'r', encoding='utf-8') as file:
-                    imported_style_guide = json5.load(file)
+                    imported_style_guide = load_json(file)
                 if not isinstance(imported_style_guide, dict):
                     raise ValueError(lang_texts.get("invalid_style_guide_data_error", "Invalid style guide data!"))
                 self.translator.style_guide.update(imported_style_guide)
@@ -1307,6 +2059,7 @@ class NovelTranslatorApp:
             self.char_listbox.insert(tk.END, char_name)
             
     def on_character_select(self, event):
+        lang_texts = self.ui_texts.get(self.current_app_language, {})
         selection = self.char_listbox.curselection()
         if not selection: return
         char_name = self.char_listbox.get(selection[0])
@@ -1316,7 +2069,15 @@ class NovelTranslatorApp:
         
         self.char_name_var.set(char_data.get("name", ""))
         self.char_role_var.set(char_data.get("role", "Yan Karakter"))
-        self.char_mentions_var.set(str(char_data.get("mentions", 0)))
+        section_numbers = [str(index + 1) for index in sections_mentioning(self.novel_sections, char_name)]
+        if section_numbers:
+            # Geçiş dizininden: karakterin geçtiği bölümler (bölüm metinleri yeniden taranmaz)
+            self.char_mentions_var.set(lang_texts.get("mentions_with_sections", "{count} (sections: {sections})").format(
+                count=char_data.get("mentions", 0),
+                sections=", ".join(section_numbers[:20]) + (", …" if len(section_numbers) > 20 else "")
+            ))
+        else:
+            self.char_mentions_var.set(str(char_data.get("mentions", 0)))
         self.char_notes_text.delete(1.0, tk.END)
         self.char_notes_text.insert(1.0, char_data.get("notes", ""))
         self.char_occupation_var.set(char_data.get("occupation", ""))
@@ -1373,6 +2134,7 @@ class NovelTranslatorApp:
             return
 
         char_data = self.analyzer.characters.pop(old_name, {}) 
+        forms_changed = old_name != new_name or char_data.get("nickname", "") != self.char_nickname_var.get().strip()
         
         char_data["name"] = new_name
         char_data["role"] = self.char_role_var.get()
@@ -1404,6 +2166,8 @@ class NovelTranslatorApp:
         
         self.analyzer.characters[new_name] = char_data
         self.selected_character_name = new_name
+        if forms_changed:
+            self._rebuild_mention_index()
             
         self.update_character_list()
         try:
@@ -1455,6 +2219,7 @@ class NovelTranslatorApp:
             "development": {"beginning": [], "middle": [], "end": []},
             "arc_type": "Klasik", "key_dialogues": [], "key_thoughts": []
         }
+        self._mention_scanner = None # Ad kaydedilince dizin yeniden oluşturulur
         self.update_character_list()
         new_idx = list(self.analyzer.characters.keys()).index(new_character_name)
         self.char_listbox.selection_set(new_idx)
@@ -1474,6 +2239,7 @@ class NovelTranslatorApp:
         if messagebox.askyesno(lang_texts.get("delete_confirmation_title", "Delete Confirmation"), lang_texts.get("delete_confirmation_message", "Are you sure you want to delete '{name}'?").format(name=char_name_to_delete)):
             if char_name_to_delete in self.analyzer.characters:
                 del self.analyzer.characters[char_name_to_delete]
+                self._rebuild_mention_index()
             self.update_character_list()
             self.char_name_var.set("")
             self.char_role_var.set("")
@@ -1679,7 +2445,7 @@ class NovelTranslatorApp:
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as file:
-                    json5.dump(self.analyzer.characters, file, ensure_ascii=False, indent=2)
+                    dump_json(self.analyzer.characters, file, indent=2)
                 messagebox.showinfo(lang_texts.get("success_title", "Success"), lang_texts.get("characters_exported_message", "Characters exported."))
                 self._update_translation_progress("log_export_characters_success", filename=os.path.basename(file_path))
             except Exception as e:
@@ -1693,10 +2459,11 @@ class NovelTranslatorApp:
             self._update_translation_progress("log_import_characters_start", filename=os.path.basename(file_path))
             try:
                 with open(file_path, 'r', encoding='utf-8') as file:
-                    imported_characters = json5.load(file)
+                    imported_characters = load_json(file)
                 if not isinstance(imported_characters, dict):
                     raise ValueError(lang_texts.get("invalid_character_data_error", "Invalid character data."))
                 self.analyzer.characters.update(imported_characters)
+                self._rebuild_mention_index()
                 self.update_character_list() 
                 messagebox.showinfo(lang_texts.get("success_title", "Success"), lang_texts.get("characters_imported_message", "Characters imported."))
                 self._update_translation_progress("log_import_characters_success", filename=os.path.basename(file_path))
@@ -1715,7 +2482,7 @@ class NovelTranslatorApp:
             try:
                 details = {"cultural_context": self.cultural_context, "main_themes": self.main_themes, "setting_atmosphere": self.setting_atmosphere}
                 with open(file_path, 'w', encoding='utf-8') as file:
-                    json5.dump(details, file, ensure_ascii=False, indent=2)
+                    dump_json(details, file, indent=2)
                 messagebox.showinfo(lang_texts.get("success_title", "Success"), lang_texts.get("novel_details_exported_message", "Novel details exported."))
                 self._update_translation_progress("log_export_novel_details_success", filename=os.path.basename(file_path))
             except Exception as e:
@@ -1729,7 +2496,7 @@ class NovelTranslatorApp:
             self._update_translation_progress("log_import_novel_details_start", filename=os.path.basename(file_path))
             try:
                 with open(file_path, 'r', encoding='utf-8') as file:
-                    imported_details = json5.load(file)
+                    imported_details = load_json(file)
                 if not isinstance(imported_details, dict):
                     raise ValueError(lang_texts.get("invalid_novel_detail_data_error", "Invalid novel detail data."))
                 self.cultural_context.update(imported_details.get("cultural_context", {}))
@@ -1759,11 +2526,13 @@ class NovelTranslatorApp:
         self.line_edit_tab_widget = ttk.Frame(self.prompt_notebook_widget)
         self.cultural_tab_widget = ttk.Frame(self.prompt_notebook_widget)
         self.back_translation_tab_widget = ttk.Frame(self.prompt_notebook_widget)
+        self.fast_translation_tab_widget = ttk.Frame(self.prompt_notebook_widget)
         
         self.prompt_notebook_widget.add(self.translation_tab_widget, text=lang_texts.get("translation_prompt_tab", "Initial Translation"))
         self.prompt_notebook_widget.add(self.line_edit_tab_widget, text=lang_texts.get("line_editing_prompt_tab", "Line Editing"))
         self.prompt_notebook_widget.add(self.cultural_tab_widget, text=lang_texts.get("cultural_localization_prompt_tab", "Cultural Localization"))
         self.prompt_notebook_widget.add(self.back_translation_tab_widget, text=lang_texts.get("back_translation_prompt_tab", "Back-Translation Prompt"))
+        self.prompt_notebook_widget.add(self.fast_translation_tab_widget, text=lang_texts.get("fast_translation_prompt_tab", "Fast Mode (Single Call)"))
 
         current_prompts = self.translator.get_all_prompts()
 
@@ -1782,31 +2551,39 @@ class NovelTranslatorApp:
         back_translation_prompt_text = scrolledtext.ScrolledText(self.back_translation_tab_widget, wrap=tk.WORD, width=80, height=20)
         back_translation_prompt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         back_translation_prompt_text.insert(tk.END, current_prompts.get("back_translation", ""))
+
+        fast_translation_prompt_text = scrolledtext.ScrolledText(self.fast_translation_tab_widget, wrap=tk.WORD, width=80, height=20)
+        fast_translation_prompt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        fast_translation_prompt_text.insert(tk.END, current_prompts.get("fast_translation", ""))
         
         button_frame = ttk.Frame(prompt_frame)
         button_frame.pack(fill=tk.X, pady=10)
         
         self.prompt_window_widget.export_button = ttk.Button(button_frame, text=lang_texts.get("export_button", "Export"), command=lambda: self.export_prompts(
             translation_prompt_text.get("1.0", tk.END), line_edit_prompt_text.get("1.0", tk.END), 
-            cultural_prompt_text.get("1.0", tk.END), back_translation_prompt_text.get("1.0", tk.END)
+            cultural_prompt_text.get("1.0", tk.END), back_translation_prompt_text.get("1.0", tk.END),
+            fast_translation_prompt_text.get("1.0", tk.END)
         ))
         self.prompt_window_widget.export_button.pack(side=tk.LEFT, padx=5)
         self.prompt_window_widget.import_button = ttk.Button(button_frame, text=lang_texts.get("import_button", "Import"), command=lambda: self.import_prompts(
-            translation_prompt_text, line_edit_prompt_text, cultural_prompt_text, back_translation_prompt_text
+            translation_prompt_text, line_edit_prompt_text, cultural_prompt_text, back_translation_prompt_text,
+            fast_translation_prompt_text
         ))
         self.prompt_window_widget.import_button.pack(side=tk.LEFT, padx=5)
         self.prompt_window_widget.reset_button = ttk.Button(button_frame, text=lang_texts.get("reset_to_default_button", "Reset Defaults"), command=lambda: self.reset_prompts(
-            translation_prompt_text, line_edit_prompt_text, cultural_prompt_text, back_translation_prompt_text
+            translation_prompt_text, line_edit_prompt_text, cultural_prompt_text, back_translation_prompt_text,
+            fast_translation_prompt_text
         ))
         self.prompt_window_widget.reset_button.pack(side=tk.LEFT, padx=5)
         
         self.prompt_window_widget.save_button = ttk.Button(button_frame, text=lang_texts.get("save_button", "Save"), command=lambda: self.save_prompts(
             translation_prompt_text.get("1.0", tk.END), line_edit_prompt_text.get("1.0", tk.END), 
-            cultural_prompt_text.get("1.0", tk.END), back_translation_prompt_text.get("1.0", tk.END)
+            cultural_prompt_text.get("1.0", tk.END), back_translation_prompt_text.get("1.0", tk.END),
+            fast_translation_prompt_text.get("1.0", tk.END)
         ))
         self.prompt_window_widget.save_button.pack(side=tk.LEFT, padx=5)
         
-    def export_prompts(self, initial_translation, line_edit, cultural_localization, back_translation):
+    def export_prompts(self, initial_translation, line_edit, cultural_localization, back_translation, fast_translation):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")], title=lang_texts.get("export_prompts_dialog_title", "Export Prompts"))
         if file_path:
@@ -1815,20 +2592,21 @@ class NovelTranslatorApp:
             prompts_to_export["all_translator_prompts"]["line_edit"] = line_edit.strip()
             prompts_to_export["all_translator_prompts"]["cultural_localization"] = cultural_localization.strip()
             prompts_to_export["all_translator_prompts"]["back_translation"] = back_translation.strip()
+            prompts_to_export["all_translator_prompts"]["fast_translation"] = fast_translation.strip()
             
             self._update_translation_progress("log_export_translation_prompts_start")
             with open(file_path, 'w', encoding='utf-8') as f:
-                json5.dump(prompts_to_export, f, ensure_ascii=False, indent=4)
+                dump_json(prompts_to_export, f, indent=4)
             messagebox.showinfo(lang_texts.get("export_title", "Export"), lang_texts.get("prompts_exported_message", "Prompts exported successfully."))
             self._update_translation_progress("log_export_translation_prompts_success", filename=os.path.basename(file_path))
         
-    def import_prompts(self, initial_text_widget, line_edit_text_widget, cultural_text_widget, back_translation_text_widget):
+    def import_prompts(self, initial_text_widget, line_edit_text_widget, cultural_text_widget, back_translation_text_widget, fast_translation_text_widget):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")], title=lang_texts.get("import_prompts_dialog_title", "Import Prompts"))
         if file_path:
             self._update_translation_progress("log_import_translation_prompts_start", filename=os.path.basename(file_path))
             with open(file_path, 'r', encoding='utf-8') as f:
-                imported_data = json5.load(f)
+                imported_data = load_json(f)
             
             prompts_to_load = imported_data.get("all_translator_prompts", {})
             defaults = self.translator.get_all_prompts(default=True) 
@@ -1841,6 +2619,8 @@ class NovelTranslatorApp:
             cultural_text_widget.insert(tk.END, prompts_to_load.get("cultural_localization", defaults["cultural_localization"]))
             back_translation_text_widget.delete("1.0", tk.END)
             back_translation_text_widget.insert(tk.END, prompts_to_load.get("back_translation", defaults["back_translation"]))
+            fast_translation_text_widget.delete("1.0", tk.END)
+            fast_translation_text_widget.insert(tk.END, prompts_to_load.get("fast_translation", defaults["fast_translation"]))
             
             full_prompts_to_set = defaults.copy()
             full_prompts_to_set.update(prompts_to_load) 
@@ -1849,7 +2629,7 @@ class NovelTranslatorApp:
             messagebox.showinfo(lang_texts.get("import_title", "Import"), lang_texts.get("prompts_imported_message", "Prompts imported successfully."))
             self._update_translation_progress("log_import_translation_prompts_success", filename=os.path.basename(file_path))
         
-    def reset_prompts(self, initial_text_widget, line_edit_text_widget, cultural_text_widget, back_translation_text_widget):
+    def reset_prompts(self, initial_text_widget, line_edit_text_widget, cultural_text_widget, back_translation_text_widget, fast_translation_text_widget):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         default_prompts = self.translator.get_all_prompts(default=True)
 
@@ -1861,16 +2641,19 @@ class NovelTranslatorApp:
         cultural_text_widget.insert(tk.END, default_prompts["cultural_localization"])
         back_translation_text_widget.delete("1.0", tk.END)
         back_translation_text_widget.insert(tk.END, default_prompts["back_translation"])
+        fast_translation_text_widget.delete("1.0", tk.END)
+        fast_translation_text_widget.insert(tk.END, default_prompts["fast_translation"])
         
         self.translator.initial_prompt = default_prompts["initial_translation"]
         self.translator.line_edit_prompt = default_prompts["line_edit"]
         self.translator.cultural_prompt = default_prompts["cultural_localization"]
         self.translator.back_translation_prompt = default_prompts["back_translation"]
+        self.translator.fast_translation_prompt = default_prompts["fast_translation"]
         
         messagebox.showinfo(lang_texts.get("reset_title", "Reset"), lang_texts.get("prompts_reset_message", "Prompts reset to default."))
         self._update_translation_progress("log_reset_translation_prompts")
         
-    def save_prompts(self, initial_translation, line_edit, cultural_localization, back_translation):
+    def save_prompts(self, initial_translation, line_edit, cultural_localization, back_translation, fast_translation):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         
         current_all_prompts = self.translator.get_all_prompts()
@@ -1879,6 +2662,7 @@ class NovelTranslatorApp:
             "line_edit": line_edit.strip(),
             "cultural_localization": cultural_localization.strip(),
             "back_translation": back_translation.strip(),
+            "fast_translation": fast_translation.strip(),
             "style_guide_generation": current_all_prompts.get("style_guide_generation"),
             "style_guide_update": current_all_prompts.get("style_guide_update")
         }
@@ -1904,7 +2688,7 @@ class NovelTranslatorApp:
         self.sections_list_frame_widget.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 5), anchor='n')
 
         scrollbar = ttk.Scrollbar(self.sections_list_frame_widget, orient="vertical")
-        self.section_tree = ttk.Treeview(self.sections_list_frame_widget, columns=("type", "translated"), show="headings", yscrollcommand=scrollbar.set)
+        self.section_tree = ttk.Treeview(self.sections_list_frame_widget, columns=("type", "translated", "qa", "chrf"), show="headings", yscrollcommand=scrollbar.set)
         scrollbar.config(command=self.section_tree.yview)
 
         self.section_tree.heading("#0", text="#")
@@ -1913,6 +2697,10 @@ class NovelTranslatorApp:
         self.section_tree.column("#0", width=40, anchor='center')
         self.section_tree.column("type", width=150)
         self.section_tree.column("translated", width=80, anchor='center')
+        self.section_tree.heading("qa", text=lang_texts.get("qa_status_header", "QA"))
+        self.section_tree.column("qa", width=60, anchor='center')
+        self.section_tree.heading("chrf", text=lang_texts.get("chrf_status_header", "chrF"), command=self.toggle_section_divergence_sort)
+        self.section_tree.column("chrf", width=60, anchor='center')
         
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.section_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -1953,6 +2741,21 @@ class NovelTranslatorApp:
         button_frame = ttk.Frame(self.section_edit_frame_widget)
         button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
 
+        self.section_qa_label = ttk.Label(self.section_edit_frame_widget, text="", foreground="#b00020", justify=tk.LEFT, wraplength=700)
+        self.section_qa_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+
+        profile_frame = ttk.Frame(self.section_edit_frame_widget)
+        profile_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.section_pipeline_profiles = {
+            lang_texts.get("pipeline_profile_default", "Default (from settings)"): "",
+            lang_texts.get("pipeline_profile_full", "Full (3 calls per section)"): "full",
+            lang_texts.get("pipeline_profile_fast", "Fast (1 call per section)"): "fast",
+        }
+        self.section_window_widget.pipeline_profile_label = ttk.Label(profile_frame, text=lang_texts.get("pipeline_profile_label", "Pipeline Profile:"))
+        self.section_window_widget.pipeline_profile_label.pack(side=tk.LEFT, padx=5)
+        self.section_pipeline_var = tk.StringVar()
+        ttk.Combobox(profile_frame, textvariable=self.section_pipeline_var, values=list(self.section_pipeline_profiles.keys()), state="readonly", width=30).pack(side=tk.LEFT, padx=5)
+
         self.section_window_widget.add_button = ttk.Button(button_frame, text=lang_texts.get("add_section_button", "Add"), command=self.add_section)
         self.section_window_widget.add_button.pack(side=tk.LEFT, padx=5)
         self.section_window_widget.delete_button = ttk.Button(button_frame, text=lang_texts.get("delete_section_button", "Delete"), command=self.delete_section)
@@ -1963,6 +2766,8 @@ class NovelTranslatorApp:
         self.section_window_widget.mark_translated_button.pack(side=tk.LEFT, padx=5)
         self.section_window_widget.translate_button = ttk.Button(button_frame, text=lang_texts.get("translate_button", "Translate"), command=self.translate_single_section)
         self.section_window_widget.translate_button.pack(side=tk.LEFT, padx=5)
+        self.section_window_widget.back_translate_button = ttk.Button(button_frame, text=lang_texts.get("back_translate_button", "Back-Translate"), command=self.back_translate_single_section)
+        self.section_window_widget.back_translate_button.pack(side=tk.LEFT, padx=5)
         self.section_window_widget.export_button = ttk.Button(button_frame, text=lang_texts.get("export_button", "Export"), command=self.export_sections)
         self.section_window_widget.export_button.pack(side=tk.LEFT, padx=5)
         self.section_window_widget.import_button = ttk.Button(button_frame, text=lang_texts.get("import_button", "Import"), command=self.import_sections)
@@ -1975,7 +2780,12 @@ class NovelTranslatorApp:
         self._update_translation_progress("log_section_list_updated")
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         self.section_tree.delete(*self.section_tree.get_children())
-        for i, section in enumerate(self.novel_sections):
+        order = list(range(len(self.novel_sections)))
+        if self.sort_sections_by_divergence:
+            # Puanı olanlar en düşük chrF'ten başlayarak üstte, puanı olmayanlar eski sıralarıyla altta
+            order.sort(key=lambda i: (self.novel_sections[i].get("chrf_score") is None, self.novel_sections[i].get("chrf_score") or 0))
+        for i in order:
+            section = self.novel_sections[i]
             section_type = section.get("type", lang_texts.get("unknown_section_type", "Unknown"))
             
             translation_status = section.get("translation_successful")
@@ -1986,7 +2796,15 @@ class NovelTranslatorApp:
             else:
                 is_translated_text = ""   # Henüz çevrilmemiş
             
-            self.section_tree.insert("", "end", iid=i, text=str(i + 1), values=(section_type, is_translated_text))
+            qa_text = ""
+            if section.get("qa_score") is not None:
+                qa_text = f"{section['qa_score']:.2f}" + (" ⚠" if section.get("flagged_for_review") else "")
+
+            chrf_text = ""
+            if section.get("chrf_score") is not None:
+                chrf_text = f"{section['chrf_score']:.0f}"
+
+            self.section_tree.insert("", "end", iid=i, text=str(i + 1), values=(section_type, is_translated_text, qa_text, chrf_text))
 
     def on_section_select(self, event):
         if not self.section_tree.selection():
@@ -2007,6 +2825,13 @@ class NovelTranslatorApp:
         self.line_edit_section_text.insert("1.0", section.get("line_edited_text", ""))
         self.localization_section_text.delete("1.0", tk.END)
         self.localization_section_text.insert("1.0", section.get("localized_text", ""))
+        self.section_pipeline_var.set(next((name for name, profile in self.section_pipeline_profiles.items() if profile == section.get("pipeline_profile", "")), ""))
+        qa_text = format_issues({"issues": section.get("qa_issues", [])})
+        if section.get("translation_error"):
+            lang_texts = self.ui_texts.get(self.current_app_language, {})
+            error_text = lang_texts.get("section_translation_error_label", "Last translation attempt failed: {error}").format(error=section["translation_error"])
+            qa_text = f"{error_text}\n{qa_text}" if qa_text else error_text
+        self.section_qa_label.config(text=qa_text)
 
     def add_section(self):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
@@ -2036,6 +2861,7 @@ class NovelTranslatorApp:
         selected_item = self.section_tree.selection()[0]
         index = int(selected_item)
         del self.novel_sections[index]
+        self._update_section_mentions(None)
         self.update_section_listbox()
         self.section_text.delete("1.0", tk.END)
         self.translated_section_text.delete("1.0", tk.END)
@@ -2058,6 +2884,12 @@ class NovelTranslatorApp:
         self.novel_sections[index]["initial_translation_text"] = self.initial_translation_section_text.get("1.0", tk.END).strip()
         self.novel_sections[index]["line_edited_text"] = self.line_edit_section_text.get("1.0", tk.END).strip()
         self.novel_sections[index]["localized_text"] = self.localization_section_text.get("1.0", tk.END).strip()
+        self.novel_sections[index]["pipeline_profile"] = self.section_pipeline_profiles.get(self.section_pipeline_var.get(), "")
+        self._update_section_mentions(index)
+        if self.novel_sections[index]["translated_text"]:
+            # Elle düzenlenen çevirinin kalite raporunu yenile
+            self._update_section_quality(self.novel_sections[index])
+            self.section_qa_label.config(text=format_issues({"issues": self.novel_sections[index]["qa_issues"]}))
         messagebox.showinfo(lang_texts.get("info_message_box_title", "Info"), lang_texts.get("changes_saved_message", "Changes saved!"))
         self._update_translation_progress("log_section_changes_saved", index=index + 1)
 
@@ -2083,7 +2915,31 @@ class NovelTranslatorApp:
         # Otomatik kaydetmeyi kaldırarak kullanıcının manuel olarak kaydetmesini sağlıyoruz.
         # self.save_sections() 
         
-        threading.Thread(target=self._run_single_translation_in_background, args=(index,), daemon=True).start()
+        self._start_store_worker(self._run_single_translation_in_background, index)
+
+    def back_translate_single_section(self):
+        """Seçili bölümü, geri çeviri modundan bağımsız olarak isteğe bağlı geri çevirir."""
+        lang_texts = self.ui_texts.get(self.current_app_language, {})
+        if not self.section_tree.selection():
+            messagebox.showwarning(lang_texts.get("warning_message_box_title", "Warning"), lang_texts.get("select_section_to_translate_warning", "Please select a section to translate!"))
+            return
+        index = int(self.section_tree.selection()[0])
+        section = self.novel_sections[index]
+        if not section.get("translated_text"):
+            messagebox.showwarning(lang_texts.get("warning_message_box_title", "Warning"), lang_texts.get("section_not_translated_warning", "This section has not been translated yet."))
+            return
+
+        def run():
+            back_translated = self.translator.back_translate(
+                section["translated_text"], self.available_languages[self.target_language_var.get()],
+                self._section_source_language(section),
+                lambda msg_key_or_raw, **kwargs: self._update_translation_progress(msg_key_or_raw, **kwargs),
+                max_retries=self.retries_var.get()
+            )
+            self.root.after(0, self._update_section_stage, index, "back_translation", back_translated)
+            self.root.after(0, self._score_back_translations)
+
+        self._start_store_worker(run)
 
     def export_sections(self):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
@@ -2092,7 +2948,7 @@ class NovelTranslatorApp:
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    json5.dump(self.novel_sections, f, ensure_ascii=False, indent=4)
+                    dump_json_list((section.to_dict() for section in self.novel_sections), f)
                 messagebox.showinfo(lang_texts.get("info_message_box_title", "Info"), lang_texts.get("sections_exported_message", "Sections exported successfully!"))
                 self._update_translation_progress("log_export_sections_success", filename=os.path.basename(file_path))
             except Exception as e:
@@ -2123,7 +2979,8 @@ class NovelTranslatorApp:
             self._update_translation_progress("log_import_sections_start", filename=os.path.basename(file_path))
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    self.novel_sections = json5.load(f)
+                    self.novel_sections.replace_all(load_json(f))
+                self._rebuild_mention_index()
                 self.update_section_listbox() 
                 messagebox.showinfo(lang_texts.get("info_message_box_title", "Info"), lang_texts.get("sections_imported_message", "Sections imported successfully!"))
                 self._update_translation_progress("log_import_sections_success", filename=os.path.basename(file_path))
@@ -2192,7 +3049,7 @@ class NovelTranslatorApp:
             }
             self._update_translation_progress("log_export_analysis_prompts_start")
             with open(file_path, 'w', encoding='utf-8') as f:
-                json5.dump({"all_analyzer_prompts": prompts}, f, ensure_ascii=False, indent=4)
+                dump_json({"all_analyzer_prompts": prompts}, f, indent=4)
             messagebox.showinfo(lang_texts.get("export_title", "Export"), lang_texts.get("analysis_prompts_exported_message", "Analysis prompts exported."))
             self._update_translation_progress("log_export_analysis_prompts_success", filename=os.path.basename(file_path))
         
@@ -2202,7 +3059,7 @@ class NovelTranslatorApp:
         if file_path:
             self._update_translation_progress("log_import_analysis_prompts_start", filename=os.path.basename(file_path))
             with open(file_path, 'r', encoding='utf-8') as f:
-                imported_data = json5.load(f)
+                imported_data = load_json(f)
             prompts = imported_data.get("all_analyzer_prompts", {})
             defaults = self.analyzer.get_all_prompts(default=True)
 
@@ -2258,9 +3115,13 @@ class NovelTranslatorApp:
         
         self.style_guide_generation_tab_widget = ttk.Frame(self.style_guide_notebook_widget)
         self.style_guide_update_tab_widget = ttk.Frame(self.style_guide_notebook_widget)
+        self.style_guide_harmonization_tab_widget = ttk.Frame(self.style_guide_notebook_widget)
+        self.style_guide_term_translation_tab_widget = ttk.Frame(self.style_guide_notebook_widget)
         
         self.style_guide_notebook_widget.add(self.style_guide_generation_tab_widget, text=lang_texts.get("style_guide_generation_tab", "Generation"))
         self.style_guide_notebook_widget.add(self.style_guide_update_tab_widget, text=lang_texts.get("style_guide_update_tab", "Update"))
+        self.style_guide_notebook_widget.add(self.style_guide_harmonization_tab_widget, text=lang_texts.get("style_guide_harmonization_tab", "Harmonization"))
+        self.style_guide_notebook_widget.add(self.style_guide_term_translation_tab_widget, text=lang_texts.get("style_guide_term_translation_tab", "Term Translation"))
         
         current_prompts = self.translator.get_all_prompts() 
         
@@ -2271,39 +3132,49 @@ class NovelTranslatorApp:
         update_prompt_text = scrolledtext.ScrolledText(self.style_guide_update_tab_widget, wrap=tk.WORD, width=80, height=20)
         update_prompt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         update_prompt_text.insert(tk.END, current_prompts.get("style_guide_update", ""))
+
+        harmonization_prompt_text = scrolledtext.ScrolledText(self.style_guide_harmonization_tab_widget, wrap=tk.WORD, width=80, height=20)
+        harmonization_prompt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        harmonization_prompt_text.insert(tk.END, current_prompts.get("harmonization", ""))
+
+        term_translation_prompt_text = scrolledtext.ScrolledText(self.style_guide_term_translation_tab_widget, wrap=tk.WORD, width=80, height=20)
+        term_translation_prompt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        term_translation_prompt_text.insert(tk.END, current_prompts.get("term_translation", ""))
         
         button_frame = ttk.Frame(prompt_frame)
         button_frame.pack(fill=tk.X, pady=10)
         
-        self.style_guide_prompt_window_widget.export_button = ttk.Button(button_frame, text=lang_texts.get("export_button", "Export"), command=lambda: self.export_style_guide_prompts(generation_prompt_text.get("1.0", tk.END), update_prompt_text.get("1.0", tk.END)))
+        self.style_guide_prompt_window_widget.export_button = ttk.Button(button_frame, text=lang_texts.get("export_button", "Export"), command=lambda: self.export_style_guide_prompts(generation_prompt_text.get("1.0", tk.END), update_prompt_text.get("1.0", tk.END), harmonization_prompt_text.get("1.0", tk.END), term_translation_prompt_text.get("1.0", tk.END)))
         self.style_guide_prompt_window_widget.export_button.pack(side=tk.LEFT, padx=5)
-        self.style_guide_prompt_window_widget.import_button = ttk.Button(button_frame, text=lang_texts.get("import_button", "Import"), command=lambda: self.import_style_guide_prompts(generation_prompt_text, update_prompt_text))
+        self.style_guide_prompt_window_widget.import_button = ttk.Button(button_frame, text=lang_texts.get("import_button", "Import"), command=lambda: self.import_style_guide_prompts(generation_prompt_text, update_prompt_text, harmonization_prompt_text, term_translation_prompt_text))
         self.style_guide_prompt_window_widget.import_button.pack(side=tk.LEFT, padx=5)
-        self.style_guide_prompt_window_widget.reset_button = ttk.Button(button_frame, text=lang_texts.get("reset_to_default_button", "Reset Defaults"), command=lambda: self.reset_style_guide_prompts(generation_prompt_text, update_prompt_text))
+        self.style_guide_prompt_window_widget.reset_button = ttk.Button(button_frame, text=lang_texts.get("reset_to_default_button", "Reset Defaults"), command=lambda: self.reset_style_guide_prompts(generation_prompt_text, update_prompt_text, harmonization_prompt_text, term_translation_prompt_text))
         self.style_guide_prompt_window_widget.reset_button.pack(side=tk.LEFT, padx=5)
-        self.style_guide_prompt_window_widget.save_button = ttk.Button(button_frame, text=lang_texts.get("save_button", "Save"), command=lambda: self.save_style_guide_prompts(generation_prompt_text.get("1.0", tk.END), update_prompt_text.get("1.0", tk.END)))
+        self.style_guide_prompt_window_widget.save_button = ttk.Button(button_frame, text=lang_texts.get("save_button", "Save"), command=lambda: self.save_style_guide_prompts(generation_prompt_text.get("1.0", tk.END), update_prompt_text.get("1.0", tk.END), harmonization_prompt_text.get("1.0", tk.END), term_translation_prompt_text.get("1.0", tk.END)))
         self.style_guide_prompt_window_widget.save_button.pack(side=tk.LEFT, padx=5)
         
-    def export_style_guide_prompts(self, generation_prompt, update_prompt):
+    def export_style_guide_prompts(self, generation_prompt, update_prompt, harmonization_prompt, term_translation_prompt):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")], title=lang_texts.get("export_style_guide_prompts_dialog_title", "Export Style Guide Prompts"))
         if file_path:
             prompts_to_export = {"all_translator_prompts": self.translator.get_all_prompts()}
             prompts_to_export["all_translator_prompts"]["style_guide_generation"] = generation_prompt.strip()
             prompts_to_export["all_translator_prompts"]["style_guide_update"] = update_prompt.strip()
+            prompts_to_export["all_translator_prompts"]["harmonization"] = harmonization_prompt.strip()
+            prompts_to_export["all_translator_prompts"]["term_translation"] = term_translation_prompt.strip()
             self._update_translation_progress("log_export_style_guide_prompts_start")
             with open(file_path, 'w', encoding='utf-8') as f:
-                json5.dump(prompts_to_export, f, ensure_ascii=False, indent=4)
+                dump_json(prompts_to_export, f, indent=4)
             messagebox.showinfo(lang_texts.get("export_title", "Export"), lang_texts.get("style_guide_prompts_exported_message", "Style guide prompts exported."))
             self._update_translation_progress("log_export_style_guide_prompts_success", filename=os.path.basename(file_path))
         
-    def import_style_guide_prompts(self, generation_prompt_text, update_prompt_text):
+    def import_style_guide_prompts(self, generation_prompt_text, update_prompt_text, harmonization_prompt_text, term_translation_prompt_text):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")], title=lang_texts.get("import_style_guide_prompts_dialog_title", "Import Style Guide Prompts"))
         if file_path:
             self._update_translation_progress("log_import_style_guide_prompts_start", filename=os.path.basename(file_path))
             with open(file_path, 'r', encoding='utf-8') as f:
-                imported_data = json5.load(f)
+                imported_data = load_json(f)
             prompts_to_load = imported_data.get("all_translator_prompts", {})
             defaults = self.translator.get_all_prompts(default=True)
 
@@ -2311,34 +3182,48 @@ class NovelTranslatorApp:
             generation_prompt_text.insert(tk.END, prompts_to_load.get("style_guide_generation", defaults["style_guide_generation"]))
             update_prompt_text.delete("1.0", tk.END)
             update_prompt_text.insert(tk.END, prompts_to_load.get("style_guide_update", defaults["style_guide_update"]))
+            harmonization_prompt_text.delete("1.0", tk.END)
+            harmonization_prompt_text.insert(tk.END, prompts_to_load.get("harmonization", defaults["harmonization"]))
+            term_translation_prompt_text.delete("1.0", tk.END)
+            term_translation_prompt_text.insert(tk.END, prompts_to_load.get("term_translation", defaults["term_translation"]))
             
             current_prompts = self.translator.get_all_prompts()
             current_prompts["style_guide_generation"] = prompts_to_load.get("style_guide_generation", defaults["style_guide_generation"])
             current_prompts["style_guide_update"] = prompts_to_load.get("style_guide_update", defaults["style_guide_update"])
+            current_prompts["harmonization"] = prompts_to_load.get("harmonization", defaults["harmonization"])
+            current_prompts["term_translation"] = prompts_to_load.get("term_translation", defaults["term_translation"])
             self.translator.set_all_prompts(current_prompts)
             messagebox.showinfo(lang_texts.get("import_title", "Import"), lang_texts.get("style_guide_prompts_imported_message", "Style guide prompts imported."))
             self._update_translation_progress("log_import_style_guide_prompts_success", filename=os.path.basename(file_path))
         
-    def reset_style_guide_prompts(self, generation_prompt_text, update_prompt_text):
+    def reset_style_guide_prompts(self, generation_prompt_text, update_prompt_text, harmonization_prompt_text, term_translation_prompt_text):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         default_prompts = self.translator.get_all_prompts(default=True)
         generation_prompt_text.delete("1.0", tk.END)
         generation_prompt_text.insert(tk.END, default_prompts["style_guide_generation"])
         update_prompt_text.delete("1.0", tk.END)
         update_prompt_text.insert(tk.END, default_prompts["style_guide_update"])
+        harmonization_prompt_text.delete("1.0", tk.END)
+        harmonization_prompt_text.insert(tk.END, default_prompts["harmonization"])
+        term_translation_prompt_text.delete("1.0", tk.END)
+        term_translation_prompt_text.insert(tk.END, default_prompts["term_translation"])
         
         current_prompts = self.translator.get_all_prompts()
         current_prompts["style_guide_generation"] = default_prompts["style_guide_generation"]
         current_prompts["style_guide_update"] = default_prompts["style_guide_update"]
+        current_prompts["harmonization"] = default_prompts["harmonization"]
+        current_prompts["term_translation"] = default_prompts["term_translation"]
         self.translator.set_all_prompts(current_prompts)
         messagebox.showinfo(lang_texts.get("reset_title", "Reset"), lang_texts.get("style_guide_prompts_reset_message", "Style guide prompts reset."))
         self._update_translation_progress("log_reset_style_guide_prompts")
         
-    def save_style_guide_prompts(self, generation_prompt, update_prompt):
+    def save_style_guide_prompts(self, generation_prompt, update_prompt, harmonization_prompt, term_translation_prompt):
         lang_texts = self.ui_texts.get(self.current_app_language, {})
         current_prompts = self.translator.get_all_prompts()
         current_prompts["style_guide_generation"] = generation_prompt.strip()
         current_prompts["style_guide_update"] = update_prompt.strip()
+        current_prompts["harmonization"] = harmonization_prompt.strip()
+        current_prompts["term_translation"] = term_translation_prompt.strip()
         self.translator.set_all_prompts(current_prompts)
         self.save_prompts_to_file() 
         messagebox.showinfo(lang_texts.get("save_title", "Save"), lang_texts.get("style_guide_prompts_saved_message", "Style guide prompts saved."))
@@ -2360,7 +3245,7 @@ class NovelTranslatorApp:
         text_area = scrolledtext.ScrolledText(frame, wrap=tk.WORD, width=80, height=30, state='normal')
         text_area.pack(fill=tk.BOTH, expand=True)
         try:
-            pretty_json = json5.dumps(style_guide, ensure_ascii=False, indent=2)
+            pretty_json = dumps_json(style_guide, indent=2)
         except Exception:
             pretty_json = str(style_guide) 
         text_area.insert(tk.END, pretty_json)
@@ -2435,12 +3320,37 @@ class NovelTranslatorApp:
         button_frame.pack(fill=tk.X, pady=5)
 
         def save_terms():
-            self.user_defined_terms = terms_text.get("1.0", tk.END).strip()
+            new_terms = terms_text.get("1.0", tk.END).strip()
+            terms_changed = new_terms != self.user_defined_terms
+            self.user_defined_terms = new_terms
+            if terms_changed:
+                self._rebuild_mention_index()
             self._update_translation_progress("log_user_terms_saved")
             messagebox.showinfo(lang_texts.get("user_terms_saved_title", "Terms Saved"), 
                                 lang_texts.get("user_terms_saved_message", "User-defined terms have been saved successfully."))
             self.terms_window.destroy()
 
+        def add_style_guide_terms():
+            # Stil rehberindeki tutarlı terimlerden sözlükte olmayanları "Orijinal:Çeviri" satırları olarak ekler
+            existing = {term.casefold() for term in parse_glossary(terms_text.get("1.0", tk.END))}
+            with self.translator.style_guide_lock:
+                consistent_terms = dict(self.translator.style_guide.get("consistent_terms", {}))
+            new_lines = []
+            for term, translation in consistent_terms.items():
+                if not isinstance(translation, str):
+                    continue
+                translation = re.sub(r"\s*\(.*\)\s*$", "", translation).strip()
+                if term and translation and ":" not in term and term.casefold() not in existing:
+                    new_lines.append(f"{term}:{translation}")
+            if not new_lines:
+                messagebox.showinfo(lang_texts.get("info_message_box_title", "Info"), lang_texts.get("no_new_style_guide_terms_message", "All terms from the style guide are already in the list."))
+                return
+            if terms_text.get("1.0", tk.END).strip():
+                terms_text.insert(tk.END, "\n")
+            terms_text.insert(tk.END, "\n".join(new_lines))
+            terms_text.see(tk.END)
+            self._update_translation_progress("log_style_guide_terms_added", count=len(new_lines))
+
         def export_terms():
             file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")], title=lang_texts.get("export_user_terms_title", "Export Terms"))
             if file_path:
@@ -2476,8 +3386,178 @@ class NovelTranslatorApp:
         import_button = ttk.Button(button_frame, text=lang_texts.get("import_button", "Import"), command=import_terms)
         import_button.pack(side=tk.LEFT, padx=5)
 
+        add_style_guide_terms_button = ttk.Button(button_frame, text=lang_texts.get("add_style_guide_terms_button", "Add Style Guide Terms"), command=add_style_guide_terms)
+        add_style_guide_terms_button.pack(side=tk.LEFT, padx=5)
+
+    def _get_pipeline_profile(self, section):
+        """Bölüme özel çeviri profili varsa onu, yoksa genel ayarı döndürür."""
+        return section.get("pipeline_profile") or self.translation_settings["pipeline_profile"]
+
+    def _apply_translation_settings(self):
+        """Çeviri ayarlarını çevirmen nesnesine uygular."""
+        settings = self.translation_settings
+        self.translator.style_guide_update_mode = settings["style_guide_update_mode"]
+        self.translator.style_guide_batch_sections = max(1, int(settings["style_guide_batch_sections"]))
+        self.translator.style_guide_batch_words = max(1, int(settings["style_guide_batch_words"]))
+        settings["parallel_workers"] = max(1, int(settings["parallel_workers"]))
+        self.translator.set_stage_models(settings["stage_models"])
+        self.translator.qa_enabled = bool(settings["qa_enabled"])
+        self.translator.same_language_mode = settings["same_language_sections"]
+        self.analyzer.analysis_cache_enabled = bool(settings["analysis_cache"])
+        self.analyzer.set_analysis_model(settings["stage_models"].get("analysis", ""))
+
+    def show_translation_settings_editor(self):
+        lang_texts = self.ui_texts.get(self.current_app_language, {})
+        self._update_translation_progress("log_translation_settings_opened")
+
+        self.translation_settings_window = tk.Toplevel(self.root)
+        self.translation_settings_window.title(lang_texts.get("translation_settings_title", "Translation Settings"))
+        self.translation_settings_window.geometry("650x600")
+
+        main_frame = ttk.Frame(self.translation_settings_window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.grid_columnconfigure(1, weight=1)
+
+        style_guide_modes = {
+            lang_texts.get("style_guide_update_mode_per_section", "After every section"): "per_section",
+            lang_texts.get("style_guide_update_mode_batched", "Batched (background)"): "batched",
+        }
+        ttk.Label(main_frame, text=lang_texts.get("style_guide_update_mode_label", "Style Guide Updates:")).grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
+        style_guide_mode_var = tk.StringVar(value=next((name for name, mode in style_guide_modes.items() if mode == self.translation_settings["style_guide_update_mode"]), ""))
+        ttk.Combobox(main_frame, textvariable=style_guide_mode_var, values=list(style_guide_modes.keys()), state="readonly").grid(row=0, column=1, sticky=(tk.W, tk.E), padx=5, pady=2)
+
+        ttk.Label(main_frame, text=lang_texts.get("style_guide_batch_sections_label", "Batch every N sections:")).grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
+        batch_sections_var = tk.IntVar(value=self.translation_settings["style_guide_batch_sections"])
+        ttk.Spinbox(main_frame, from_=1, to=100, textvariable=batch_sections_var, width=7).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+
+        ttk.Label(main_frame, text=lang_texts.get("style_guide_batch_words_label", "...or every M words:")).grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
+        batch_words_var = tk.IntVar(value=self.translation_settings["style_guide_batch_words"])
+        ttk.Spinbox(main_frame, from_=100, to=100000, increment=500, textvariable=batch_words_var, width=7).grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
+
+        translation_modes = {
+            lang_texts.get("translation_mode_sequential", "Sequential (evolving style guide)"): "sequential",
+            lang_texts.get("translation_mode_two_pass", "Two-pass (parallel draft, then harmonize)"): "two_pass",
+        }
+        ttk.Label(main_frame, text=lang_texts.get("translation_mode_label", "Translation Mode:")).grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
+        translation_mode_var = tk.StringVar(value=next((name for name, mode in translation_modes.items() if mode == self.translation_settings["translation_mode"]), ""))
+        ttk.Combobox(main_frame, textvariable=translation_mode_var, values=list(translation_modes.keys()), state="readonly").grid(row=3, column=1, sticky=(tk.W, tk.E), padx=5, pady=2)
+
+        ttk.Label(main_frame, text=lang_texts.get("parallel_workers_label", "Parallel Requests:")).grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
+        parallel_workers_var = tk.IntVar(value=self.translation_settings["parallel_workers"])
+        ttk.Spinbox(main_frame, from_=1, to=32, textvariable=parallel_workers_var, width=7).grid(row=4, column=1, sticky=tk.W, padx=5, pady=2)
+
+        pipeline_profiles = {
+            lang_texts.get("pipeline_profile_full", "Full (3 calls per section)"): "full",
+            lang_texts.get("pipeline_profile_fast", "Fast (1 call per section)"): "fast",
+        }
+        ttk.Label(main_frame, text=lang_texts.get("pipeline_profile_label", "Pipeline Profile:")).grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
+        pipeline_profile_var = tk.StringVar(value=next((name for name, profile in pipeline_profiles.items() if profile == self.translation_settings["pipeline_profile"]), ""))
+        ttk.Combobox(main_frame, textvariable=pipeline_profile_var, values=list(pipeline_profiles.keys()), state="readonly").grid(row=5, column=1, sticky=(tk.W, tk.E), padx=5, pady=2)
+
+        back_translation_modes = {
+            lang_texts.get("back_translation_mode_disabled", "Disabled"): "disabled",
+            lang_texts.get("back_translation_mode_all", "All sections"): "all",
+            lang_texts.get("back_translation_mode_every_k", "Every k-th section"): "every_k",
+            lang_texts.get("back_translation_mode_flagged", "Only flagged sections"): "flagged",
+        }
+        ttk.Label(main_frame, text=lang_texts.get("back_translation_mode_label", "Back-Translation:")).grid(row=7, column=0, sticky=tk.W, padx=5, pady=2)
+        back_translation_mode_var = tk.StringVar(value=next((name for name, mode in back_translation_modes.items() if mode == self.translation_settings["back_translation_mode"]), ""))
+        ttk.Combobox(main_frame, textvariable=back_translation_mode_var, values=list(back_translation_modes.keys()), state="readonly").grid(row=7, column=1, sticky=(tk.W, tk.E), padx=5, pady=2)
+
+        ttk.Label(main_frame, text=lang_texts.get("back_translation_every_k_label", "k (for every k-th section):")).grid(row=8, column=0, sticky=tk.W, padx=5, pady=2)
+        back_translation_every_k_var = tk.IntVar(value=self.translation_settings["back_translation_every_k"])
+        ttk.Spinbox(main_frame, from_=1, to=100, textvariable=back_translation_every_k_var, width=7).grid(row=8, column=1, sticky=tk.W, padx=5, pady=2)
+
+        qa_enabled_var = tk.BooleanVar(value=self.translation_settings["qa_enabled"])
+        ttk.Checkbutton(main_frame, text=lang_texts.get("qa_enabled_label", "Retry stages that fail local quality checks"), variable=qa_enabled_var).grid(row=9, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+
+        ttk.Label(main_frame, text=lang_texts.get("qa_flag_threshold_label", "Flag sections with QA score below:")).grid(row=10, column=0, sticky=tk.W, padx=5, pady=2)
+        qa_flag_threshold_var = tk.DoubleVar(value=self.translation_settings["qa_flag_threshold"])
+        ttk.Spinbox(main_frame, from_=0.0, to=1.0, increment=0.05, textvariable=qa_flag_threshold_var, width=7).grid(row=10, column=1, sticky=tk.W, padx=5, pady=2)
+
+        dedup_var = tk.BooleanVar(value=self.translation_settings["dedup_repeated_paragraphs"])
+        ttk.Checkbutton(main_frame, text=lang_texts.get("dedup_repeated_paragraphs_label", "Translate paragraphs repeated across the novel only once"), variable=dedup_var).grid(row=11, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+
+        pack_small_sections_var = tk.BooleanVar(value=self.translation_settings["pack_small_sections"])
+        ttk.Checkbutton(main_frame, text=lang_texts.get("pack_small_sections_label", "Translate consecutive short sections together in one request"), variable=pack_small_sections_var).grid(row=12, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+
+        same_language_modes = {
+            lang_texts.get("same_language_sections_edit", "Line edit only"): "edit",
+            lang_texts.get("same_language_sections_pass_through", "Keep unchanged"): "pass_through",
+            lang_texts.get("same_language_sections_translate", "Translate normally"): "translate",
+        }
+        ttk.Label(main_frame, text=lang_texts.get("same_language_sections_label", "Sections already in target language:")).grid(row=13, column=0, sticky=tk.W, padx=5, pady=2)
+        same_language_var = tk.StringVar(value=next((name for name, mode in same_language_modes.items() if mode == self.translation_settings["same_language_sections"]), ""))
+        ttk.Combobox(main_frame, textvariable=same_language_var, values=list(same_language_modes.keys()), state="readonly").grid(row=13, column=1, sticky=(tk.W, tk.E), padx=5, pady=2)
+
+        seed_glossary_var = tk.BooleanVar(value=self.translation_settings["seed_glossary_terms"])
+        ttk.Checkbutton(main_frame, text=lang_texts.get("seed_glossary_terms_label", "Translate recurring terms up front after analysis"), variable=seed_glossary_var).grid(row=14, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+
+        analysis_cache_var = tk.BooleanVar(value=self.translation_settings["analysis_cache"])
+        ttk.Checkbutton(main_frame, text=lang_texts.get("analysis_cache_label", "Reuse cached analysis and style guide for known books"), variable=analysis_cache_var).grid(row=15, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+
+        stage_models_frame = ttk.LabelFrame(main_frame, text=lang_texts.get("stage_models_label", "Models per Stage (blank = {model})").format(model=self.translator.model_name or ""), padding="5")
+        stage_models_frame.grid(row=50, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=(10, 2))
+        stage_models_frame.grid_columnconfigure(1, weight=1)
+        stage_labels = {
+            "initial_translation": lang_texts.get("stage_model_initial_translation", "Initial Translation:"),
+            "line_edit": lang_texts.get("stage_model_line_edit", "Line Editing:"),
+            "cultural_localization": lang_texts.get("stage_model_cultural_localization", "Cultural Localization:"),
+            "back_translation": lang_texts.get("stage_model_back_translation", "Back-Translation:"),
+            "style_guide": lang_texts.get("stage_model_style_guide", "Style Guide:"),
+            "analysis": lang_texts.get("stage_model_analysis", "Novel Analysis:"),
+        }
+        stage_model_vars = {}
+        for row, (stage, label) in enumerate(stage_labels.items()):
+            ttk.Label(stage_models_frame, text=label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
+            stage_model_vars[stage] = tk.StringVar(value=self.translation_settings["stage_models"].get(stage, ""))
+            ttk.Entry(stage_models_frame, textvariable=stage_model_vars[stage]).grid(row=row, column=1, sticky=(tk.W, tk.E), padx=5, pady=2)
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=99, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
+
+        def save_settings():
+            try:
+                self.translation_settings["style_guide_update_mode"] = style_guide_modes.get(style_guide_mode_var.get(), "per_section")
+                self.translation_settings["style_guide_batch_sections"] = int(batch_sections_var.get())
+                self.translation_settings["style_guide_batch_words"] = int(batch_words_var.get())
+                self.translation_settings["translation_mode"] = translation_modes.get(translation_mode_var.get(), "sequential")
+                self.translation_settings["parallel_workers"] = int(parallel_workers_var.get())
+                self.translation_settings["pipeline_profile"] = pipeline_profiles.get(pipeline_profile_var.get(), "full")
+                self.translation_settings["stage_models"] = {stage: var.get().strip() for stage, var in stage_model_vars.items()}
+                self.translation_settings["back_translation_mode"] = back_translation_modes.get(back_translation_mode_var.get(), "all")
+                self.translation_settings["back_translation_every_k"] = int(back_translation_every_k_var.get())
+                self.translation_settings["qa_enabled"] = qa_enabled_var.get()
+                self.translation_settings["qa_flag_threshold"] = float(qa_flag_threshold_var.get())
+                self.translation_settings["dedup_repeated_paragraphs"] = dedup_var.get()
+                self.translation_settings["pack_small_sections"] = pack_small_sections_var.get()
+                self.translation_settings["same_language_sections"] = same_language_modes.get(same_language_var.get(), "edit")
+                self.translation_settings["seed_glossary_terms"] = seed_glossary_var.get()
+                self.translation_settings["analysis_cache"] = analysis_cache_var.get()
+            except (tk.TclError, ValueError) as e:
+                messagebox.showerror(lang_texts.get("error_message_box_title", "Error"), lang_texts.get("invalid_translation_settings_error", "Invalid setting value: {error}").format(error=str(e)))
+                return
+            try:
+                self._apply_translation_settings()
+            except Exception as e:
+                messagebox.showerror(lang_texts.get("error_message_box_title", "Error"), lang_texts.get("invalid_translation_settings_error", "Invalid setting value: {error}").format(error=str(e)))
+                return
+            self._update_translation_progress("log_translation_settings_saved")
+            messagebox.showinfo(lang_texts.get("info_message_box_title", "Info"), lang_texts.get("translation_settings_saved_message", "Translation settings saved."))
+            self.translation_settings_window.destroy()
+
+        self.translation_settings_window.save_button = ttk.Button(button_frame, text=lang_texts.get("save_button", "Save"), command=save_settings)
+        self.translation_settings_window.save_button.pack(side=tk.LEFT, padx=5)
+
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = NovelTranslatorApp(root)
+
+    def on_close():
+        app._save_project_state()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
+    app.novel_sections.close()
@@ -0,0 +1,345 @@
+import re
+import unicodedata
+from typing import Dict, List, Tuple, Any
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Yerel (ağ erişimi gerektirmeyen) çeviri kalite kontrolleri.
+# Her aşamadan sonra çalıştırılır; sonuçlar yeniden deneme, geri çeviri kararı ve
+# bölüm düzenleyicide incelenecek bölümleri belirlemek için kullanılır.
+
+# Modelin çıktıya sızdırmaması gereken prompt işaretleri
+LEAKAGE_MARKERS = (
+    "CONTEXT FOR MODEL USE ONLY",
+    "---BEGIN",
+    "---END",
+    "DO NOT INCLUDE ANY PART OF THE CONTEXT",
+)
+
+# İngilizceye göre yaklaşık karakter yoğunluğu (aynı içerik için karakter sayısı oranı)
+CHARACTER_DENSITY = {
+    "ja": 0.45,
+    "zh": 0.35,
+    "ko": 0.55,
+}
+
+# Cümle sonunu gösteren karakterler (tırnak ve parantez kapanışları dahil)
+TERMINAL_CHARACTERS = set('.!?…"\'»”’)]」』。！？*-—')
+
+# Kontrol adı -> (önem derecesi, skordan düşülecek ağırlık)
+CHECK_WEIGHTS = {
+    "prompt_leakage": ("severe", 0.6),
+    "truncated": ("severe", 0.5),
+    "truncated_ending": ("minor", 0.15),
+    "length_ratio": ("minor", 0.25),
+    "untranslated_spans": ("minor", 0.25),
+    "numbers": ("minor", 0.15),
+    "names": ("minor", 0.1),
+    "glossary": ("minor", 0.15),
+}
+
+# Son cümlesi yarım kalan çeviri bu orandan da kısaysa yanıtın kesildiği varsayılır
+TRUNCATION_RATIO = 0.6
+
+UNTRANSLATED_NGRAM = 6  # Bu uzunlukta birebir kopyalanan kelime dizileri çevrilmemiş sayılır
+
+# chrF benzeri skor: karakter n-gramları (1..6) ve recall ağırlıklı F-beta (beta=2)
+CHRF_MAX_N = 6
+CHRF_BETA = 2.0
+_HASH_BASE = np.uint64(1000003)
+# n-gram anahtarı: üst 16 bit bölüm numarası, alt 48 bit n-gram hash'i (en fazla 65536 bölüm)
+_OWNER_SHIFT = np.uint64(48)
+_HASH_MASK = np.uint64((1 << 48) - 1)
+
+
+class QualityCheckError(Exception):
+    """Bir aşamanın çıktısı ciddi yerel kalite sorunları içerdiğinde yükseltilir (yeniden denemeyi tetikler)."""
+
+    def __init__(self, stage_name: str, report: Dict[str, Any]):
+        self.stage_name = stage_name
+        self.report = report
+        details = "; ".join(issue["detail"] for issue in report["issues"] if issue["severity"] == "severe")
+        super().__init__(f"{stage_name}: {details}")
+
+
+def parse_glossary(user_defined_terms: str) -> Dict[str, str]:
+    """Kullanıcı tanımlı terimleri ("Orijinal:Çeviri" satırları) sözlüğe dönüştürür."""
+    glossary = {}
+    for line in (user_defined_terms or "").splitlines():
+        if ":" not in line:
+            continue
+        original, translation = line.split(":", 1)
+        original, translation = original.strip(), translation.strip()
+        if original and translation:
+            glossary[original] = translation
+    return glossary
+
+
+def dominant_script(text: str) -> str:
+    """Metindeki harflerin en sık kullanılan yazı sistemini döndürür (LATIN, CYRILLIC, CJK, ...)."""
+    counts = {}
+    for ch in text[:5000]:
+        if ch.isalpha():
+            script = _char_script(ch)
+            counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return ""
+    return max(counts, key=counts.get)
+
+
+def _char_script(ch: str) -> str:
+    try:
+        name = unicodedata.name(ch)
+    except ValueError:
+        return ""
+    script = name.split(" ")[0]
+    # Japonca kana ve Çince ideogramlar aynı sayılmaz ama ikisi de Latin dışıdır
+    return "CJK" if script in ("CJK", "HIRAGANA", "KATAKANA") else script
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", text.casefold())
+
+
+def _contains_term(text_folded: str, term: str) -> bool:
+    return re.search(r"(?<!\w)" + re.escape(term.casefold()) + r"(?!\w)", text_folded) is not None
+
+
+def length_ratio(source_text: str, translated_text: str, source_language: str, target_language: str) -> float | None:
+    """Dillerin karakter yoğunluğuna göre normalize edilmiş hedef/kaynak uzunluk oranı (1.0 = beklenen)."""
+    source_len = len(source_text.strip())
+    if source_len < 200:
+        return None  # Kısa metinlerde oran anlamlı değil
+    expected = CHARACTER_DENSITY.get(target_language, 1.0) / CHARACTER_DENSITY.get(source_language, 1.0)
+    return (len(translated_text.strip()) / source_len) / expected
+
+
+def check_length_ratio(source_text: str, translated_text: str, source_language: str, target_language: str, low: float = 0.5, high: float = 2.0) -> List[str]:
+    ratio = length_ratio(source_text, translated_text, source_language, target_language)
+    if ratio is not None and (ratio < low or ratio > high):
+        return [f"length ratio {ratio:.2f} outside [{low}, {high}]"]
+    return []
+
+
+def check_untranslated_spans(source_text: str, translated_text: str) -> List[str]:
+    source_script = dominant_script(source_text)
+    target_script = dominant_script(translated_text)
+    if source_script and target_script and source_script != target_script:
+        # Farklı yazı sistemleri: hedef metinde kaynak yazı sisteminde kalmış kelime dizilerini ara
+        spans = re.findall(r"(?:[^\W\d_]+[\s,;:]+){3,}[^\W\d_]+", translated_text)
+        spans = [span for span in spans if dominant_script(span) == source_script]
+        return [f"untranslated span: '{span[:60]}'" for span in spans[:3]]
+
+    # Aynı yazı sistemi: kaynak metinden birebir kopyalanmış uzun kelime dizilerini ara
+    source_words = _words(source_text)
+    target_words = _words(translated_text)
+    n = UNTRANSLATED_NGRAM
+    if len(source_words) < n or len(target_words) < n:
+        return []
+    source_ngrams = {tuple(source_words[i:i + n]) for i in range(len(source_words) - n + 1)}
+    copied = [i for i in range(len(target_words) - n + 1) if tuple(target_words[i:i + n]) in source_ngrams]
+    if not copied:
+        return []
+    copied_words = set()
+    for i in copied:
+        copied_words.update(range(i, i + n))
+    share = len(copied_words) / len(target_words)
+    if share < 0.1:
+        return []
+    return [f"{share:.0%} of the translation is copied verbatim from the source"]
+
+
+def check_numbers(source_text: str, translated_text: str) -> List[str]:
+    def numbers(text):
+        return [re.sub(r"\D", "", match) for match in re.findall(r"\d+(?:[.,:/]\d+)*", text)]
+    target_numbers = numbers(translated_text)
+    missing = []
+    for number in numbers(source_text):
+        if number in target_numbers:
+            target_numbers.remove(number)
+        else:
+            missing.append(number)
+    return [f"numbers missing in translation: {', '.join(sorted(set(missing))[:5])}"] if missing else []
+
+
+def check_names(source_text: str, translated_text: str, names: List[str]) -> List[str]:
+    if dominant_script(source_text) != dominant_script(translated_text):
+        return []  # Farklı yazı sistemlerinde isimler transliterasyonla değişir
+    source_folded = source_text.casefold()
+    target_folded = translated_text.casefold()
+    missing = []
+    for name in names:
+        if not name or not _contains_term(source_folded, name):
+            continue
+        parts = [part for part in re.split(r"\s+", name) if len(part) >= 3] or [name]
+        if not any(_contains_term(target_folded, part) for part in parts):
+            missing.append(name)
+    return [f"names missing in translation: {', '.join(missing[:5])}"] if missing else []
+
+
+def check_glossary(source_text: str, translated_text: str, glossary: Dict[str, str]) -> List[str]:
+    source_folded = source_text.casefold()
+    target_folded = translated_text.casefold()
+    violations = [
+        f"'{original}' -> '{translation}'" for original, translation in glossary.items()
+        if _contains_term(source_folded, original) and translation.casefold() not in target_folded
+    ]
+    return [f"glossary terms not applied: {', '.join(violations[:5])}"] if violations else []
+
+
+def check_prompt_leakage(translated_text: str) -> List[str]:
+    upper = translated_text.upper()
+    return [f"prompt marker in output: '{marker}'" for marker in LEAKAGE_MARKERS if marker in upper]
+
+
+def check_truncated_ending(source_text: str, translated_text: str) -> List[str]:
+    source_end = source_text.rstrip()[-1:]
+    target_end = translated_text.rstrip()[-1:]
+    if source_end in TERMINAL_CHARACTERS and target_end and target_end not in TERMINAL_CHARACTERS:
+        return [f"translation ends mid-sentence: '...{translated_text.rstrip()[-40:]}'"]
+    return []
+
+
+def check_translation(source_text: str, translated_text: str, source_language: str, target_language: str, glossary: Dict[str, str] = None, names: List[str] = None) -> Dict[str, Any]:
+    """
+    Tüm yerel kontrolleri çalıştırır ve bir rapor döndürür:
+    {"score": 0-1 arası kalite skoru, "issues": [{"check", "severity", "detail"}], "severe": bool}
+    """
+    if not translated_text or not translated_text.strip():
+        return {"score": 0.0, "issues": [{"check": "empty", "severity": "severe", "detail": "empty translation"}], "severe": True}
+
+    # Zaten hedef dilde olan (yalnızca düzenlenen) bölümlerde kaynakla aynı kalan metin sorun değildir
+    same_language = bool(source_language) and source_language.split("-")[0].lower() == (target_language or "").split("-")[0].lower()
+    results = {
+        "prompt_leakage": check_prompt_leakage(translated_text),
+        "truncated_ending": check_truncated_ending(source_text, translated_text),
+        "length_ratio": check_length_ratio(source_text, translated_text, source_language, target_language),
+        "untranslated_spans": [] if same_language else check_untranslated_spans(source_text, translated_text),
+        "numbers": check_numbers(source_text, translated_text),
+        "names": check_names(source_text, translated_text, names or []),
+        "glossary": check_glossary(source_text, translated_text, glossary or {}),
+    }
+    # Yarım biten son cümle tek başına uyarıdır (model son cümleyi farklı noktalamış olabilir); çeviri ayrıca
+    # beklenenden çok kısaysa veya uzunluğu beklenenin çok altındaysa yanıtın yarıda kesildiği varsayılır
+    ratio = length_ratio(source_text, translated_text, source_language, target_language)
+    results["truncated"] = []
+    if ratio is not None and ratio < TRUNCATION_RATIO and results["truncated_ending"]:
+        results["truncated"] += results.pop("truncated_ending")
+    if ratio is not None and ratio < 0.3 and results["length_ratio"]:
+        results["truncated"] += results.pop("length_ratio")
+
+    issues = []
+    score = 1.0
+    for check, details in results.items():
+        if not details:
+            continue
+        severity, weight = CHECK_WEIGHTS[check]
+        score -= weight
+        issues.extend({"check": check, "severity": severity, "detail": detail} for detail in details)
+
+    report = {
+        "score": round(max(score, 0.0), 2),
+        "issues": issues,
+        "severe": any(issue["severity"] == "severe" for issue in issues),
+    }
+    logger.debug(f"QA report: score={report['score']}, issues={len(issues)}")
+    return report
+
+
+def format_issues(report: Dict[str, Any]) -> str:
+    """Rapordaki sorunları bölüm düzenleyicide gösterilecek düz metne dönüştürür."""
+    return "\n".join(f"[{issue['severity']}] {issue['check']}: {issue['detail']}" for issue in report.get("issues", []))
+
+
+def _char_codes(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Metinleri boşluksuz ve küçük harfli hale getirip tek bir kod noktası dizisinde birleştirir."""
+    cleaned = ["".join((text or "").casefold().split()) for text in texts]
+    lengths = np.fromiter((len(text) for text in cleaned), dtype=np.int64, count=len(cleaned))
+    codes = np.frombuffer("".join(cleaned).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    return codes, lengths
+
+
+def _iter_ngram_keys(codes: np.ndarray, lengths: np.ndarray, max_n: int):
+    """
+    n = 1..max_n için birleştirilmiş dizideki tüm karakter n-gramlarının anahtarlarını üretir.
+    Anahtarın üst bitleri bölüm numarasıdır; böylece sıralama n-gramları bölüm bölüm gruplar.
+    Hash'ler bir önceki n'den kaydırılarak hesaplanır; bölüm sınırını aşan n-gramlar atılır.
+    """
+    total = codes.shape[0]
+    section_ids = np.repeat(np.arange(lengths.shape[0], dtype=np.uint64), lengths)
+    positions_left = np.cumsum(lengths)[section_ids.astype(np.int64)] - np.arange(total)  # Bölüm sonuna kalan karakter
+    owners = section_ids << _OWNER_SHIFT
+    hashes = np.zeros(total, dtype=np.uint64)
+    for n in range(1, max_n + 1):
+        count = total - n + 1
+        if count <= 0:
+            yield n, np.zeros(0, dtype=np.uint64)
+            continue
+        hashes = hashes[:count] * _HASH_BASE + codes[n - 1:n - 1 + count]  # uint64 taşması kasıtlı (mod 2^64)
+        valid = positions_left[:count] >= n
+        yield n, owners[:count][valid] | (hashes[valid] & _HASH_MASK)
+
+
+def _count_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Anahtarları sıralayıp benzersiz anahtarları ve tekrar sayılarını döndürür."""
+    if keys.shape[0] == 0:
+        return keys, np.zeros(0, dtype=np.int64)
+    keys = np.sort(keys)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(starts, keys.shape[0]))
+    return keys[starts], counts
+
+
+def score_back_translations(sources: List[str], back_translations: List[str], max_n: int = CHRF_MAX_N, beta: float = CHRF_BETA) -> List[Dict[str, float] | None]:
+    """
+    Kaynak metinler ile geri çevirileri tüm bölümler için tek seferde karşılaştırır.
+    Her bölüm için {"chrf": 0-100, "length_ratio": geri çeviri/kaynak} döndürür; geri çevirisi olmayanlar için None.
+    n-gram sayımları NumPy ile vektörize edilir: her n için tüm bölümlerin n-gramları tek bir sıralamayla sayılır.
+    """
+    count = len(sources)
+    if count == 0:
+        return []
+    ref_codes, ref_lengths = _char_codes(sources)
+    hyp_codes, hyp_lengths = _char_codes(back_translations)
+
+    precision_sum = np.zeros(count)
+    recall_sum = np.zeros(count)
+    orders = np.zeros(count)
+    ngram_pairs = zip(_iter_ngram_keys(ref_codes, ref_lengths, max_n), _iter_ngram_keys(hyp_codes, hyp_lengths, max_n))
+    for (_, ref_ngrams), (_, hyp_ngrams) in ngram_pairs:
+        ref_keys, ref_counts = _count_keys(ref_ngrams)
+        hyp_keys, hyp_counts = _count_keys(hyp_ngrams)
+        ref_total = np.bincount((ref_keys >> _OWNER_SHIFT).astype(np.int64), weights=ref_counts, minlength=count)
+        hyp_total = np.bincount((hyp_keys >> _OWNER_SHIFT).astype(np.int64), weights=hyp_counts, minlength=count)
+
+        # Geri çevirideki her n-gramı kaynakta ara; eşleşme = iki taraftaki sayıların minimumu
+        positions = np.minimum(np.searchsorted(ref_keys, hyp_keys), max(ref_keys.shape[0] - 1, 0))
+        found = ref_keys[positions] == hyp_keys if ref_keys.shape[0] else np.zeros(hyp_keys.shape[0], dtype=bool)
+        matched = np.minimum(ref_counts[positions[found]], hyp_counts[found])
+        matches = np.bincount((hyp_keys[found] >> _OWNER_SHIFT).astype(np.int64), weights=matched, minlength=count)
+
+        # Yalnızca iki tarafta da bu uzunlukta n-gram olan bölümler ortalamaya katılır
+        has_order = (ref_total > 0) & (hyp_total > 0)
+        precision_sum += np.where(has_order, matches / np.maximum(hyp_total, 1), 0.0)
+        recall_sum += np.where(has_order, matches / np.maximum(ref_total, 1), 0.0)
+        orders += has_order
+
+    precision = precision_sum / np.maximum(orders, 1)
+    recall = recall_sum / np.maximum(orders, 1)
+    beta2 = beta ** 2
+    denominator = beta2 * precision + recall
+    chrf = np.where(denominator > 0, (1 + beta2) * precision * recall / np.where(denominator > 0, denominator, 1), 0.0) * 100
+    length_ratios = hyp_lengths / np.maximum(ref_lengths, 1)
+
+    return [
+        {"chrf": round(float(chrf[i]), 1), "length_ratio": round(float(length_ratios[i]), 2)}
+        if hyp_lengths[i] and ref_lengths[i] else None
+        for i in range(count)
+    ]
+
+
+def rank_by_divergence(scores: List[Dict[str, float] | None]) -> List[int]:
+    """Skoru olan bölümlerin indekslerini kaynaktan en çok sapandan (en düşük chrF) başlayarak sıralar."""
+    return sorted((i for i, score in enumerate(scores) if score), key=lambda i: scores[i]["chrf"])
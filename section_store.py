@@ -0,0 +1,293 @@
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List
+
+# Bölümleri RAM'de sözlük listesi yerine SQLite üzerinde tutan depo.
+# Bölüm metinleri ve aşama çıktıları diskte durur, yalnızca istendiğinde okunur ve küçük bir LRU önbellekte tutulur;
+# bellekte her bölüm için yalnızca küçük meta veriler (tür, durum, kalite skoru vb.) kalır.
+# Kayıtlar sözlük gibi kullanılabildiği için (section["text"], section.get(...)) editörler ve dışa aktarma aynı kalır.
+# Aynı dosya proje kabıdır: analiz, sözlük, promptlar ve ayarlar "project_state" tablosunda, stil rehberinin her sürümü
+# "style_guide_versions" tablosunda tutulur. Her değişiklik kendi işleminde (transaction) yazılır; yalnızca değişen kayıt diske gider.
+
+# Diskte tutulan (tembel yüklenen) büyük metin alanları
+TEXT_FIELDS = (
+    "text",
+    "translated_text",
+    "initial_translation_text",
+    "line_edited_text",
+    "localized_text",
+    "back_translated_text",
+)
+TEXT_CACHE_SIZE = 64  # Bellekte tutulan en fazla metin alanı
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    meta TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS section_texts (
+    section_id INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (section_id, field)
+);
+CREATE TABLE IF NOT EXISTS project_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS style_guide_versions (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SectionRecord:
+    """Tek bir bölüm. Meta veriler bellekte, TEXT_FIELDS alanları depodan tembel olarak okunur."""
+    __slots__ = ("_store", "id", "meta")
+
+    def __init__(self, store: "SectionStore", section_id: int, meta: Dict[str, Any]):
+        self._store = store
+        self.id = section_id
+        self.meta = meta
+
+    def __getitem__(self, key: str) -> Any:
+        if key in TEXT_FIELDS:
+            value = self._store._read_text(self.id, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.meta[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in TEXT_FIELDS:
+            self._store._write_text(self.id, key, value)
+        else:
+            self.meta[key] = value
+            self._store._write_meta(self)
+
+    def __contains__(self, key: str) -> bool:
+        if key in TEXT_FIELDS:
+            return self._store._read_text(self.id, key) is not None
+        return key in self.meta
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Bölümü (tüm metinleriyle) düz bir sözlüğe dönüştürür; dışa aktarma için."""
+        section = dict(self.meta)
+        section.update(self._store._read_all_texts(self.id))
+        return section
+
+
+class SectionStore:
+    """
+    Bölüm listesi gibi davranan (len, indeks, döngü, append, insert, del) SQLite destekli depo ve proje dosyası.
+    Yol verilmezse geçici bir dosya kullanılır ve close() ile silinir; save_as() ile kalıcı bir proje dosyasına dönüşür.
+    Açılışta yalnızca bölüm meta verileri ve küçük proje durumu okunur, bölüm metinleri gerektikçe yüklenir.
+    Çeviri iş parçacıkları aynı anda yazabildiğinden tüm veritabanı erişimi bir kilitle yapılır.
+    """
+
+    def __init__(self, path: str = None):
+        self._temporary = path is None
+        if self._temporary:
+            handle, path = tempfile.mkstemp(prefix="novel_sections_", suffix=".db")
+            os.close(handle)
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = self._connect(path)
+        self._text_cache = OrderedDict()
+        self._records = [
+            SectionRecord(self, section_id, json.loads(meta))
+            for section_id, meta in self._connection.execute("SELECT id, meta FROM sections ORDER BY position")
+        ]
+        # Proje durumu küçüktür; değişmeyen değerlerin yeniden yazılmaması için serileştirilmiş hâlleri tutulur
+        self._state = dict(self._connection.execute("SELECT key, value FROM project_state"))
+        row = self._connection.execute("SELECT value FROM style_guide_versions ORDER BY id DESC LIMIT 1").fetchone()
+        self._latest_style_guide = row[0] if row else None
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    # Liste arayüzü
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: int) -> SectionRecord:
+        return self._records[index]
+
+    def __iter__(self) -> Iterator[SectionRecord]:
+        return iter(list(self._records))
+
+    def __delitem__(self, index: int):
+        with self._lock:
+            record = self._records.pop(index)
+            with self._connection:
+                self._connection.execute("DELETE FROM sections WHERE id = ?", (record.id,))
+                self._connection.execute("DELETE FROM section_texts WHERE section_id = ?", (record.id,))
+                self._renumber_from(index)
+            for field in TEXT_FIELDS:
+                self._text_cache.pop((record.id, field), None)
+
+    def append(self, section: Dict[str, Any]) -> SectionRecord:
+        return self.insert(len(self._records), section)
+
+    def insert(self, index: int, section: Dict[str, Any]) -> SectionRecord:
+        with self._lock:
+            index = max(0, min(index, len(self._records)))
+            with self._connection:
+                record = self._insert_row(section, index)
+                self._records.insert(index, record)
+                self._renumber_from(index + 1)
+            return record
+
+    def replace_all(self, sections: List[Dict[str, Any]]):
+        """Tüm bölümleri tek bir işlemde verilen listeyle değiştirir (analiz ve içe aktarma için)."""
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM sections")
+                self._connection.execute("DELETE FROM section_texts")
+                self._records = [self._insert_row(section, position) for position, section in enumerate(sections)]
+            self._text_cache.clear()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Tüm bölümleri düz sözlük listesi olarak döndürür (JSON dışa aktarma için)."""
+        return [record.to_dict() for record in self]
+
+    # Proje durumu
+    def get_state(self, key: str, default: Any = None) -> Any:
+        value = self._state.get(key)
+        return json.loads(value) if value is not None else default
+
+    def set_state(self, key: str, value: Any) -> bool:
+        """Proje durumundaki bir değeri yazar. Değer değişmediyse diske dokunulmaz; yazıldıysa True döner."""
+        serialized = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            if self._state.get(key) == serialized:
+                return False
+            with self._connection:
+                self._connection.execute("INSERT OR REPLACE INTO project_state (key, value) VALUES (?, ?)", (key, serialized))
+            self._state[key] = serialized
+            return True
+
+    def add_style_guide_version(self, style_guide: Dict[str, Any]) -> bool:
+        """Stil rehberi son kaydedilen sürümden farklıysa yeni bir sürüm olarak ekler."""
+        serialized = json.dumps(style_guide, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            if serialized == self._latest_style_guide:
+                return False
+            with self._connection:
+                self._connection.execute("INSERT INTO style_guide_versions (created, value) VALUES (?, ?)", (time.time(), serialized))
+            self._latest_style_guide = serialized
+            return True
+
+    def latest_style_guide(self) -> Dict[str, Any] | None:
+        return json.loads(self._latest_style_guide) if self._latest_style_guide is not None else None
+
+    def style_guide_version_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM style_guide_versions").fetchone()[0]
+
+    def save_as(self, path: str):
+        """
+        Deponun tamamını verilen proje dosyasına kopyalar ve bundan sonraki değişiklikleri oraya yazar.
+        Kopya önce yanındaki geçici bir dosyaya alınır ve os.replace ile yerine konur; yarım proje dosyası oluşmaz.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if path == os.path.abspath(self.path):
+                return
+            temp_path = path + ".tmp"
+            target = sqlite3.connect(temp_path)
+            try:
+                self._connection.backup(target)
+            finally:
+                target.close()
+            for suffix in ("-wal", "-shm"):
+                try:
+                    os.remove(path + suffix)  # Aynı adlı eski bir projeden kalan günlük dosyaları
+                except OSError:
+                    pass
+            os.replace(temp_path, path)
+            self.close()
+            self._temporary = False
+            self.path = path
+            self._connection = self._connect(path)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+            if self._temporary:
+                for suffix in ("", "-wal", "-shm"):
+                    try:
+                        os.remove(self.path + suffix)
+                    except OSError:
+                        pass
+
+    # Veritabanı yardımcıları (çağıran kilidi tutar veya kilidi kendisi alır)
+    def _insert_row(self, section: Dict[str, Any], position: int) -> SectionRecord:
+        section = section.to_dict() if isinstance(section, SectionRecord) else section
+        meta = {key: value for key, value in section.items() if key not in TEXT_FIELDS}
+        cursor = self._connection.execute("INSERT INTO sections (position, meta) VALUES (?, ?)", (position, json.dumps(meta, ensure_ascii=False)))
+        self._connection.executemany(
+            "INSERT INTO section_texts (section_id, field, value) VALUES (?, ?, ?)",
+            [(cursor.lastrowid, field, section[field]) for field in TEXT_FIELDS if section.get(field) is not None]
+        )
+        return SectionRecord(self, cursor.lastrowid, meta)
+
+    def _renumber_from(self, index: int):
+        self._connection.executemany(
+            "UPDATE sections SET position = ? WHERE id = ?",
+            [(position, self._records[position].id) for position in range(index, len(self._records))]
+        )
+
+    def _read_text(self, section_id: int, field: str) -> str | None:
+        with self._lock:
+            key = (section_id, field)
+            if key in self._text_cache:
+                self._text_cache.move_to_end(key)
+                return self._text_cache[key]
+            row = self._connection.execute("SELECT value FROM section_texts WHERE section_id = ? AND field = ?", key).fetchone()
+            value = row[0] if row else None
+            self._cache_text(key, value)
+            return value
+
+    def _read_all_texts(self, section_id: int) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._connection.execute("SELECT field, value FROM section_texts WHERE section_id = ?", (section_id,)))
+
+    def _write_text(self, section_id: int, field: str, value: str | None):
+        with self._lock:
+            with self._connection:
+                if value is None:
+                    self._connection.execute("DELETE FROM section_texts WHERE section_id = ? AND field = ?", (section_id, field))
+                else:
+                    self._connection.execute("INSERT OR REPLACE INTO section_texts (section_id, field, value) VALUES (?, ?, ?)", (section_id, field, value))
+            self._cache_text((section_id, field), value)
+
+    def _write_meta(self, record: SectionRecord):
+        with self._lock:
+            with self._connection:
+                self._connection.execute("UPDATE sections SET meta = ? WHERE id = ?", (json.dumps(record.meta, ensure_ascii=False), record.id))
+
+    def _cache_text(self, key, value):
+        self._text_cache[key] = value
+        self._text_cache.move_to_end(key)
+        while len(self._text_cache) > TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
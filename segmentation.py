@@ -0,0 +1,404 @@
+import os
+import re
+import itertools
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+
+# Metni çeviri bölümlerine ayırırken kullanılan yardımcılar.
+# Bölüm boyutu kelime sayısı yerine tahmini token sayısıyla ölçülür; böylece boşluksuz yazılan
+# diller (Çince, Japonca, Tayca) ile Latin alfabeli diller aynı büyüklükte bölümler üretir.
+
+# Yazı sistemi -> (karakter deseni, karakter başına yaklaşık token). Ağ erişimi gerektirmeyen kaba bir tahmindir;
+# güncel BPE/SentencePiece sözlüklerinde İngilizce ~4 karakter/token, CJK ideogramları ~1 token/karakterdir.
+SCRIPT_TOKEN_RATES = (
+    (re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]"), 1.0),  # CJK ideogramları
+    (re.compile(r"[\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f]"), 0.8),  # Hiragana / Katakana
+    (re.compile(r"[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]"), 0.8),  # Hangul
+    (re.compile(r"[\u0e00-\u0e7f]"), 0.45),                             # Tayca
+    (re.compile(r"[A-Za-z0-9\u00c0-\u024f]"), 0.25),                    # Latin harfleri ve rakamlar
+)
+OTHER_LETTER_RATE = 0.35  # Kiril, Yunan, Arap, Devanagari vb.
+PUNCTUATION_RATE = 0.5
+
+_WORD_CHARACTER = re.compile(r"\w")
+_LATIN_RATE = SCRIPT_TOKEN_RATES[-1][1]
+_ASCII_ALPHANUMERIC = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+_ASCII_NON_ALPHANUMERIC = bytes(b for b in range(128) if b not in _ASCII_ALPHANUMERIC)
+_ASCII_NON_SPACE = bytes(b for b in range(128) if not chr(b).isspace())
+_PUNCTUATION_CHARACTER = re.compile(r"[^\w\s]")
+
+# Model adı öneki -> bölüm başına hedef token sayısı. En uzun eşleşen önek kullanılır.
+# Çıktı token sınırı düşük veya yavaş modellerde daha küçük bölümler tercih edilir.
+MODEL_SECTION_TOKENS = {
+    "gemini-1.5-flash": 1300,
+    "gemini-1.5-pro": 2000,
+    "gemini-2": 2000,
+    "gpt-4o-mini": 1300,
+    "gpt-4o": 2000,
+    "gpt-4": 1500,
+    "gpt-3.5": 800,
+}
+DEFAULT_SECTION_TOKENS = 1300  # Yaklaşık 1000 İngilizce kelime (eski kelime sınırının karşılığı)
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin token sayısını yazı sistemine göre tahmin eder (boşluklar sayılmaz)."""
+    return int(round(_token_weight(text)))
+
+
+def _token_weight(text: str) -> float:
+    """Yuvarlanmamış token tahmini; parçalar toplanırken yuvarlama hatası birikmesin diye kullanılır."""
+    if not text:
+        return 0.0
+    if text.isascii():
+        # Hızlı yol (büyük dosyalarda satır başına çağrılır): harf/rakam ve boşluklar bytes.translate ile sayılır
+        raw = text.encode("ascii")
+        alphanumeric = len(raw.translate(None, _ASCII_NON_ALPHANUMERIC))
+        spaces = len(raw.translate(None, _ASCII_NON_SPACE))
+        return alphanumeric * _LATIN_RATE + (len(raw) - alphanumeric - spaces) * PUNCTUATION_RATE
+    word_characters = len(_WORD_CHARACTER.findall(text))
+    tokens = 0.0
+    # Tayca ve sonrası (CJK, Hangul) yoksa o desenler atlanır
+    rates = SCRIPT_TOKEN_RATES if max(text) >= "\u0e00" else SCRIPT_TOKEN_RATES[-1:]
+    for pattern, rate in rates:
+        count = len(pattern.findall(text))
+        tokens += count * rate
+        word_characters -= count
+    tokens += max(word_characters, 0) * OTHER_LETTER_RATE
+    tokens += len(_PUNCTUATION_CHARACTER.findall(text)) * PUNCTUATION_RATE
+    return tokens
+
+
+def section_token_target(model_name: str | None) -> int:
+    """
+    Verilen model için bölüm başına hedef token sayısını döndürür.
+    SECTION_TARGET_TOKENS ortam değişkeni tanımlıysa her zaman o kullanılır.
+    """
+    override = os.getenv("SECTION_TARGET_TOKENS")
+    if override:
+        return int(override)
+    model_name = (model_name or "").lower()
+    matches = [prefix for prefix in MODEL_SECTION_TOKENS if model_name.startswith(prefix)]
+    if not matches:
+        return DEFAULT_SECTION_TOKENS
+    return MODEL_SECTION_TOKENS[max(matches, key=len)]
+
+
+# Cümle sonu işaretleri (Latin, CJK, Arapça, Devanagari)
+SENTENCE_TERMINATORS = set(".!?…。！？؟۔।॥‼⁇⁈⁉")
+# Ardından boşluk gelmese de cümleyi bitiren (boşluksuz yazılan dillere ait) işaretler
+_UNSPACED_TERMINATORS = set("。！？")
+# Cümle sonu işaretinden sonra cümleye dahil edilen kapanış karakterleri
+_CLOSING_CHARACTERS = set('"\'”’»›」』）)]')
+# Açılış tırnağı -> kapanış tırnağı. Tırnak içindeki (diyalog) cümle sonları bölme noktası sayılmaz.
+_QUOTE_PAIRS = {"“": "”", "«": "»", "‹": "›", "「": "」", "『": "』", "（": "）"}
+# Boşluksuz yazılan dillerin karakterleri ve noktalaması (CJK, kana, tam genişlikli işaretler)
+_UNSPACED_CHARACTER = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "etc", "no", "vol", "ch", "vb", "bkz", "sn", "yy"}
+
+
+def split_sentences(text: str, respect_quotes: bool = True) -> List[str]:
+    """
+    Metni cümlelere böler. Parçalar boşlukları da içerir, yani "".join(sonuç) == text.
+    respect_quotes=True iken tırnak içindeki diyaloglar bölünmez; kapanmayan bir tırnak metnin geri kalanını
+    tek cümle yapabileceğinden, çok uzun kalan cümleler respect_quotes=False ile yeniden bölünebilir.
+    """
+    sentences = []
+    start = 0
+    closers = []  # Beklenen kapanış tırnakları
+    length = len(text)
+    i = 0
+    while i < length:
+        ch = text[i]
+        if respect_quotes:
+            if closers and ch == closers[-1]:
+                closers.pop()
+                # Diyalog bir cümle sonu işaretiyle kapandıysa ("Git!") tırnaktan sonra bölünebilir
+                if not closers and i > 0 and text[i - 1] in SENTENCE_TERMINATORS and _starts_new_sentence(text, i + 1, text[i - 1]):
+                    sentences.append(text[start:_skip_spaces(text, i + 1)])
+                    start = _skip_spaces(text, i + 1)
+                i += 1
+                continue
+            if ch in _QUOTE_PAIRS:
+                closers.append(_QUOTE_PAIRS[ch])
+            elif ch == '"':
+                closers.append('"')
+        if ch in SENTENCE_TERMINATORS and not closers:
+            end = i + 1
+            while end < length and text[end] in SENTENCE_TERMINATORS:
+                end += 1
+            while end < length and text[end] in _CLOSING_CHARACTERS:
+                end += 1
+            if _starts_new_sentence(text, end, ch) and not (ch == "." and _is_abbreviation(text, start, i)):
+                sentences.append(text[start:_skip_spaces(text, end)])
+                start = _skip_spaces(text, end)
+            i = end
+            continue
+        i += 1
+    if start < length:
+        sentences.append(text[start:])
+    return sentences
+
+
+def _skip_spaces(text: str, position: int) -> int:
+    while position < len(text) and text[position].isspace():
+        position += 1
+    return position
+
+
+def _starts_new_sentence(text: str, position: int, terminator: str) -> bool:
+    """Cümle sonu işaretinden sonra yeni bir cümle başlıyor mu (metin sonu, veya boşluk + küçük harf olmayan karakter)."""
+    if position >= len(text):
+        return True
+    if terminator in _UNSPACED_TERMINATORS:
+        return True
+    if not text[position].isspace():
+        return False  # 3.14, e.g. gibi
+    next_position = _skip_spaces(text, position)
+    return next_position >= len(text) or not text[next_position].islower()
+
+
+def _is_abbreviation(text: str, sentence_start: int, dot_position: int) -> bool:
+    word = re.search(r"(\w+)$", text[sentence_start:dot_position])
+    return bool(word) and (word.group(1).lower() in _ABBREVIATIONS or (len(word.group(1)) == 1 and word.group(1).isupper()))
+
+
+def split_oversized_paragraph(paragraph: str, max_tokens: int) -> List[str]:
+    """
+    Token sınırını aşan bir paragrafı, cümle sınırlarından bölerek her biri max_tokens'ı aşmayan parçalara ayırır.
+    Tek başına sınırı aşan cümleler önce tırnaklar yok sayılarak, o da yetmezse kelime/karakter sınırından bölünür.
+    """
+    units = []
+    for sentence in split_sentences(paragraph):
+        if estimate_tokens(sentence) <= max_tokens:
+            units.append(sentence)
+            continue
+        for inner in split_sentences(sentence, respect_quotes=False):
+            if estimate_tokens(inner) <= max_tokens:
+                units.append(inner)
+            else:
+                # Noktalama yok (OCR çıktısı vb.): kelimelerden, boşluksuz dillerde karakterlerden böl
+                units.extend(re.findall(r"\S+\s*", inner) if re.search(r"\s", inner.strip()) else list(inner))
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for unit in units:
+        unit_tokens = _token_weight(unit)
+        if current and current_tokens + unit_tokens > max_tokens:
+            chunks.append("".join(current).strip())
+            current = []
+            current_tokens = 0
+        current.append(unit)
+        current_tokens += unit_tokens
+    if current:
+        chunks.append("".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+def join_section_texts(sections: List[Dict[str, Any]], key: str) -> str:
+    """
+    Bölümlerin verilen alandaki metinlerini dışa aktarım için birleştirir.
+    Uzun bir paragrafın parçaları ("split_paragraph") paragraf sonu yerine aynı paragraf içinde birleştirilir.
+    """
+    pieces = []
+    for section in sections:
+        text = section.get(key, "")
+        pieces.append(text)
+        split = section.get("split_paragraph")
+        if split and split["part"] < split["parts"] - 1:
+            # Boşluksuz yazılan dillerde parçalar arasına boşluk konmaz
+            pieces.append("" if text and _UNSPACED_CHARACTER.match(text[-1]) else " ")
+        else:
+            pieces.append("\n\n")
+    return "".join(pieces)
+
+
+def pack_texts(texts: List[str], max_tokens: int) -> List[List[int]]:
+    """Metinleri sırayı bozmadan, her paket max_tokens tahmini tokeni aşmayacak şekilde gruplar; indeks listeleri döndürür."""
+    packs, pack, pack_tokens = [], [], 0.0
+    for index, text in enumerate(texts):
+        tokens = _token_weight(text)
+        if pack and pack_tokens + tokens > max_tokens:
+            packs.append(pack)
+            pack, pack_tokens = [], 0.0
+        pack.append(index)
+        pack_tokens += tokens
+    if pack:
+        packs.append(pack)
+    return packs
+
+
+# Ana bölüm (chapter) ayraçları: "Chapter 3", "Bölüm 12", "***", "###" satırları
+DEFAULT_SPLITTER_PATTERN = r'\b(?:chapter|bölüm|kısım|part)\s*\d+\b.*$|^\s*\*+\s*$|^\s*#+\s*$'
+
+
+def iter_sections_from_lines(lines: Iterable[Tuple[str, Tuple[int, int] | None]], max_tokens: int, custom_splitter: str = None, encoding: str = "utf-8") -> Iterator[Dict[str, Any]]:
+    """
+    Satır akışından çeviri bölümleri üretir (get_sections ve büyük dosya okuma aynı mantığı kullanır).
+    `lines` (satır metni, kaynak bayt aralığı veya None) çiftleridir. Bellekte yalnızca o an doldurulan bölümün
+    paragrafları tutulur. Bayt aralıkları biliniyorsa bölüm "source_span" ([başlangıç, bitiş]) bilgisini taşır.
+    """
+    splitter = re.compile(re.escape(custom_splitter) if custom_splitter else DEFAULT_SPLITTER_PATTERN, re.IGNORECASE)
+    paragraph_ids = itertools.count()
+    paragraphs = []  # (metin, aralık) — doldurulmakta olan bölüm
+    tokens = 0.0
+
+    def section_from(items, **extra):
+        section = {"type": "novel_section", "text": "\n\n".join(text for text, _ in items), **extra}
+        spans = [span for _, span in items if span]
+        if spans and len(spans) == len(items):
+            section["source_span"] = [spans[0][0], spans[-1][1]]
+        return section
+
+    def paragraph_sections(text, span):
+        """Bir paragrafı pakete ekler; dolan bölümleri döndürür."""
+        nonlocal paragraphs, tokens
+        ready = []
+        paragraph_tokens = _token_weight(text)
+        if paragraph_tokens > max_tokens:
+            # Tek başına sınırı aşan paragraf cümle sınırlarından bölünür
+            if paragraphs:
+                ready.append(section_from(paragraphs))
+                paragraphs, tokens = [], 0.0
+            pieces = split_oversized_paragraph(text, max_tokens)
+            paragraph_id = next(paragraph_ids)
+            for part, piece in enumerate(pieces):
+                ready.append(section_from([(piece, span)], split_paragraph={"id": paragraph_id, "part": part, "parts": len(pieces)}))
+            return ready
+        if paragraphs and tokens + paragraph_tokens > max_tokens:
+            ready.append(section_from(paragraphs))
+            paragraphs, tokens = [], 0.0
+        paragraphs.append((text, span))
+        tokens += paragraph_tokens
+        return ready
+
+    for line, span in lines:
+        match = splitter.search(line)
+        if match:
+            # Ayraçtan önceki metin önceki ana bölüme aittir; ayraçla yeni ana bölüm başlar
+            before = line[:match.start()]
+            if before.strip():
+                before_span = (span[0], span[0] + len(before.encode(encoding))) if span else None
+                yield from paragraph_sections(before, before_span)
+            if paragraphs:
+                yield section_from(paragraphs)
+                paragraphs, tokens = [], 0.0
+            if span:
+                span = (span[0] + len(before.encode(encoding)), span[1])
+            line = line[match.start():]
+        if line.strip():
+            yield from paragraph_sections(line.strip(), span)
+    if paragraphs:
+        yield section_from(paragraphs)
+
+
+# Çeviri gerektirmeyen bölümler: yalnızca ayraç, sayı veya boşluktan oluşanlar ve başlıksız "Chapter N" satırları.
+# Bunlar yapay zekâya gönderilmeden yerel olarak çevrilir (ayraçlar aynen kalır, bölüm başlıkları hedef dil kalıbıyla yazılır).
+CHAPTER_HEADING_TEMPLATES = {
+    "en": "Chapter {number}", "tr": "Bölüm {number}", "de": "Kapitel {number}", "fr": "Chapitre {number}",
+    "es": "Capítulo {number}", "it": "Capitolo {number}", "pt": "Capítulo {number}", "ru": "Глава {number}",
+    "ja": "第{number}章", "zh": "第{number}章", "ko": "제{number}장", "ar": "الفصل {number}", "hi": "अध्याय {number}",
+}
+# Romen rakamları büyük harfe duyarlıdır; aksi halde "Chapter Mild" gibi başlıklar sayı sanılır
+_CHAPTER_HEADING = re.compile(
+    r"^\s*(?:(?i:chapter|bölüm|kapitel|chapitre|capítulo|capitolo|глава)\s*(\d+|[IVXLCDM]+)|第\s*(\d+)\s*章|제\s*(\d+)\s*장)\s*[.:]?\s*$"
+)
+
+
+def translate_trivial_section(text: str, target_language: str) -> str | None:
+    """
+    Bölüm yerel olarak çevrilebiliyorsa çevirisini, değilse None döndürür.
+    Harf içermeyen satırlar aynen korunur; başlıksız bölüm numaraları hedef dilin kalıbıyla yazılır.
+    Hedef dil için kalıp yoksa veya satırlardan biri gerçek metin içeriyorsa bölüm yapay zekâya bırakılır.
+    """
+    translated_lines = []
+    for line in text.split("\n"):
+        if not any(character.isalpha() for character in line):
+            translated_lines.append(line)
+            continue
+        match = _CHAPTER_HEADING.match(line)
+        template = CHAPTER_HEADING_TEMPLATES.get((target_language or "").lower())
+        if not match or not template:
+            return None
+        number = next(group for group in match.groups() if group)
+        translated_lines.append(template.format(number=number))
+    return "\n".join(translated_lines)
+
+
+# Roman genelinde tekrarlanan paragraflar (sahne ayraçları, tekrar eden başlıklar, mektuplar, şarkılar, özetler).
+# Her benzersiz tekrar bir kez çevrilir; bölüm metninde paragrafın yerine çevirisini taşıyan bir işaret konur.
+# İşaret çeviriyi içerdiği için model paragrafı bağlam olarak görmeye devam eder; çıktıdaki işaret yine aynı çeviriyle değiştirilir.
+_PARAGRAPH_SEPARATOR = re.compile(r"(\n\s*\n)")
+_REPEATED_PARAGRAPH_MARKER = re.compile(r"\[\[R(\d+):.*?\]\]", re.DOTALL)
+# İşaretli bölümün her aşama prompt'una eklenir; talimat olmadan modeller işareti çoğu zaman çevirir veya siler
+REPEATED_PARAGRAPH_MARKER_INSTRUCTION = (
+    "- The text contains markers of the form [[R<n>: ...]]. Each marker holds a paragraph that has already been translated. "
+    "Copy every marker into your output exactly as it is, in the same position. Do not translate, edit, merge or remove the markers."
+)
+
+
+def normalize_paragraph(paragraph: str) -> str:
+    """Paragrafı karşılaştırma anahtarına dönüştürür (Unicode NFC, boşluklar tek boşluğa indirgenir)."""
+    return " ".join(unicodedata.normalize("NFC", paragraph).split())
+
+
+def find_repeated_paragraphs(texts: Iterable[str], min_chars: int = 40, min_occurrences: int = 2) -> List[str]:
+    """
+    Metinlerde en az min_occurrences kez geçen paragrafları ilk göründükleri sırayla döndürür.
+    Kısa ve harf içermeyen paragraflar (ör. "***") atlanır; bunları ayrıca çevirmek tasarruf sağlamaz.
+    """
+    counts = Counter()
+    first_seen = {}
+    for text in texts:
+        for paragraph in _PARAGRAPH_SEPARATOR.split(text)[::2]:
+            key = normalize_paragraph(paragraph)
+            if len(key) < min_chars or not any(character.isalpha() for character in key):
+                continue
+            counts[key] += 1
+            first_seen.setdefault(key, paragraph.strip())
+    return [first_seen[key] for key, count in counts.items() if count >= min_occurrences]
+
+
+def mask_repeated_paragraphs(text: str, translations: Dict[str, str]) -> Tuple[str, List[str]]:
+    """
+    Çevirisi bilinen paragrafları "[[R<n>: çeviri]]" işaretleriyle değiştirir.
+    (işaretli metin, n. işaretin çevirisi listesi) döndürür; liste boşsa metin değişmemiştir.
+    """
+    parts = _PARAGRAPH_SEPARATOR.split(text)
+    replacements = []
+    for i in range(0, len(parts), 2):
+        translation = translations.get(normalize_paragraph(parts[i]))
+        if translation:
+            replacements.append(translation)
+            parts[i] = f"[[R{len(replacements)}: {translation}]]"
+    return "".join(parts), replacements
+
+
+def has_repeated_paragraph_markers(text: str) -> bool:
+    return bool(text) and _REPEATED_PARAGRAPH_MARKER.search(text) is not None
+
+
+def strip_repeated_paragraph_markers(text: str) -> str:
+    """İşaretleri metinden çıkarır; kalite kontrolleri önceden çevrilmiş paragrafları kaynağa kopyalanmış metin saymaz."""
+    return _REPEATED_PARAGRAPH_MARKER.sub("", text or "")
+
+
+def restore_repeated_paragraphs(text: str, replacements: List[str]) -> Tuple[str, int]:
+    """
+    Çıktıdaki işaretleri kayıtlı çevirilerle değiştirir. (metin, kaybolan işaret sayısı) döndürür;
+    model işareti kaldırıp çeviriyi aynen bıraktıysa işaret kaybolmuş sayılmaz.
+    """
+    restored_indices = set()
+
+    def substitute(match):
+        index = int(match.group(1)) - 1
+        if 0 <= index < len(replacements):
+            restored_indices.add(index)
+            return replacements[index]
+        return match.group(0)
+
+    restored = _REPEATED_PARAGRAPH_MARKER.sub(substitute, text)
+    missing = sum(1 for index, translation in enumerate(replacements) if index not in restored_indices and translation not in restored)
+    return restored, missing
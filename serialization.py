@@ -0,0 +1,52 @@
+import json
+from typing import Any, IO, Iterable
+
+import json5
+
+# Uygulamanın kendi yazdığı veriler (bölüm dışa/içe aktarımları, stil rehberi, promptlar, dil dosyaları,
+# bölüm başına aktarılan analiz bağlamı) standart kütüphanenin C hızlandırmalı json modülüyle okunur ve yazılır.
+# json5 yalnızca yedek ayrıştırıcıdır: elle düzenlenmiş (yorumlu, sondaki virgüllü) dosyalar json ile okunamazsa devreye girer.
+# AI yanıtları esnek olduğu için doğrudan json5 ile ayrıştırılmaya devam eder.
+
+
+def dumps_json(data: Any, indent: int = None) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=indent)
+
+
+def dump_json(data: Any, file: IO[str], indent: int = None):
+    """
+    Veriyi dosyaya yazar. json.dump akış modunda saf Python kodlayıcıyı kullandığından metin önce tek seferde
+    üretilir ve sonra yazılır. C kodlayıcı yalnızca indent verilmediğinde kullanılır; girintili çıktı saf Python
+    kodlayıcıya düşer. Bu yüzden önbellek gibi yalnızca uygulamanın okuduğu dosyalar girintisiz, kullanıcının
+    açıp düzenleyebileceği dosyalar (promptlar, stil rehberi, dışa aktarımlar) girintili yazılır.
+    """
+    file.write(json.dumps(data, ensure_ascii=False, indent=indent))
+
+
+def dump_json_list(items: Iterable[Any], file: IO[str]):
+    """
+    Büyük listeleri (ör. bölümler) her öğe bir satırda olacak şekilde yazar.
+    Girintili çıktı saf Python kodlayıcıya düştüğü için öğeler girintisiz kodlanır; dosya yine okunabilir kalır.
+    """
+    file.write("[\n")
+    first = True
+    for item in items:
+        if not first:
+            file.write(",\n")
+        file.write(json.dumps(item, ensure_ascii=False))
+        first = False
+    file.write("\n]\n")
+
+
+def loads_json(text: str, lenient: bool = True) -> Any:
+    """Metni json ile ayrıştırır; başarısız olursa ve lenient ise json5 ile yeniden dener."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        if not lenient:
+            raise
+        return json5.loads(text)
+
+
+def load_json(file: IO[str], lenient: bool = True) -> Any:
+    return loads_json(file.read(), lenient=lenient)
@@ -0,0 +1,175 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+# Sözlüğün çeviriden önce hazırlanması için yerel aday terim çıkarımı. Roman tek geçişte taranır ve
+# yinelenen özel adlar (cümle ortasında büyük harfle başlayan kelime grupları), unvanlı adlar,
+# uydurma birleşik kelimeler ve sık geçen çok kelimeli ifadeler toplanır. Adaylar sıklık ve bölümlere
+# yayılım (kaç bölümde geçtiği) ile sıralanır; seçilenler tek bir toplu istekle çevrilip stil rehberinin
+# tutarlı terimlerine eklenir. Böylece terimler her bölümden sonra tek tek keşfedilmek zorunda kalmaz.
+# Bu kurallar büyük/küçük harf ayrımı olan ve boşlukla yazılan dillerde anlamlıdır; CJK metinlerde
+# aday üretimi sınırlı kalır.
+
+_TOKEN = re.compile(r"\w+(?:['’-]\w+)*")
+_NAME_SUFFIX = re.compile(r"['’][^\W\d_]{1,5}$")  # "Ahmet'in", "Ahab's" -> "Ahmet", "Ahab"
+_SENTENCE_END = ".!?…\n"
+_OPENING_MARKS = " \t\"“”«»'‘’—–-("
+_MAX_NAME_TOKENS = 4
+_PHRASE_SIZES = (2, 3)
+_STOPWORD_COUNT = 100  # Romanın en sık küçük harfli kelimeleri; ifade adaylarının başında/sonunda olamaz
+
+# Yaygın unvanlar ve rütbeler (küçük harfle); bunları içeren ad grupları "title" türünde işaretlenir
+TITLE_WORDS = {
+    # en
+    "mr", "mrs", "miss", "ms", "sir", "lady", "lord", "king", "queen", "prince", "princess", "duke", "duchess",
+    "count", "countess", "baron", "emperor", "empress", "captain", "general", "colonel", "major", "lieutenant",
+    "sergeant", "commander", "admiral", "doctor", "dr", "professor", "father", "brother", "sister", "master",
+    # tr
+    "bey", "hanım", "paşa", "efendi", "ağa", "sultan", "şeyh", "hoca", "kaptan", "komiser", "başkomiser",
+    "doktor", "profesör", "kral", "kraliçe", "prens", "prenses", "dük", "kont", "yüzbaşı", "binbaşı", "albay",
+    # de
+    "herr", "frau", "fräulein", "graf", "gräfin", "fürst", "könig", "königin", "prinz", "kapitän", "hauptmann",
+    # fr
+    "monsieur", "madame", "mademoiselle", "comte", "comtesse", "roi", "reine", "capitaine", "sieur",
+    # es / it / pt
+    "señor", "señora", "señorita", "don", "doña", "capitán", "rey", "reina", "signor", "signora", "capitano",
+    "conte", "contessa", "senhor", "senhora", "dom", "capitão", "rei", "rainha",
+    # ru
+    "господин", "госпожа", "граф", "графиня", "князь", "княгиня", "капитан", "генерал", "полковник", "царь",
+}
+
+
+def _is_sentence_initial(text: str, start: int) -> bool:
+    prefix = text[max(0, start - 8):start].rstrip(_OPENING_MARKS)
+    return not prefix or prefix[-1] in _SENTENCE_END
+
+
+def _is_capitalized(word: str) -> bool:
+    return word[0].isupper()
+
+
+class _Occurrences:
+    """Bir aday türü için toplam geçiş, cümle başı geçiş ve geçtiği bölüm sayılarını tutar."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.sections = Counter()
+        self.initial = Counter()
+
+    def add_section(self, counts: Counter, initial: Counter = None):
+        self.counts.update(counts)
+        self.sections.update(counts.keys())
+        if initial:
+            self.initial.update(initial)
+
+
+def _scan_section(text: str, names: _Occurrences, compounds: _Occurrences, phrases: _Occurrences, lower_counts: Counter):
+    name_counts, name_initial, compound_counts, phrase_counts = Counter(), Counter(), Counter(), Counter()
+    run, run_initial, previous_end = [], False, None
+    phrase_window = []
+
+    def close_run():
+        if run:
+            name = " ".join(run[:_MAX_NAME_TOKENS])
+            name_counts[name] += 1
+            if run_initial:
+                name_initial[name] += 1
+
+    for match in _TOKEN.finditer(text):
+        word, start = match.group(), match.start()
+        adjacent = previous_end is not None and text[previous_end:start] == " "
+        previous_end = match.end()
+        if _is_capitalized(word):
+            word = _NAME_SUFFIX.sub("", word)
+            if run and adjacent:
+                run.append(word)
+            else:
+                close_run()
+                run, run_initial = [word], _is_sentence_initial(text, start)
+            phrase_window = []
+            continue
+        close_run()
+        run = []
+        folded = word.casefold()
+        lower_counts[folded] += 1
+        if "-" in word or "'" in word or "’" in word:
+            compound_counts[folded] += 1
+        phrase_window = (phrase_window if adjacent else [])[-(max(_PHRASE_SIZES) - 1):] + [folded]
+        for size in _PHRASE_SIZES:
+            if len(phrase_window) >= size:
+                phrase_counts[" ".join(phrase_window[-size:])] += 1
+    close_run()
+
+    names.add_section(name_counts, name_initial)
+    compounds.add_section(compound_counts)
+    phrases.add_section(phrase_counts)
+
+
+def extract_candidate_terms(texts: Iterable[str], max_terms: int = 80, min_occurrences: int = 3, exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """
+    Metinlerden (bölümler) aday terimleri çıkarır ve {"term", "kind", "count", "sections", "score"} listesi olarak döndürür.
+    Türler: "name" (yinelenen özel ad grupları), "title" (unvan/rütbe içeren adlar), "coined" (parçalarından biri
+    romanda tek başına hiç geçmeyen birleşik kelimeler) ve "phrase" (sık geçen çok kelimeli ifadeler).
+    Skor, geçiş sayısı ile bölümlere yayılımın kareköküyle çarpımıdır. exclude içindeki terimler (karakter adları,
+    mevcut sözlük terimleri) büyük/küçük harf ayrımı yapılmadan dışarıda bırakılır.
+    """
+    names, compounds, phrases = _Occurrences(), _Occurrences(), _Occurrences()
+    lower_counts = Counter()
+    total_sections = 0
+    for text in texts:
+        total_sections += 1
+        if text:
+            _scan_section(text, names, compounds, phrases, lower_counts)
+    if not total_sections:
+        return []
+
+    stopwords = {word for word, _ in lower_counts.most_common(_STOPWORD_COUNT)}
+    excluded = {term.casefold() for term in exclude if term}
+    candidates = {}
+
+    def add(term, kind, count, sections):
+        if count < min_occurrences or term.casefold() in excluded:
+            return
+        score = round(count * math.sqrt(sections / total_sections), 3)
+        if term not in candidates or candidates[term]["score"] < score:
+            candidates[term] = {"term": term, "kind": kind, "count": count, "sections": sections, "score": score}
+
+    # Cümle başındaki yaygın kelimeler ("The", "Bu") ad grubundan atılır ve kalan grup birleştirilir
+    merged, merged_sections, merged_mid = Counter(), Counter(), Counter()
+    for run, count in names.counts.items():
+        tokens = run.split(" ")
+        while tokens and tokens[0].casefold() in stopwords:
+            tokens = tokens[1:]
+        if not tokens:
+            continue
+        name = " ".join(tokens)
+        merged[name] += count
+        merged_sections[name] = max(merged_sections[name], names.sections[run])
+        if len(tokens) < len(run.split(" ")):
+            merged_mid[name] += count
+        else:
+            merged_mid[name] += count - names.initial[run]
+    for name, count in merged.items():
+        tokens = name.split(" ")
+        # Tek kelimelik adaylar: hiç cümle ortasında geçmeyen veya romanda sık sık küçük harfle de yazılan kelimeler ad değildir
+        if len(tokens) == 1 and (merged_mid[name] == 0 or lower_counts[name.casefold()] * 2 >= count):
+            continue
+        kind = "title" if any(token.casefold() in TITLE_WORDS for token in tokens) else "name"
+        add(name, kind, count, merged_sections[name])
+
+    for word, count in compounds.counts.items():
+        parts = re.split(r"['’-]", word)
+        # Kısa parçalar ("didn't", "l'homme", "we'll") ek veya kısaltmadır; yalnızca uzun ve romanda tek başına geçmeyen parçalar uydurma sayılır
+        if len(parts[-1]) <= 2 or len(parts[0]) <= 1:
+            continue
+        if any(part not in lower_counts for part in parts):
+            add(word, "coined", count, compounds.sections[word])
+
+    for phrase, count in phrases.counts.items():
+        tokens = phrase.split(" ")
+        if tokens[0] in stopwords or tokens[-1] in stopwords or count < 2 * min_occurrences:
+            continue
+        add(phrase, "phrase", count, phrases.sections[phrase])
+
+    return sorted(candidates.values(), key=lambda candidate: (-candidate["score"], candidate["term"]))[:max_terms]
@@ -0,0 +1,20 @@
+from quality_checks import check_translation
+
+SOURCE = "The ship left the harbour before dawn and the bells rang out over the sleeping town. " * 6
+FULL = "Gemi şafaktan önce limandan ayrıldı ve çanlar uyuyan kasabanın üzerinde çaldı. " * 6
+
+
+def checks(report):
+    return {issue["check"]: issue["severity"] for issue in report["issues"]}
+
+
+def test_unterminated_ending_alone_is_a_warning():
+    report = check_translation(SOURCE, FULL.rstrip(". ") + " ve", "en", "tr")
+    assert checks(report) == {"truncated_ending": "minor"}
+    assert not report["severe"]
+
+
+def test_unterminated_short_translation_is_severe():
+    report = check_translation(SOURCE, FULL[:len(FULL) // 3] + " ve", "en", "tr")
+    assert checks(report).get("truncated") == "severe"
+    assert report["severe"]
@@ -0,0 +1,44 @@
+import re
+
+from quality_checks import check_translation
+from segmentation import (
+    mask_repeated_paragraphs, restore_repeated_paragraphs, strip_repeated_paragraph_markers, normalize_paragraph,
+)
+
+REPEATED = "The bells of the old tower rang out over the sleeping harbour once again."
+TRANSLATED = "Eski kulenin çanları uyuyan limanın üzerinde bir kez daha çaldı."
+SECTION = f"Mara woke before dawn and walked to the window.\n\n{REPEATED}\n\nShe counted the strokes in silence and waited for the ship."
+
+
+def fake_translate(text):
+    # Model gibi davranır: işaretlerin dışındaki metni "çevirir", işaretleri aynen bırakır
+    parts = re.split(r"(\[\[R\d+:.*?\]\])", text, flags=re.DOTALL)
+    return "".join(part if part.startswith("[[R") else part.upper() for part in parts)
+
+
+def test_mask_translate_restore_round_trip():
+    masked, replacements = mask_repeated_paragraphs(SECTION, {normalize_paragraph(REPEATED): TRANSLATED})
+    assert replacements == [TRANSLATED]
+    assert REPEATED not in masked and "[[R1: " in masked
+
+    restored, missing = restore_repeated_paragraphs(fake_translate(masked), replacements)
+    assert missing == 0
+    assert restored.split("\n\n") == [
+        "MARA WOKE BEFORE DAWN AND WALKED TO THE WINDOW.", TRANSLATED,
+        "SHE COUNTED THE STROKES IN SILENCE AND WAITED FOR THE SHIP.",
+    ]
+
+
+def test_restore_counts_lost_markers():
+    masked, replacements = mask_repeated_paragraphs(SECTION, {normalize_paragraph(REPEATED): TRANSLATED})
+    translated_without_marker = re.sub(r"\[\[R1:.*?\]\]", "", masked, flags=re.DOTALL)
+    _, missing = restore_repeated_paragraphs(translated_without_marker, replacements)
+    assert missing == 1
+
+
+def test_markers_are_excluded_from_quality_checks():
+    masked, _ = mask_repeated_paragraphs(SECTION, {normalize_paragraph(REPEATED): TRANSLATED})
+    translated = masked.replace("Mara woke before dawn and walked to the window.", "Mara şafaktan önce uyandı ve pencereye yürüdü.")
+    translated = translated.replace("She counted the strokes in silence and waited for the ship.", "Vuruşları sessizce saydı ve gemiyi bekledi.")
+    report = check_translation(strip_repeated_paragraph_markers(masked), strip_repeated_paragraph_markers(translated), "en", "tr")
+    assert not [issue for issue in report["issues"] if issue["check"] == "untranslated_spans"]
@@ -1,7 +1,10 @@
 import re
 import time # Added for retry delay
+import threading
+from collections import deque
 from typing import Dict, List, Tuple, Any
 import os
+import json # Uygulamanın ürettiği bağlam verileri için (C hızlandırmalı); AI yanıtları json5 ile ayrıştırılır
 from dotenv import load_dotenv
 import json5 # json yerine json5 kullanıldı
 import logging
@@ -13,6 +16,43 @@ import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 import openai
 
+from quality_checks import check_translation, parse_glossary, QualityCheckError
+from segmentation import (
+    pack_texts, normalize_paragraph, mask_repeated_paragraphs, restore_repeated_paragraphs, translate_trivial_section,
+    has_repeated_paragraph_markers, strip_repeated_paragraph_markers, REPEATED_PARAGRAPH_MARKER_INSTRUCTION,
+)
+from language_detection import same_language
+
+# Yanıt çıktı token sınırında kesildiğinde gönderilen devam isteği
+CONTINUATION_PROMPT = "Your previous response was cut off by the output length limit. Continue exactly where it stopped. Do not repeat any text you have already written and do not add any comments, headings or markers."
+
+
+# Paketlenmiş kısa metinlerin ayracı ("[[P<n>]]"). Çıktıda satır içine taşınmış, boşluk veya markdown/noktalama
+# eklenmiş ayraçlar da ("**[[ P2 ]]**", "... metin [[P2]]: metin") tanınır.
+BATCH_MARKER = re.compile(r'[^\S\n]*[*_#>:.\-]*[^\S\n]*\[\[\s*P\s*(\d+)\s*\]\][^\S\n]*[*_:.\-]*[^\S\n]*')
+BATCH_MARKER_INSTRUCTION = (
+    "- The text consists of several separate passages, each preceded by a marker line of the form [[P<n>]]. "
+    "Keep every marker exactly as it is, on its own line before the translation of its passage. "
+    "Do not translate, renumber, merge or remove the markers, and do not move text from one passage to another."
+)
+
+# Yanıtın güvenlik filtresi tarafından engellendiğini gösteren bitiş nedenleri (Gemini)
+SAFETY_FINISH_REASONS = ("SAFETY", "PROHIBITED_CONTENT", "BLOCKLIST", "SPII")
+
+
+class SafetyBlockError(Exception):
+    """İstek veya yanıt güvenlik filtresince engellendiğinde yükseltilir. Aynı prompt ile yeniden denemek anlamsızdır."""
+
+
+class TruncatedOutputError(Exception):
+    """Bir aşamanın çıktısı, izin verilen devam isteklerinden sonra da token sınırında kesik kaldığında yükseltilir."""
+
+    def __init__(self, stage_name: str, continuations: int):
+        self.stage_name = stage_name
+        self.continuations = continuations
+        super().__init__(f"{stage_name}: output still truncated after {continuations} continuation request(s)")
+
+
 def deep_update(source, overrides):
     """
     Update a nested dictionary or similar mapping.
@@ -26,6 +66,15 @@ def deep_update(source, overrides):
     return source
 
 class NovelTranslator:
+    # Aşama adı -> aşamanın modelini belirleyen .env değişkeni
+    STAGE_MODEL_ENV_VARS = {
+        "initial_translation": "MODEL_INITIAL_TRANSLATION",
+        "line_edit": "MODEL_LINE_EDIT",
+        "cultural_localization": "MODEL_CULTURAL_LOCALIZATION",
+        "back_translation": "MODEL_BACK_TRANSLATION",
+        "style_guide": "MODEL_STYLE_GUIDE",
+    }
+
     def __init__(self, target_country: str = "US"): # API key will be handled internally based on model
         load_dotenv()
         self.target_country = target_country.upper() # Store as uppercase for consistency
@@ -46,8 +95,34 @@ class NovelTranslator:
             "cultural_references": {}
         }
         self.translation_memory = {}
-        self.translation_stages = []
+        # Aşama geçmişi: metin kopyaları yerine, metnin saklandığı bölüm alanına referanslar; bellekte sınırlı sayıda tutulur
+        self.translation_stages = deque(maxlen=int(os.getenv("STAGE_HISTORY_LIMIT", "200")))
+        # Stil rehberi güncelleme modu: "per_section" (her bölümden sonra, senkron) veya
+        # "batched" (her N bölümde veya M kelimede bir, arka planda toplu güncelleme)
+        self.style_guide_update_mode = os.getenv("STYLE_GUIDE_UPDATE_MODE", "per_section").lower()
+        self.style_guide_batch_sections = int(os.getenv("STYLE_GUIDE_BATCH_SECTIONS", "5"))
+        self.style_guide_batch_words = int(os.getenv("STYLE_GUIDE_BATCH_WORDS", "4000"))
+        self.style_guide_lock = threading.RLock() # Çeviri, son onaylanan stil rehberi sürümünü okurken güncelleme çakışmasın
+        self._pending_style_guide_pairs = []
+        self._style_guide_batch_context = {}
+        self._style_guide_update_thread = None
         self.model = None # Model değişkenini burada tanımla
+        self.model_name = None
+        # Aşamaya özel modeller (boşsa varsayılan model kullanılır), örn. ilk çeviri için güçlü,
+        # geri çeviri ve stil rehberi güncellemeleri için hızlı/ucuz bir model
+        self.stage_models = {
+            stage: os.getenv(env_name) or None for stage, env_name in self.STAGE_MODEL_ENV_VARS.items()
+        }
+        self._model_cache = {}
+        self._model_cache_lock = threading.Lock()
+        # Yerel kalite kontrolleri: ciddi sorunlu aşama çıktıları yeniden denenir (son denemede kabul edilir)
+        self.qa_enabled = os.getenv("QA_ENABLED", "true").lower() in ("1", "true", "yes")
+        # Çıktı token sınırında kesilen yanıtlar için en fazla kaç devam isteği gönderileceği
+        self.max_continuations = int(os.getenv("MAX_CONTINUATIONS", "3"))
+        # Güvenlik engeline takılan bölüm en fazla bu derinliğe kadar ikiye bölünerek çevrilir
+        self.safety_split_max_depth = int(os.getenv("SAFETY_SPLIT_MAX_DEPTH", "6"))
+        # Zaten hedef dilde olan bölümler: "edit" yalnızca satır düzenlemesi yapar, "pass_through" aynen geçirir, "translate" tam çeviri yapar
+        self.same_language_mode = os.getenv("SAME_LANGUAGE_SECTIONS", "edit").lower()
         self._setup_ai_model()
         
         # Default promptları sakla
@@ -157,9 +232,12 @@ ORİJİNAL METİN:
 ÇEVRİLEN METİN:
 {translated_text}
 """
+        # Hızlı mod: ilk çeviri, satır düzenleme ve kültürel yerelleştirme tek bir çağrıda
+        self.default_fast_translation_prompt = """RESPONSE FORMAT (STRICT):\n- Your output MUST INCLUDE ONLY the final translated text.\n- DO NOT add greetings, summaries, explanations, markdown, drafts, or formatting.\n- DO NOT include section titles, genre names, character info, or style guide notes.\n- The output must be a single, continuous, plain translation.\n- DO NOT DEVIATE from this rule.\n\nTASK:\nYou are a professional literary translator, line editor and cultural adaptation expert. Translate the following novel section from {source_language} into {target_language} for readers in {target_country}. This section may contain a mix of dialogue, description, and internal thoughts.\n\nWork through these steps silently and output ONLY the result of the last step:\n1. TRANSLATE: Produce a faithful translation that preserves the original tone, style, emotional impact and character consistency.\n2. LINE EDIT: Refine the translation for flow, sentence rhythm, readability, grammar and punctuation without changing the meaning.\n3. LOCALIZE: Make minimal, necessary cultural adjustments so the text feels natural for {target_language} readers in {target_country}, while preserving the original cultural identity. Avoid over-domestication.\n\n{mandatory_terms_section}\n\nSOURCE TEXT (in {source_language}):\n{original_section_text}\n\nCONTEXT FOR MODEL USE ONLY — DO NOT OUTPUT:\nSource Language: {source_language}\nTarget Language: {target_language}\nTarget Country: {target_country}\nGenre: {genre}\nCharacter Info:\n{formatted_characters_for_prompt}\nCultural Context:\n{formatted_cultural_context_for_prompt}\nMain Themes and Motifs:\n{formatted_themes_motifs_for_prompt}\nSetting and Atmosphere:\n{formatted_setting_atmosphere_for_prompt}\nStyle Guide:\n{style_guide_text}\n\n⚠️ DO NOT INCLUDE ANY PART OF THE CONTEXT ABOVE IN YOUR OUTPUT. \nYOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE TRANSLATION AND END WITH THE LAST WORD OF THE TRANSLATION. \n\n---BEGIN TRANSLATED TEXT---"""
         self.initial_prompt = self.default_initial_prompt
         self.line_edit_prompt = self.default_line_edit_prompt
         self.cultural_prompt = self.default_cultural_prompt
+        self.fast_translation_prompt = self.default_fast_translation_prompt
         self.style_guide_generation_prompt = self.default_style_guide_generation_prompt
         self.style_guide_update_prompt = self.default_style_guide_update_prompt
 
@@ -186,6 +264,55 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
 
 ---BEGIN BACK-TRANSLATED TEXT---"""
         self.back_translation_prompt = self.default_back_translation_prompt
+
+        self.default_harmonization_prompt = """RESPONSE FORMAT (STRICT):
+- Your output MUST CONTAIN ONLY the revised translation.
+- DO NOT include explanations, greetings, summaries, markdown, lists of changes, or any other content.
+- DO NOT DEVIATE from these instructions under any circumstances.
+
+TASK:
+You are a professional literary editor. The translation below was produced from {source_language} into {target_language} for readers in {target_country} before the final style guide of the novel was established. Revise it so that it follows the consolidated style guide, fixing ONLY the inconsistencies listed below.
+
+Rules:
+- Change only the words and phrases needed to resolve the listed inconsistencies.
+- Keep everything else exactly as it is: sentences, paragraphing, tone and character voice.
+- Use the terms from the style guide exactly as given.
+
+INCONSISTENCIES TO FIX:
+{violations}
+
+REFERENCE TEXT (DO NOT OUTPUT):
+{original_section_text}
+
+TEXT TO REVISE:
+{translated_text}
+
+CONTEXT FOR MODEL USE ONLY — DO NOT OUTPUT:
+Style Guide:
+{style_guide_text}
+
+⚠️ DO NOT INCLUDE ANY PART OF THE CONTEXT ABOVE IN YOUR OUTPUT.
+YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE REVISED TEXT AND END WITH THE LAST WORD OF THE REVISED TEXT.
+
+---BEGIN REVISED TEXT---"""
+        self.harmonization_prompt = self.default_harmonization_prompt
+
+        self.default_term_translation_prompt = """RESPONSE FORMAT (STRICT):
+- Your output MUST be a single JSON object mapping each source term to its translation, e.g. {{"source term": "translation"}}.
+- DO NOT include explanations, greetings, markdown or any other content.
+
+TASK:
+You are a professional literary translator preparing the glossary of a {genre} novel before it is translated from {source_language} into {target_language} for readers in {target_country}. The candidate terms below were extracted automatically from the novel. Each line gives the term, its kind (name, title, coined word or phrase) and how many times it occurs.
+
+Rules:
+- Give the translation that should be used consistently for the term throughout the novel.
+- Keep personal and place names unchanged; transliterate them only if {target_language} uses a different script.
+- Translate titles, ranks and invented words so that they read naturally in {target_language}, keeping the flavour of the original.
+- Omit candidates that are ordinary expressions and need no fixed translation.
+
+CANDIDATE TERMS:
+{terms}"""
+        self.term_translation_prompt = self.default_term_translation_prompt
         
     def _setup_ai_model(self):
         """
@@ -208,6 +335,7 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         genai.configure(api_key=self.gemini_api_key)
         model_name = self.allowed_model if (self.allowed_model and self.ai_model == "gemini") else "gemini-1.5-flash-latest"
         self.model = genai.GenerativeModel(model_name)
+        self.model_name = model_name
         # Güvenlik ayarlarını tanımla: Tüm kategoriler için engellemeyi devre dışı bırak
         self.safety_settings = {
             HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
@@ -227,8 +355,71 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         openai.api_key = self.openai_api_key
         model_name = self.allowed_model if (self.allowed_model and self.ai_model == "chatgpt") else "gpt-4o-mini"
         self.model = model_name
+        self.model_name = model_name
         print(f"DEBUG: OpenAI model setup complete. Using model: {model_name}")
 
+    def _get_model(self, stage: str):
+        """
+        Verilen aşama için yapılandırılmış modeli döndürür. Aşamaya özel model tanımlı değilse varsayılan model kullanılır.
+        Gemini için GenerativeModel nesnesi (isim başına önbelleğe alınır), OpenAI için model adı döndürülür.
+        """
+        model_name = self.stage_models.get(stage)
+        if not model_name or model_name == self.model_name:
+            return self.model
+        if self.ai_model == "gemini":
+            with self._model_cache_lock:
+                if model_name not in self._model_cache:
+                    self._model_cache[model_name] = genai.GenerativeModel(model_name)
+                    print(f"DEBUG: Gemini model for stage '{stage}': {model_name}")
+                return self._model_cache[model_name]
+        return model_name
+
+    def set_stage_models(self, stage_models: Dict[str, str]):
+        """Aşamaya özel model adlarını günceller. Boş değerler varsayılan modele döner."""
+        for stage in self.STAGE_MODEL_ENV_VARS:
+            if stage in stage_models:
+                self.stage_models[stage] = (stage_models[stage] or "").strip() or None
+
+    def _generate_stage_text(self, stage: str, prompt: str, stage_name: str, progress_callback=None) -> str:
+        """
+        Prompt'u aşamanın modeline gönderir ve yanıt metnini döndürür.
+        Yanıt çıktı token sınırında kesildiyse (Gemini: MAX_TOKENS, OpenAI: "length") kısmi çıktı sohbete eklenip
+        kaldığı yerden devam istenir ve parçalar birleştirilir. Sınır aşılırsa TruncatedOutputError yükseltilir.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        raw_text = ""
+        for continuation in range(self.max_continuations + 1):
+            if self.ai_model == "gemini":
+                contents = prompt if len(messages) == 1 else [
+                    {"role": "model" if message["role"] == "assistant" else "user", "parts": [message["content"]]}
+                    for message in messages
+                ]
+                response = self._get_model(stage).generate_content(contents, safety_settings=self.safety_settings)
+                chunk = self._extract_raw_response_text(response, stage_name, progress_callback)
+                finish_reason = response.candidates[0].finish_reason if getattr(response, 'candidates', None) else None
+                truncated = getattr(finish_reason, 'name', str(finish_reason)) == "MAX_TOKENS"
+            elif self.ai_model == "chatgpt":
+                if not self.model: raise ValueError("error_openai_model_not_set_up")
+                response = openai.chat.completions.create(model=self._get_model(stage), messages=messages)
+                if response.choices[0].finish_reason == "content_filter":
+                    raise SafetyBlockError(f"{stage_name} failed: response blocked by the content filter (finish_reason=content_filter).")
+                chunk = response.choices[0].message.content or ""
+                truncated = response.choices[0].finish_reason == "length"
+            else:
+                raise ValueError(f"error_unsupported_ai_model:{self.ai_model}")
+
+            raw_text += chunk
+            if not truncated:
+                break
+            if continuation >= self.max_continuations:
+                raise TruncatedOutputError(stage_name, self.max_continuations)
+            if progress_callback: progress_callback("log_output_truncated_continuing", stage=stage_name, continuation=continuation + 1, max_continuations=self.max_continuations)
+            messages += [{"role": "assistant", "content": chunk}, {"role": "user", "content": CONTINUATION_PROMPT}]
+
+        if self.ai_model == "gemini":
+            return self._strip_response_markers(raw_text)
+        return raw_text.strip()
+
     def set_initial_character_info(self, characters_str):
         """
         Bu metot artık kullanılmayacak, karakter bilgileri doğrudan AI analizinden gelecek.
@@ -238,7 +429,7 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
     def generate_style_guide_with_ai(self, genre: str, characters_data: Dict[str, Any], cultural_context_data: Dict[str, Any], main_themes_data: Dict[str, Any], setting_atmosphere_data: Dict[str, Any], source_language: str, target_language: str, target_country: str, progress_callback=None, max_retries: int = 3, retry_delay: int = 5, stop_event=None):
         """
         NovelAnalyzer'dan gelen verileri kullanarak stil rehberinin ilk taslağını yapay zeka ile oluşturur.
-        Hata durumunda belirtilen sayıda yeniden deneme yapar.
+        Hata durumunda belirtilen sayıda yeniden deneme yapar. Rehber yapay zekadan alındıysa True döndürür.
         """
         if stop_event and stop_event.is_set():
             if progress_callback: progress_callback("log_style_guide_generation_stopped")
@@ -270,14 +461,14 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
 
                 logger.debug(f"Stil rehberi oluşturma prompt'u:\n{prompt}")
                 if self.ai_model == "gemini":
-                    response = self.model.generate_content(prompt, safety_settings=self.safety_settings)
+                    response = self._get_model("style_guide").generate_content(prompt, safety_settings=self.safety_settings)
                     raw_response_text = response.text.strip()
                 elif self.ai_model == "chatgpt":
                     # Ensure self.model is set for OpenAI
                     if not self.model:
                          raise ValueError("error_openai_model_not_set_up")
                     response = openai.chat.completions.create(
-                        model=self.model,
+                        model=self._get_model("style_guide"),
                         messages=[{"role": "user", "content": prompt}],
                         response_format={"type": "json_object"} # İstek JSON formatında yanıt almak için
                     )
@@ -299,10 +490,11 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
 
                 try:
                     ai_generated_style_guide = json5.loads(raw_response_text)
-                    self.style_guide.update(ai_generated_style_guide)
+                    with self.style_guide_lock:
+                        self.style_guide.update(ai_generated_style_guide)
                     logger.info("Style guide successfully generated and updated from AI.")
                     if progress_callback: progress_callback("log_style_guide_generation_success")
-                    return # Başarılı olursa döngüden çık
+                    return True # Başarılı olursa döngüden çık
                 except json5.Json5Error as json_e: # json.JSONDecodeError yerine json5.Json5Error kullanıldı
                     if progress_callback: progress_callback("log_style_guide_generation_json_error", error=json_e)
                     raise ValueError(f"error_json_decode:{json_e}|{raw_response_text}")
@@ -353,7 +545,8 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         print(f"DEBUG: update_style_guide called for dynamic update.")
 
         # Mevcut stil rehberini JSON string'e dönüştür
-        current_style_guide_json = json5.dumps(self.style_guide, ensure_ascii=False, indent=2)
+        with self.style_guide_lock:
+            current_style_guide_json = json.dumps(self.style_guide, ensure_ascii=False, indent=2)
 
         # Karakter verilerini prompt için formatla
         formatted_characters = self._format_characters_for_prompt(characters_data)
@@ -383,11 +576,11 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
 
                 logger.debug(f"Stil rehberi güncelleme prompt'u:\n{prompt}")
                 if self.ai_model == "gemini":
-                    response = self.model.generate_content(prompt, safety_settings=self.safety_settings)
+                    response = self._get_model("style_guide").generate_content(prompt, safety_settings=self.safety_settings)
                     raw_response_text = response.text.strip()
                 elif self.ai_model == "chatgpt":
                     response = openai.chat.completions.create(
-                        model=self.model,
+                        model=self._get_model("style_guide"),
                         messages=[{"role": "user", "content": prompt}],
                         response_format={"type": "json_object"} # İstek JSON formatında yanıt almak için
                     )
@@ -410,7 +603,8 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                     ai_updated_style_guide = json5.loads(raw_response_text)
                     # self.style_guide.update(ai_updated_style_guide) -> Bu satır, iç içe geçmiş sözlükleri ezer.
                     # Bunun yerine derin bir güncelleme (deep update) yap.
-                    deep_update(self.style_guide, ai_updated_style_guide)
+                    with self.style_guide_lock:
+                        deep_update(self.style_guide, ai_updated_style_guide)
                     print("DEBUG: Style guide successfully deep-updated from AI.")
                     if progress_callback: progress_callback("log_style_guide_update_success")
                     return # Başarılı olursa döngüden çık
@@ -443,7 +637,492 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                     # Hata durumunda mevcut stil rehberini koru
                     pass
 
-    def translate_section(self, section_data: Dict[str, str], genre: str, characters_json_str: str, cultural_context_json_str: str, main_themes_json_str: str, setting_atmosphere_json_str: str, source_language: str, target_language: str = "en", target_country: str = "US", progress_callback=None, stop_event=None, max_retries=3, retry_delay=5, user_defined_terms: str = "", initial_translation_override: str = None, line_edit_override: str = None, localization_override: str = None, intermediate_callback=None) -> Tuple[Dict[str, str], List[str]]:
+    def queue_style_guide_update(self, original_text: str, translated_text: str, genre: str, characters_data: Dict[str, Any], cultural_context_data: Dict[str, Any], main_themes_data: Dict[str, Any], setting_atmosphere_data: Dict[str, Any], source_language: str, target_language: str, target_country: str, progress_callback=None, max_retries: int = 3, retry_delay: int = 5, stop_event=None):
+        """
+        Toplu (batched) modda, (orijinal, çeviri) çiftini bekleyen stil rehberi güncellemelerine ekler.
+        N bölüm veya M kelime birikince güncelleme arka planda tek bir AI çağrısıyla yapılır;
+        bu sırada çeviri, son onaylanan stil rehberi sürümüyle devam eder.
+        """
+        with self.style_guide_lock:
+            self._pending_style_guide_pairs.append((original_text, translated_text))
+            self._style_guide_batch_context = {
+                "genre": genre, "characters_data": characters_data, "cultural_context_data": cultural_context_data,
+                "main_themes_data": main_themes_data, "setting_atmosphere_data": setting_atmosphere_data,
+                "source_language": source_language, "target_language": target_language, "target_country": target_country,
+                "progress_callback": progress_callback, "max_retries": max_retries, "retry_delay": retry_delay, "stop_event": stop_event
+            }
+            pending_sections = len(self._pending_style_guide_pairs)
+            pending_words = sum(len(original.split()) for original, _ in self._pending_style_guide_pairs)
+            # Kontrol ve başlatma kilit altında yapılır; aynı anda kuyruğa ekleyen iki iş parçacığı iki güncelleme başlatamaz.
+            # Önceki toplu güncelleme hâlâ sürüyorsa çiftler bir sonraki partiye kalır.
+            if (pending_sections >= self.style_guide_batch_sections or pending_words >= self.style_guide_batch_words) and not (
+                self._style_guide_update_thread and self._style_guide_update_thread.is_alive()
+            ):
+                self._style_guide_update_thread = threading.Thread(target=self._run_style_guide_batch_update, daemon=True)
+                self._style_guide_update_thread.start()
+
+        if progress_callback: progress_callback("log_style_guide_batch_queued", sections=pending_sections, words=pending_words)
+
+    def _take_pending_style_guide_pairs(self):
+        """Bekleyen (orijinal, çeviri) çiftlerini ve son bağlamı atomik olarak alır."""
+        with self.style_guide_lock:
+            pairs = self._pending_style_guide_pairs
+            self._pending_style_guide_pairs = []
+            return pairs, dict(self._style_guide_batch_context)
+
+    def _run_style_guide_batch_update(self):
+        """Bekleyen tüm çiftleri tek bir stil rehberi güncelleme çağrısında işler."""
+        pairs, context = self._take_pending_style_guide_pairs()
+        if not pairs or not context:
+            return
+        progress_callback = context.get("progress_callback")
+        if progress_callback: progress_callback("log_style_guide_batch_started", sections=len(pairs))
+
+        original_text = "\n\n".join(f"[{i}]\n{original}" for i, (original, _) in enumerate(pairs, 1))
+        translated_text = "\n\n".join(f"[{i}]\n{translated}" for i, (_, translated) in enumerate(pairs, 1))
+        self.update_style_guide(original_text, translated_text, **context)
+
+    def flush_style_guide_updates(self, progress_callback=None, stop_event=None):
+        """
+        Arka planda süren toplu güncellemenin bitmesini bekler ve kalan çiftleri senkron olarak işler.
+        Çevirinin sonunda çağrılır, böylece son bölümlerden öğrenilenler de stil rehberine yansır.
+        """
+        if self._style_guide_update_thread and self._style_guide_update_thread.is_alive():
+            self._style_guide_update_thread.join()
+        if stop_event and stop_event.is_set():
+            return
+        with self.style_guide_lock:
+            has_pending = bool(self._pending_style_guide_pairs)
+        if has_pending:
+            if progress_callback: progress_callback("log_style_guide_batch_flush")
+            self._run_style_guide_batch_update()
+
+    def consolidate_style_guide(self, section_pairs: List[Tuple[str, str]], genre: str, characters_data: Dict[str, Any], cultural_context_data: Dict[str, Any], main_themes_data: Dict[str, Any], setting_atmosphere_data: Dict[str, Any], source_language: str, target_language: str, target_country: str, progress_callback=None, max_retries: int = 3, retry_delay: int = 5, stop_event=None):
+        """
+        İki geçişli çeviride, tüm bölümlerin (orijinal, çeviri) çiftlerinden birleştirilmiş stil rehberini türetir.
+        Çiftler, toplu güncelleme kelime sınırına göre gruplanır ve her grup tek bir güncelleme çağrısıyla işlenir.
+        """
+        batches = []
+        current_batch = []
+        current_words = 0
+        for original, translated in section_pairs:
+            current_batch.append((original, translated))
+            current_words += len(original.split())
+            if current_words >= self.style_guide_batch_words:
+                batches.append(current_batch)
+                current_batch = []
+                current_words = 0
+        if current_batch:
+            batches.append(current_batch)
+
+        if progress_callback: progress_callback("log_style_guide_consolidation_started", sections=len(section_pairs), batches=len(batches))
+        for batch_index, batch in enumerate(batches, 1):
+            if stop_event and stop_event.is_set():
+                if progress_callback: progress_callback("log_style_guide_generation_stopped")
+                return
+            if progress_callback: progress_callback("log_style_guide_consolidation_batch", current=batch_index, total=len(batches))
+            original_text = "\n\n".join(f"[{i}]\n{original}" for i, (original, _) in enumerate(batch, 1))
+            translated_text = "\n\n".join(f"[{i}]\n{translated}" for i, (_, translated) in enumerate(batch, 1))
+            self.update_style_guide(
+                original_text, translated_text, genre,
+                characters_data, cultural_context_data, main_themes_data, setting_atmosphere_data,
+                source_language, target_language, target_country,
+                progress_callback=progress_callback, max_retries=max_retries, retry_delay=retry_delay, stop_event=stop_event
+            )
+
+    def find_style_guide_violations(self, original_text: str, translated_text: str) -> List[Tuple[str, str]]:
+        """
+        Stil rehberindeki tutarlı terimlerden, orijinal metinde geçtiği halde çeviride
+        rehberdeki karşılığıyla yer almayanları (terim, beklenen çeviri) olarak döndürür.
+        """
+        with self.style_guide_lock:
+            consistent_terms = dict(self.style_guide.get("consistent_terms", {}))
+
+        violations = []
+        original_folded = original_text.casefold()
+        translated_folded = translated_text.casefold()
+        for term, translation in consistent_terms.items():
+            if not term or not isinstance(translation, str) or not translation.strip():
+                continue
+            # Rehberdeki "Karşılık (açıklama)" biçimindeki açıklamaları karşılaştırmaya katma
+            expected = re.sub(r"\s*\(.*\)\s*$", "", translation).strip()
+            if not expected or expected.casefold() == term.casefold():
+                continue
+            if not re.search(r"(?<!\w)" + re.escape(term.casefold()) + r"(?!\w)", original_folded):
+                continue
+            if expected.casefold() not in translated_folded:
+                violations.append((term, expected))
+        return violations
+
+    def harmonize_section(self, original_text: str, translated_text: str, violations: List[Tuple[str, str]], source_language: str, target_language: str, target_country: str, section_type: str = "novel_section", progress_callback=None, max_retries: int = 3, retry_delay: int = 5, stop_event=None) -> str:
+        """
+        Birleştirilmiş stil rehberine uymayan bir bölümü yalnızca listelenen tutarsızlıkları
+        düzeltecek şekilde revize eder. Başarısız olursa mevcut çeviri olduğu gibi döndürülür.
+        """
+        if not violations:
+            return translated_text
+        violations_text = "\n".join(f"- \"{term}\" must be translated as \"{expected}\"" for term, expected in violations)
+        prompt = self.harmonization_prompt.format(
+            source_language=source_language, target_language=target_language, target_country=target_country,
+            style_guide_text=self._format_style_guide_for_prompt(), violations=violations_text,
+            original_section_text=original_text, translated_text=translated_text
+        )
+        logger.debug(f"Uyumlaştırma prompt'u:\n{prompt}")
+
+        for attempt in range(max_retries):
+            if stop_event and stop_event.is_set():
+                if progress_callback: progress_callback("log_translation_stopped")
+                return translated_text
+            try:
+                if progress_callback: progress_callback("log_stage_attempt", stage="Harmonization", type=section_type, attempt=attempt + 1, max_retries=max_retries)
+                harmonized_text = self._generate_stage_text("line_edit", prompt, "Harmonization", progress_callback)
+                if self.ai_model == "chatgpt":
+                    harmonized_text = self._clean_ai_response_fallback(harmonized_text)
+
+                time.sleep(5)
+                if harmonized_text:
+                    return harmonized_text
+                raise ValueError("AI returned an empty harmonized text.")
+            except Exception as e:
+                try:
+                    self._handle_translation_error(e, "Harmonization", section_type, attempt, max_retries, retry_delay, progress_callback)
+                except Exception:
+                    return translated_text
+        return translated_text
+
+    def translate_terms(self, candidates: List[Dict[str, Any]], genre: str, source_language: str, target_language: str, target_country: str, progress_callback=None, max_retries: int = 3, retry_delay: int = 5, stop_event=None) -> Dict[str, str]:
+        """
+        Yerel olarak çıkarılan aday terimleri (term_extraction.extract_candidate_terms) tek bir istekte çevirir
+        ve {terim: çeviri} döndürür. Yapay zekanın gereksiz bulup atladığı adaylar sonuçta yer almaz.
+        Başarısız olursa boş sözlük döner.
+        """
+        if not candidates:
+            return {}
+        terms_text = "\n".join(f"- {candidate['term']} ({candidate['kind']}, {candidate['count']}x)" for candidate in candidates)
+        prompt = self.term_translation_prompt.format(
+            genre=genre, source_language=source_language, target_language=target_language,
+            target_country=target_country, terms=terms_text
+        )
+        logger.debug(f"Terim çevirisi prompt'u:\n{prompt}")
+        known_terms = {candidate["term"] for candidate in candidates}
+
+        for attempt in range(max_retries):
+            if stop_event and stop_event.is_set():
+                return {}
+            try:
+                if progress_callback: progress_callback("log_stage_attempt", stage="Term Translation", type="glossary", attempt=attempt + 1, max_retries=max_retries)
+                raw_response_text = self._generate_stage_text("style_guide", prompt, "Term Translation", progress_callback)
+                raw_response_text = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw_response_text.strip())
+                translations = json5.loads(raw_response_text)
+                if not isinstance(translations, dict):
+                    raise ValueError("error_ai_empty_response")
+                return {term: translation.strip() for term, translation in translations.items()
+                        if term in known_terms and isinstance(translation, str) and translation.strip()}
+            except Exception as e:
+                logger.error(f"Terim çevirisi hatası (Deneme {attempt + 1}/{max_retries}): {str(e)}", exc_info=True)
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+        return {}
+
+    def seed_consistent_terms(self, translations: Dict[str, str]) -> int:
+        """
+        Çevrilen terimleri stil rehberinin tutarlı terimlerine ekler; rehberde zaten olan terimlere dokunulmaz.
+        Eklenen terim sayısını döndürür.
+        """
+        added = 0
+        with self.style_guide_lock:
+            consistent_terms = self.style_guide.setdefault("consistent_terms", {})
+            for term, translation in translations.items():
+                if term not in consistent_terms:
+                    consistent_terms[term] = translation
+                    added += 1
+        return added
+
+    def _format_style_guide_for_prompt(self) -> str:
+        """
+        Stil rehberini prompt için düz metin olarak biçimlendirir.
+        Kilit altında okunur, böylece arka plandaki güncelleme yarım kalmış bir sürümü göstermez.
+        """
+        with self.style_guide_lock:
+            style_guide_text = "Tone: {}\n".format(self.style_guide.get("tone", "Belirtilmemiş"))
+            style_guide_text += "Dialogue Style: {}\n".format(self.style_guide.get("dialogue_style", "Belirtilmemiş"))
+            style_guide_text += "Description Style: {}\n".format(self.style_guide.get("description_style", "Belirtilmemiş"))
+            style_guide_text += "Thought Style: {}\n".format(self.style_guide.get("thought_style", "Belirtilmemiş"))
+
+            if self.style_guide["character_voices"]:
+                style_guide_text += "\nCharacter Voices:\n"
+                for char, voice in self.style_guide["character_voices"].items():
+                    speech_patterns = ", ".join(voice.get("speech_patterns", []) if isinstance(voice.get("speech_patterns"), list) else [])
+                    formality = voice.get("formality", "nötr")
+                    vocabulary = voice.get("vocabulary", "standart")
+                    style_guide_text += f"- {char}: Resmiyet: {formality}, Kelime Dağarcığı: {vocabulary}, Konuşma Tarzı: [{speech_patterns}]\n"
+
+            if self.style_guide["consistent_terms"]:
+                style_guide_text += "\nConsistent Terms:\n"
+                for term, translation in self.style_guide["consistent_terms"].items():
+                    style_guide_text += f"- {term}: {translation if translation else 'Çevrilmemiş'}\n"
+
+            if self.style_guide["cultural_references"]:
+                style_guide_text += "\nCultural References:\n"
+                for ref, approach in self.style_guide["cultural_references"].items():
+                    style_guide_text += f"- {ref}: {approach if approach else 'Yaklaşım Belirtilmemiş'}\n"
+
+        return style_guide_text
+
+    def translate_section(self, section_data: Dict[str, str], genre: str, characters_json_str: str, cultural_context_json_str: str, main_themes_json_str: str, setting_atmosphere_json_str: str, source_language: str, target_language: str = "en", target_country: str = "US", progress_callback=None, stop_event=None, max_retries=3, retry_delay=5, user_defined_terms: str = "", initial_translation_override: str = None, line_edit_override: str = None, localization_override: str = None, intermediate_callback=None, update_style_guide: bool = True, pipeline_profile: str = "full", repeated_paragraphs: Dict[str, str] = None, section_index: int = None) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+        """
+        Bölümü çeviri aşamalarından geçirir.
+        Yalnızca ayraç, sayı veya "Chapter N" başlığından oluşan bölümler API çağrısı yapılmadan yerel olarak çevrilir.
+        Kaynak dili hedef dille aynı olan bölümler same_language_mode ayarına göre aynen geçirilir veya yalnızca düzenlenir.
+        repeated_paragraphs (normalize edilmiş paragraf -> çeviri) verilirse, bölümdeki tekrarlanan paragraflar önceden
+        çevrilmiş halleriyle işaretlenir ve çıktıda aynen geri konur. Model bir işareti kaybederse bölüm işaretsiz yeniden çevrilir.
+        section_index, aşama geçmişindeki kayıtların hangi bölüme ait olduğunu gösterir (paralel çeviride kayıtlar karışık gelir).
+        """
+        kwargs = dict(
+            genre=genre, characters_json_str=characters_json_str, cultural_context_json_str=cultural_context_json_str,
+            main_themes_json_str=main_themes_json_str, setting_atmosphere_json_str=setting_atmosphere_json_str,
+            source_language=source_language, target_language=target_language, target_country=target_country,
+            progress_callback=progress_callback, stop_event=stop_event, max_retries=max_retries, retry_delay=retry_delay,
+            user_defined_terms=user_defined_terms, initial_translation_override=initial_translation_override,
+            line_edit_override=line_edit_override, localization_override=localization_override,
+            intermediate_callback=intermediate_callback, update_style_guide=update_style_guide, pipeline_profile=pipeline_profile,
+            section_index=section_index
+        )
+        has_overrides = bool(initial_translation_override or line_edit_override or localization_override)
+        is_same_language = not has_overrides and self.same_language_mode != "translate" and same_language(source_language, target_language)
+        if is_same_language and self.same_language_mode == "pass_through":
+            local_translation, stage_name = section_data["text"], "Local (already in target language)"
+            if progress_callback: progress_callback("log_section_same_language", type=section_data["type"], language=source_language)
+        else:
+            local_translation, stage_name = None if has_overrides else translate_trivial_section(section_data["text"], target_language), "Local (no API call)"
+            if local_translation is not None and progress_callback:
+                progress_callback("log_section_translated_locally", type=section_data["type"])
+        if local_translation is not None:
+            section_type = section_data["type"]
+            stages = []
+            self._record_stage(stages, stage_name, "localized_text", section_type, local_translation, section_index)
+            if intermediate_callback:
+                for stage_key in ("initial", "edited", "final"):
+                    intermediate_callback(stage_key, local_translation)
+            return {
+                "initial": local_translation, "edited": local_translation, "final": local_translation, "back_translation": "",
+                "qa": {"score": 1.0, "issues": [], "severe": False}
+            }, stages
+        if is_same_language:
+            # Yalnızca satır düzenlemesi; tekrarlanan paragrafların çevirileri bu bölüme uygulanmaz
+            if progress_callback: progress_callback("log_section_same_language_edit", type=section_data["type"], language=source_language)
+            kwargs["pipeline_profile"] = "edit_only"
+            return self._translate_section_with_safety_split(section_data, **kwargs)
+        if repeated_paragraphs and not has_overrides:
+            section_type = section_data["type"]
+            masked_text, replacements = mask_repeated_paragraphs(section_data["text"], repeated_paragraphs)
+            if replacements:
+                if progress_callback: progress_callback("log_repeated_paragraphs_reused", type=section_type, count=len(replacements))
+
+                def restore(text):
+                    return restore_repeated_paragraphs(text, replacements)[0]
+
+                if intermediate_callback:
+                    kwargs["intermediate_callback"] = lambda stage, text: intermediate_callback(stage, restore(text))
+                results, stages = self._translate_section_with_safety_split({"text": masked_text, "type": section_type}, **kwargs)
+                if not isinstance(results, dict) or not results.get("final"):
+                    return results, stages
+                final_translation, missing = restore_repeated_paragraphs(results["final"], replacements)
+                if not missing:
+                    results["final"] = final_translation
+                    for key in ("initial", "edited"):
+                        if results.get(key):
+                            results[key] = restore(results[key])
+                    return results, stages
+                if progress_callback: progress_callback("log_repeated_paragraphs_lost", type=section_type, missing=missing)
+                kwargs["intermediate_callback"] = intermediate_callback
+        return self._translate_section_with_safety_split(section_data, **kwargs)
+
+    def translate_repeated_paragraphs(self, paragraphs: List[str], max_tokens: int, genre: str, characters_json_str: str, cultural_context_json_str: str, main_themes_json_str: str, setting_atmosphere_json_str: str, source_language: str, target_language: str = "en", target_country: str = "US", progress_callback=None, stop_event=None, max_retries=3, user_defined_terms: str = "", pipeline_profile: str = "full") -> Dict[str, str]:
+        """
+        Romanda birden çok kez geçen paragrafları bir kez çevirir ve normalize paragraf -> çeviri sözlüğü döndürür.
+        Paragraflar "[[P<n>]]" satırlarıyla numaralanıp bölüm boyutunda partiler hâlinde çevrilir;
+        numarası çıktıda bulunamayan paragraf sözlüğe girmez ve bulunduğu bölümlerde normal şekilde çevrilir.
+        Bir parti çevrilemezse (kota, ağ, kalite kontrolü) o partinin paragrafları da sözlüğe girmez; kalan partiler çevrilir.
+        """
+        batches = pack_texts(paragraphs, max_tokens)
+        translations = {}
+        for batch_index, batch in enumerate(batches, 1):
+            if stop_event and stop_event.is_set():
+                break
+            if progress_callback: progress_callback("log_repeated_paragraphs_batch", current=batch_index, total=len(batches), paragraphs=len(batch))
+            batch_paragraphs = [paragraphs[i] for i in batch]
+            try:
+                results = self.translate_section_batch(
+                    batch_paragraphs, genre, characters_json_str, cultural_context_json_str, main_themes_json_str, setting_atmosphere_json_str,
+                    source_language, target_language, target_country, progress_callback=progress_callback, stop_event=stop_event,
+                    max_retries=max_retries, user_defined_terms=user_defined_terms, pipeline_profile=pipeline_profile
+                )
+            except Exception as e:
+                logger.error(f"Tekrarlanan paragraf partisi {batch_index}/{len(batches)} çevrilemedi: {e}", exc_info=True)
+                if progress_callback: progress_callback("log_repeated_paragraphs_batch_failed", current=batch_index, total=len(batches), error=str(e))
+                continue
+            for paragraph, result in zip(batch_paragraphs, results):
+                if result:
+                    translations[normalize_paragraph(paragraph)] = result["final"]
+        return translations
+
+    def translate_section_batch(self, texts: List[str], genre: str, characters_json_str: str, cultural_context_json_str: str, main_themes_json_str: str, setting_atmosphere_json_str: str, source_language: str, target_language: str = "en", target_country: str = "US", section_type: str = "novel_section", progress_callback=None, stop_event=None, max_retries=3, user_defined_terms: str = "", pipeline_profile: str = "full") -> List[Dict[str, str] | None]:
+        """
+        Birden çok kısa metni "[[P<n>]]" satırlarıyla ayrılmış tek bir bölüm olarak çevirir ve her aşamanın çıktısını
+        metinlere geri dağıtır; bağlam bloğu (karakterler, stil rehberi, talimatlar) her metin için ayrı gönderilmez.
+        İşareti son çıktıda bulunamayan metin için None döner; çağıran o metni ayrıca çevirir.
+        """
+        batch_text = "\n\n".join(f"[[P{i}]]\n{text}" for i, text in enumerate(texts, 1))
+        results, _ = self.translate_section(
+            {"text": batch_text, "type": section_type}, genre,
+            characters_json_str, cultural_context_json_str, main_themes_json_str, setting_atmosphere_json_str,
+            source_language, target_language, target_country, progress_callback=progress_callback, stop_event=stop_event,
+            max_retries=max_retries, user_defined_terms=user_defined_terms, update_style_guide=False, pipeline_profile=pipeline_profile
+        )
+        if not isinstance(results, dict):
+            return [None] * len(texts)
+        stage_pieces = {key: self._split_marked_text(results.get(key, "")) for key in ("initial", "edited", "final")}
+        batch_results = []
+        for index in range(len(texts)):
+            final_translation = stage_pieces["final"].get(index)
+            if not final_translation:
+                batch_results.append(None)
+                continue
+            batch_results.append({
+                "initial": stage_pieces["initial"].get(index, ""), "edited": stage_pieces["edited"].get(index, ""),
+                "final": final_translation, "back_translation": ""
+            })
+        return batch_results
+
+    @staticmethod
+    def _split_marked_text(text: str) -> Dict[int, str]:
+        """"[[P<n>]]" ayraçlarıyla bölünmüş metni {n-1: parça} sözlüğüne ayırır; aynı numara tekrarlanırsa ilk parça alınır."""
+        pieces = BATCH_MARKER.split(text or "")
+        split_pieces = {}
+        for number, piece in zip(pieces[1::2], pieces[2::2]):
+            if piece.strip():
+                split_pieces.setdefault(int(number) - 1, piece.strip())
+        return split_pieces
+
+    def _translate_section_with_safety_split(self, section_data: Dict[str, str], genre: str, characters_json_str: str, cultural_context_json_str: str, main_themes_json_str: str, setting_atmosphere_json_str: str, source_language: str, target_language: str = "en", target_country: str = "US", progress_callback=None, stop_event=None, max_retries=3, retry_delay=5, user_defined_terms: str = "", initial_translation_override: str = None, line_edit_override: str = None, localization_override: str = None, intermediate_callback=None, update_style_guide: bool = True, pipeline_profile: str = "full", split_depth: int = 0, section_index: int = None, section_part: str = "") -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+        """
+        Bir aşama güvenlik filtresine takılırsa bölüm aynı içerikle yeniden denenmez; paragraf gruplarına
+        ikiye bölünerek parça parça çevrilir ve birleştirilir. Tek başına engellenen paragraf orijinal haliyle bırakılıp
+        kalite raporunda ciddi sorun olarak işaretlenir. Parçaların aşama kayıtları section_part ile ("1", "2.1" gibi) ayrılır.
+        Devam isteklerine rağmen kesik kalan çıktı (TruncatedOutputError) da aynı şekilde bölünerek yeniden çevrilir;
+        artık bölünemeyen parçada hata yükseltilir ve bölüm başarısız sayılır.
+        Kullanıcının verdiği aşama çıktıları (override) kaynakla aynı paragraf sayısına sahipse parçalara bölünerek aktarılır;
+        hizalanamıyorsa bölüm bölünmez, verilen aşamalar korunup son başarılı aşamanın sonucu döndürülür.
+        """
+        try:
+            return self._translate_section_pipeline(
+                section_data, genre, characters_json_str, cultural_context_json_str, main_themes_json_str, setting_atmosphere_json_str,
+                source_language, target_language, target_country, progress_callback=progress_callback, stop_event=stop_event,
+                max_retries=max_retries, retry_delay=retry_delay, user_defined_terms=user_defined_terms,
+                initial_translation_override=initial_translation_override, line_edit_override=line_edit_override,
+                localization_override=localization_override, intermediate_callback=intermediate_callback,
+                update_style_guide=update_style_guide, pipeline_profile=pipeline_profile,
+                section_index=section_index, section_part=section_part
+            )
+        except (SafetyBlockError, TruncatedOutputError) as e:
+            section_type = section_data["type"]
+            paragraphs = [p.strip() for p in re.split(r'\n\s*\n', section_data["text"]) if p.strip()]
+            if len(paragraphs) < 2 or split_depth >= self.safety_split_max_depth:
+                if isinstance(e, TruncatedOutputError):
+                    raise
+                # Engellenen içerik yalnız kaldı: çevrilmeden bırakılır, diğer parçaların çevirisi korunur
+                blocked_text = section_data["text"].strip()
+                if progress_callback: progress_callback("log_safety_block_isolated", type=section_type, preview=blocked_text[:80])
+                stages = []
+                self._record_stage(stages, "Safety Block (left untranslated)", "text", section_type, blocked_text, section_index, section_part)
+                # Kullanıcının verdiği aşama çıktıları engellenen aşamadan öncedir; bunlar korunur
+                initial = initial_translation_override or blocked_text
+                edited = line_edit_override or initial
+                final = localization_override or edited
+                result = {"initial": initial, "edited": edited, "final": final, "back_translation": "", "blocked_paragraphs": [blocked_text]}
+                if split_depth == 0:
+                    # Bölümün tamamı engellendi: birleştirme yolu olmadığından kalite raporu burada ciddi olarak işaretlenir
+                    result["qa"] = {"score": 0.0, "issues": self._safety_block_issues([blocked_text]), "severe": True}
+                return result, stages
+
+            overrides = {
+                "initial_translation_override": initial_translation_override, "line_edit_override": line_edit_override,
+                "localization_override": localization_override
+            }
+            override_paragraphs = {
+                name: [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()] for name, text in overrides.items() if text
+            }
+            # Bölüm tamamlanamazsa döndürülecek sonuç: verilen aşamalar korunur
+            incomplete_result = {
+                "initial": initial_translation_override or "", "edited": line_edit_override or "",
+                "final": localization_override or "", "back_translation": ""
+            }
+            if any(len(parts) != len(paragraphs) for parts in override_paragraphs.values()):
+                # Verilen aşama çıktıları kaynağın paragraflarıyla eşleşmiyor: parçalar bunlarsız yeniden çevrilmez
+                if progress_callback: progress_callback("log_safety_block_overrides_unaligned", type=section_type)
+                return incomplete_result, []
+
+            middle = len(paragraphs) // 2
+            if progress_callback:
+                split_message = "log_truncated_output_splitting" if isinstance(e, TruncatedOutputError) else "log_safety_block_splitting"
+                progress_callback(split_message, type=section_type, paragraphs=len(paragraphs), depth=split_depth + 1)
+            part_results = []
+            stages = []
+            for part_number, part_paragraphs in enumerate((paragraphs[:middle], paragraphs[middle:]), 1):
+                part_slice = slice(0, middle) if part_number == 1 else slice(middle, None)
+                part_overrides = {name: "\n\n".join(parts[part_slice]) for name, parts in override_paragraphs.items()}
+                # Parçalar kendi başına stil rehberini güncellemez ve arayüze yarım metin göndermez; bu işler birleşik metinle yapılır
+                part_result, part_stages = self._translate_section_with_safety_split(
+                    {"text": "\n\n".join(part_paragraphs), "type": section_type}, genre,
+                    characters_json_str, cultural_context_json_str, main_themes_json_str, setting_atmosphere_json_str,
+                    source_language, target_language, target_country, progress_callback=progress_callback, stop_event=stop_event,
+                    max_retries=max_retries, retry_delay=retry_delay, user_defined_terms=user_defined_terms, **part_overrides,
+                    update_style_guide=False, pipeline_profile=pipeline_profile, split_depth=split_depth + 1,
+                    section_index=section_index, section_part=f"{section_part}.{part_number}" if section_part else str(part_number)
+                )
+                stages.extend(part_stages)
+                if not isinstance(part_result, dict) or not part_result.get("final"):
+                    return incomplete_result, stages
+                part_results.append(part_result)
+
+            merged = {key: "\n\n".join(part[key] for part in part_results) for key in ("initial", "edited", "final")}
+            blocked_paragraphs = [p for part in part_results for p in part.get("blocked_paragraphs", [])]
+            if split_depth > 0:
+                merged.update({"back_translation": "", "blocked_paragraphs": blocked_paragraphs})
+                return merged, stages
+
+            # En üst seviye: birleşik metin tek bir bölüm çevirisi gibi sonlandırılır
+            if intermediate_callback:
+                for stage_key in ("initial", "edited", "final"):
+                    intermediate_callback(stage_key, merged[stage_key])
+            parsed_context = []
+            for json_str in (characters_json_str, cultural_context_json_str, main_themes_json_str, setting_atmosphere_json_str):
+                try:
+                    parsed_context.append(json.loads(json_str) if json_str else {})
+                except json.JSONDecodeError:
+                    parsed_context.append({})
+            translation_results, stages = self._finalize_section_translation(
+                section_data["text"], section_type, merged["initial"], merged["edited"], merged["final"], stages,
+                genre, *parsed_context, source_language, target_language, target_country,
+                progress_callback=progress_callback, stop_event=stop_event, max_retries=max_retries,
+                update_style_guide=update_style_guide, user_defined_terms=user_defined_terms
+            )
+            if blocked_paragraphs:
+                translation_results["blocked_paragraphs"] = blocked_paragraphs
+                translation_results["qa"]["severe"] = True
+                translation_results["qa"]["issues"].extend(self._safety_block_issues(blocked_paragraphs))
+            return translation_results, stages
+
+    @staticmethod
+    def _safety_block_issues(blocked_paragraphs: List[str]) -> List[Dict[str, str]]:
+        """Çevrilmeden bırakılan (güvenlik filtresine takılan) paragraflar için ciddi kalite sorunları."""
+        return [
+            {"check": "safety_block", "severity": "severe", "detail": f"Left untranslated (blocked by safety filter): {p[:80]}"}
+            for p in blocked_paragraphs
+        ]
+
+    def _translate_section_pipeline(self, section_data: Dict[str, str], genre: str, characters_json_str: str, cultural_context_json_str: str, main_themes_json_str: str, setting_atmosphere_json_str: str, source_language: str, target_language: str = "en", target_country: str = "US", progress_callback=None, stop_event=None, max_retries=3, retry_delay=5, user_defined_terms: str = "", initial_translation_override: str = None, line_edit_override: str = None, localization_override: str = None, intermediate_callback=None, update_style_guide: bool = True, pipeline_profile: str = "full", section_index: int = None, section_part: str = "") -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
         original_section_text = section_data["text"]
         section_type = section_data["type"]
         stages = []
@@ -458,9 +1137,9 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         parsed_characters = {}
         if characters_json_str:
             try:
-                parsed_characters = json5.loads(characters_json_str)
+                parsed_characters = json.loads(characters_json_str)
                 print("DEBUG: Successfully parsed characters JSON")
-            except json5.Json5Error as e: # json.JSONDecodeError yerine json5.Json5Error kullanıldı
+            except json.JSONDecodeError as e:
                 print(f"Karakter bilgileri parse hatası: {e}")
                 print(f"Problematic JSON string: {characters_json_str}")
 
@@ -468,24 +1147,24 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         parsed_cultural_context = {}
         if cultural_context_json_str:
             try:
-                parsed_cultural_context = json5.loads(cultural_context_json_str)
-            except json5.Json5Error as e: # json.JSONDecodeError yerine json5.Json5Error kullanıldı
+                parsed_cultural_context = json.loads(cultural_context_json_str)
+            except json.JSONDecodeError as e:
                 print(f"Kültürel bağlam bilgileri parse hatası: {e}")
 
         # Ana temalar ve motifler bilgilerini JSON string'den parse et
         parsed_main_themes = {}
         if main_themes_json_str:
             try:
-                parsed_main_themes = json5.loads(main_themes_json_str)
-            except json5.Json5Error as e: # json.JSONDecodeError yerine json5.Json5Error kullanıldı
+                parsed_main_themes = json.loads(main_themes_json_str)
+            except json.JSONDecodeError as e:
                 print(f"Ana temalar ve motifler bilgileri parse hatası: {e}")
 
         # Ortam ve atmosfer bilgilerini JSON string'den parse et
         parsed_setting_atmosphere = {}
         if setting_atmosphere_json_str:
             try:
-                parsed_setting_atmosphere = json5.loads(setting_atmosphere_json_str)
-            except json5.Json5Error as e: # json.JSONDecodeError yerine json5.Json5Error kullanıldı
+                parsed_setting_atmosphere = json.loads(setting_atmosphere_json_str)
+            except json.JSONDecodeError as e:
                 print(f"Ortam ve atmosfer bilgileri parse hatası: {e}")
 
         # Stil rehberini AI ile oluştur (sadece bir kez, ilk çeviri çağrısında veya analizden sonra)
@@ -496,28 +1175,7 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         #    pass
 
         # Format style guide as text instead of JSON
-        style_guide_text = "Tone: {}\n".format(self.style_guide.get("tone", "Belirtilmemiş"))
-        style_guide_text += "Dialogue Style: {}\n".format(self.style_guide.get("dialogue_style", "Belirtilmemiş"))
-        style_guide_text += "Description Style: {}\n".format(self.style_guide.get("description_style", "Belirtilmemiş"))
-        style_guide_text += "Thought Style: {}\n".format(self.style_guide.get("thought_style", "Belirtilmemiş"))
-
-        if self.style_guide["character_voices"]:
-            style_guide_text += "\nCharacter Voices:\n"
-            for char, voice in self.style_guide["character_voices"].items():
-                speech_patterns = ", ".join(voice.get("speech_patterns", []) if isinstance(voice.get("speech_patterns"), list) else [])
-                formality = voice.get("formality", "nötr")
-                vocabulary = voice.get("vocabulary", "standart")
-                style_guide_text += f"- {char}: Resmiyet: {formality}, Kelime Dağarcığı: {vocabulary}, Konuşma Tarzı: [{speech_patterns}]\n"
-
-        if self.style_guide["consistent_terms"]:
-            style_guide_text += "\nConsistent Terms:\n"
-            for term, translation in self.style_guide["consistent_terms"].items():
-                style_guide_text += f"- {term}: {translation if translation else 'Çevrilmemiş'}\n"
-
-        if self.style_guide["cultural_references"]:
-            style_guide_text += "\nCultural References:\n"
-            for ref, approach in self.style_guide["cultural_references"].items():
-                style_guide_text += f"- {ref}: {approach if approach else 'Yaklaşım Belirtilmemiş'}\n"
+        style_guide_text = self._format_style_guide_for_prompt()
 
         # Debug için style guide'ı yazdır
         print("DEBUG: Style Guide before prompt formatting:")
@@ -533,11 +1191,70 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         line_edited = ""
         final_translation = ""
 
+        # Hızlı profil: üç aşama tek bir yapılandırılmış prompt ile yapılır.
+        # Kullanıcı aşama metinlerinden birini sağladıysa tam profile dönülür, böylece o aşamalar atlanabilir.
+        if pipeline_profile == "fast" and not (initial_translation_override or line_edit_override or localization_override):
+            for attempt in range(max_retries):
+                if stop_event and stop_event.is_set():
+                    if progress_callback: progress_callback("log_translation_stopped")
+                    return {"initial": "", "edited": "", "final": "", "back_translation": ""}, stages
+                try:
+                    if progress_callback: progress_callback("log_stage_attempt", stage="Fast Translation", type=section_type, attempt=attempt + 1, max_retries=max_retries)
+                    mandatory_terms_section = ""
+                    if user_defined_terms and user_defined_terms.strip():
+                        mandatory_terms_section = f"MANDATORY TRANSLATIONS:\nThe following terms MUST be translated exactly as specified, overriding any other suggestions.\n{user_defined_terms}\n"
+                    fast_prompt = self.fast_translation_prompt.format(
+                        source_language=source_language, target_language=target_language, target_country=target_country,
+                        mandatory_terms_section=mandatory_terms_section, original_section_text=original_section_text,
+                        formatted_characters_for_prompt=formatted_characters_for_prompt,
+                        formatted_cultural_context_for_prompt=formatted_cultural_context_for_prompt,
+                        formatted_themes_motifs_for_prompt=formatted_themes_motifs_for_prompt,
+                        formatted_setting_atmosphere_for_prompt=formatted_setting_atmosphere_for_prompt,
+                        genre=genre, style_guide_text=style_guide_text
+                    )
+                    fast_prompt = self._with_marker_instructions(fast_prompt, original_section_text)
+                    logger.debug(f"Hızlı çeviri prompt'u:\n{fast_prompt}")
+                    final_translation = self._generate_stage_text("initial_translation", fast_prompt, "Fast Translation", progress_callback)
+
+                    self._run_stage_qa("Fast Translation", original_section_text, final_translation, source_language, target_language, user_defined_terms, parsed_characters, attempt, max_retries, progress_callback)
+                    time.sleep(5)
+                    print(f"DEBUG: Extracted fast translation: {final_translation[:200]}...")
+                    self._record_stage(stages, "Fast Translation", "localized_text", section_type, final_translation, section_index, section_part)
+                    if intermediate_callback:
+                        intermediate_callback("final", final_translation)
+                    break # Success
+                except Exception as e:
+                    self._handle_translation_error(e, "Fast Translation", section_type, attempt, max_retries, retry_delay, progress_callback)
+                    if attempt >= max_retries - 1:
+                        return {"initial": "", "edited": "", "final": "", "back_translation": ""}, stages
+
+            if not final_translation:
+                return {"initial": "", "edited": "", "final": "", "back_translation": ""}, stages
+            if stop_event and stop_event.is_set():
+                if progress_callback: progress_callback("Translation stopped by user.\n")
+                return {"initial": final_translation, "edited": final_translation, "final": final_translation, "back_translation": ""}, stages
+
+            # Aşama sekmeleri boş kalmasın diye tek çağrının sonucu her üç aşamaya da yazılır
+            return self._finalize_section_translation(
+                original_section_text, section_type, final_translation, final_translation, final_translation, stages,
+                genre, parsed_characters, parsed_cultural_context, parsed_main_themes, parsed_setting_atmosphere,
+                source_language, target_language, target_country,
+                progress_callback=progress_callback, stop_event=stop_event, max_retries=max_retries,
+                intermediate_callback=intermediate_callback, update_style_guide=update_style_guide,
+                user_defined_terms=user_defined_terms
+            )
+
         # Stage 1: Initial Translation
         if initial_translation_override:
             initial_translation = initial_translation_override
             if progress_callback: progress_callback("log_initial_translation_skipped")
-            stages.append(f"Initial Translation (Skipped, User-provided):\n{initial_translation}\n")
+            self._record_stage(stages, "Initial Translation (Skipped, User-provided)", "initial_translation_text", section_type, initial_translation, section_index, section_part)
+        elif pipeline_profile == "edit_only":
+            # Bölüm zaten hedef dilde: çeviri yapılmaz, metin doğrudan satır düzenlemesine gider
+            initial_translation = original_section_text
+            self._record_stage(stages, "Initial Translation (Skipped, already in target language)", "initial_translation_text", section_type, initial_translation, section_index, section_part)
+            if intermediate_callback:
+                intermediate_callback("initial", initial_translation)
         else:
             for attempt in range(max_retries):
                 if stop_event and stop_event.is_set():
@@ -557,19 +1274,15 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                         formatted_setting_atmosphere_for_prompt=formatted_setting_atmosphere_for_prompt,
                         genre=genre, style_guide_text=style_guide_text
                     )
-                    if self.ai_model == "gemini":
-                        logger.debug(f"İlk çeviri prompt'u:\n{initial_prompt}")
-                        initial_response = self.model.generate_content(initial_prompt, safety_settings=self.safety_settings)
-                        initial_translation = self._extract_response_text(initial_response, "Initial Translation", progress_callback)
-                        logger.debug(f"Ham ilk çeviri yanıtı:\n{initial_translation}")
-                    elif self.ai_model == "chatgpt":
-                        if not self.model: raise ValueError("error_openai_model_not_set_up")
-                        initial_response = openai.chat.completions.create(model=self.model, messages=[{"role": "user", "content": initial_prompt}])
-                        initial_translation = initial_response.choices[0].message.content.strip()
+                    initial_prompt = self._with_marker_instructions(initial_prompt, original_section_text)
+                    logger.debug(f"İlk çeviri prompt'u:\n{initial_prompt}")
+                    initial_translation = self._generate_stage_text("initial_translation", initial_prompt, "Initial Translation", progress_callback)
+                    logger.debug(f"Ham ilk çeviri yanıtı:\n{initial_translation}")
                     
+                    self._run_stage_qa("Initial Translation", original_section_text, initial_translation, source_language, target_language, user_defined_terms, parsed_characters, attempt, max_retries, progress_callback)
                     time.sleep(5)
                     print(f"DEBUG: Extracted initial translation: {initial_translation[:200]}...")
-                    stages.append(f"Initial Translation:\n{initial_translation}\n")
+                    self._record_stage(stages, "Initial Translation", "initial_translation_text", section_type, initial_translation, section_index, section_part)
                     if intermediate_callback:
                         intermediate_callback("initial", initial_translation)
                     break  # Success, exit retry loop for this stage
@@ -588,7 +1301,7 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         if line_edit_override:
             line_edited = line_edit_override
             if progress_callback: progress_callback("log_line_edit_skipped")
-            stages.append(f"Line Editing (Skipped, User-provided):\n{line_edited}\n")
+            self._record_stage(stages, "Line Editing (Skipped, User-provided)", "line_edited_text", section_type, line_edited, section_index, section_part)
         else:
             for attempt in range(max_retries):
                 if stop_event and stop_event.is_set():
@@ -605,19 +1318,15 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                         formatted_setting_atmosphere_for_prompt=formatted_setting_atmosphere_for_prompt,
                         genre=genre, initial_translation=initial_translation, style_guide_text=style_guide_text
                     )
-                    if self.ai_model == "gemini":
-                        logger.debug(f"Satır düzenleme prompt'u:\n{line_edit_prompt}")
-                        line_edit_response = self.model.generate_content(line_edit_prompt, safety_settings=self.safety_settings)
-                        line_edited = self._extract_response_text(line_edit_response, "Line Editing", progress_callback)
-                        logger.debug(f"Ham satır düzenleme yanıtı:\n{line_edited}")
-                    elif self.ai_model == "chatgpt":
-                        if not self.model: raise ValueError("error_openai_model_not_set_up")
-                        line_edit_response = openai.chat.completions.create(model=self.model, messages=[{"role": "user", "content": line_edit_prompt}])
-                        line_edited = line_edit_response.choices[0].message.content.strip()
+                    line_edit_prompt = self._with_marker_instructions(line_edit_prompt, original_section_text)
+                    logger.debug(f"Satır düzenleme prompt'u:\n{line_edit_prompt}")
+                    line_edited = self._generate_stage_text("line_edit", line_edit_prompt, "Line Editing", progress_callback)
+                    logger.debug(f"Ham satır düzenleme yanıtı:\n{line_edited}")
                     
+                    self._run_stage_qa("Line Editing", original_section_text, line_edited, source_language, target_language, user_defined_terms, parsed_characters, attempt, max_retries, progress_callback)
                     time.sleep(5)
                     print(f"DEBUG: Extracted line edit translation: {line_edited[:200]}...")
-                    stages.append(f"Line Editing:\n{line_edited}\n")
+                    self._record_stage(stages, "Line Editing", "line_edited_text", section_type, line_edited, section_index, section_part)
                     if intermediate_callback:
                         intermediate_callback("edited", line_edited)
                     break # Success
@@ -636,7 +1345,12 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         if localization_override:
             final_translation = localization_override
             if progress_callback: progress_callback("log_localization_skipped")
-            stages.append(f"Cultural Localization (Skipped, User-provided):\n{final_translation}\n")
+            self._record_stage(stages, "Cultural Localization (Skipped, User-provided)", "localized_text", section_type, final_translation, section_index, section_part)
+        elif pipeline_profile == "edit_only":
+            final_translation = line_edited
+            self._record_stage(stages, "Cultural Localization (Skipped, already in target language)", "localized_text", section_type, final_translation, section_index, section_part)
+            if intermediate_callback:
+                intermediate_callback("final", final_translation)
         else:
             for attempt in range(max_retries):
                 if stop_event and stop_event.is_set():
@@ -653,19 +1367,15 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                         formatted_setting_atmosphere_for_prompt=formatted_setting_atmosphere_for_prompt,
                         genre=genre, line_edited=line_edited, style_guide_text=style_guide_text
                     )
-                    if self.ai_model == "gemini":
-                        logger.debug(f"Kültürel yerelleştirme prompt'u:\n{cultural_prompt}")
-                        cultural_response = self.model.generate_content(cultural_prompt, safety_settings=self.safety_settings)
-                        final_translation = self._extract_response_text(cultural_response, "Cultural Localization", progress_callback)
-                        logger.debug(f"Ham kültürel yerelleştirme yanıtı:\n{final_translation}")
-                    elif self.ai_model == "chatgpt":
-                        if not self.model: raise ValueError("error_openai_model_not_set_up")
-                        cultural_response = openai.chat.completions.create(model=self.model, messages=[{"role": "user", "content": cultural_prompt}])
-                        final_translation = cultural_response.choices[0].message.content.strip()
+                    cultural_prompt = self._with_marker_instructions(cultural_prompt, original_section_text)
+                    logger.debug(f"Kültürel yerelleştirme prompt'u:\n{cultural_prompt}")
+                    final_translation = self._generate_stage_text("cultural_localization", cultural_prompt, "Cultural Localization", progress_callback)
+                    logger.debug(f"Ham kültürel yerelleştirme yanıtı:\n{final_translation}")
                     
+                    self._run_stage_qa("Cultural Localization", original_section_text, final_translation, source_language, target_language, user_defined_terms, parsed_characters, attempt, max_retries, progress_callback)
                     time.sleep(5)
                     print(f"DEBUG: Extracted final translation: {final_translation[:200]}...")
-                    stages.append(f"Cultural Localization:\n{final_translation}\n")
+                    self._record_stage(stages, "Cultural Localization", "localized_text", section_type, final_translation, section_index, section_part)
                     if intermediate_callback:
                         intermediate_callback("final", final_translation)
                     break # Success
@@ -680,30 +1390,97 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
             if progress_callback: progress_callback("Translation stopped by user.\n")
             return {"initial": initial_translation, "edited": line_edited, "final": final_translation, "back_translation": ""}, stages
 
-        # Stil rehberini çevrilen metinle dinamik olarak güncelle
-        self.update_style_guide(
-            original_section_text, final_translation, genre,
-            parsed_characters, parsed_cultural_context, parsed_main_themes, parsed_setting_atmosphere,
+        return self._finalize_section_translation(
+            original_section_text, section_type, initial_translation, line_edited, final_translation, stages,
+            genre, parsed_characters, parsed_cultural_context, parsed_main_themes, parsed_setting_atmosphere,
             source_language, target_language, target_country,
-            progress_callback=progress_callback, max_retries=max_retries, stop_event=stop_event
+            progress_callback=progress_callback, stop_event=stop_event, max_retries=max_retries,
+            intermediate_callback=intermediate_callback, update_style_guide=update_style_guide,
+            user_defined_terms=user_defined_terms
         )
-        print(f"DEBUG: Dynamic style guide update completed for section type '{section_type}'.")
-        
-        # Geri çeviriyi yap ve sonucu callback ile gönder
-        back_translated_text = self.back_translate(
-            final_translation, target_language, source_language, progress_callback, max_retries
-        )
-        if intermediate_callback:
-            intermediate_callback("back_translation", back_translated_text)
+
+    def _with_marker_instructions(self, prompt: str, source_text: str) -> str:
+        """Kaynak metinde korunması gereken işaretler varsa, bunları değiştirmeme talimatını prompt'un başına ekler."""
+        instructions = []
+        if has_repeated_paragraph_markers(source_text):
+            instructions.append(REPEATED_PARAGRAPH_MARKER_INSTRUCTION)
+        if BATCH_MARKER.search(source_text or ""):
+            instructions.append(BATCH_MARKER_INSTRUCTION)
+        if not instructions:
+            return prompt
+        return "MARKERS (STRICT):\n" + "\n".join(instructions) + "\n\n" + prompt
+
+    def _record_stage(self, stages: List[Dict[str, Any]], stage_name: str, field: str, section_type: str, text: str, section_index: int = None, section_part: str = ""):
+        """
+        Tamamlanan bir aşamayı kaydeder. Metnin kopyası tutulmaz; metin bölüm deposunda `field` alanında saklanır.
+        Kayıt hem çağrının `stages` listesine hem de sınırlı oturum geçmişine (translation_stages) eklenir.
+        section_index kaydın ait olduğu bölümü (birden çok bölümü kapsayan toplu çevirilerde None), section_part ise güvenlik bölmesinde hangi parçaya ait olduğunu gösterir.
+        """
+        entry = {
+            "stage": stage_name, "field": field, "section_type": section_type, "section_index": section_index,
+            "part": section_part, "chars": len(text or ""), "time": time.time()
+        }
+        stages.append(entry)
+        self.translation_stages.append(entry)
+
+    def _finalize_section_translation(self, original_section_text: str, section_type: str, initial_translation: str, line_edited: str, final_translation: str, stages: List[Dict[str, Any]], genre: str, parsed_characters: Dict[str, Any], parsed_cultural_context: Dict[str, Any], parsed_main_themes: Dict[str, Any], parsed_setting_atmosphere: Dict[str, Any], source_language: str, target_language: str, target_country: str, progress_callback=None, stop_event=None, max_retries=3, intermediate_callback=None, update_style_guide: bool = True, user_defined_terms: str = "") -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Çeviri aşamaları tamamlandıktan sonraki ortak adım: stil rehberi güncellemesi.
+        Hem tam (üç aşamalı) hem de hızlı (tek çağrılı) profil tarafından kullanılır.
+        Geri çeviri burada yapılmaz; uygulama tarafından ana çeviriden sonra ayrı bir geçiş olarak planlanır.
+        """
+        # Stil rehberini çevrilen metinle dinamik olarak güncelle
+        if not update_style_guide:
+            # İki geçişli modda ilk geçiş sabit (dondurulmuş) stil rehberiyle çalışır
+            pass
+        elif self.style_guide_update_mode == "batched":
+            # Güncelleme kritik yoldan çıkarıldı: çift kuyruğa eklenir, arka planda toplu işlenir
+            self.queue_style_guide_update(
+                original_section_text, final_translation, genre,
+                parsed_characters, parsed_cultural_context, parsed_main_themes, parsed_setting_atmosphere,
+                source_language, target_language, target_country,
+                progress_callback=progress_callback, max_retries=max_retries, stop_event=stop_event
+            )
+        else:
+            self.update_style_guide(
+                original_section_text, final_translation, genre,
+                parsed_characters, parsed_cultural_context, parsed_main_themes, parsed_setting_atmosphere,
+                source_language, target_language, target_country,
+                progress_callback=progress_callback, max_retries=max_retries, stop_event=stop_event
+            )
+            print(f"DEBUG: Dynamic style guide update completed for section type '{section_type}'.")
 
         translation_results = {
             "initial": initial_translation,
             "edited": line_edited,
             "final": final_translation,
-            "back_translation": back_translated_text
+            "back_translation": "",
+            # Nihai çevirinin yerel kalite raporu (bölüm düzenleyicide ve geri çeviri kararında kullanılır)
+            "qa": check_translation(
+                strip_repeated_paragraph_markers(original_section_text), strip_repeated_paragraph_markers(final_translation), source_language, target_language,
+                glossary=parse_glossary(user_defined_terms), names=list(parsed_characters.keys())
+            )
         }
         return translation_results, stages
 
+    def _run_stage_qa(self, stage_name: str, original_text: str, stage_text: str, source_language: str, target_language: str, user_defined_terms: str, characters: Dict[str, Any], attempt: int, max_retries: int, progress_callback=None) -> Dict[str, Any]:
+        """
+        Bir aşamanın çıktısını yerel kalite kontrollerinden geçirir.
+        Ciddi sorun varsa ve deneme hakkı kaldıysa QualityCheckError yükselterek yeniden denemeyi tetikler.
+        """
+        if not self.qa_enabled:
+            return {}
+        # Önceden çevrilmiş paragraf işaretleri kontrol dışında tutulur (kaynakta zaten çeviri metni taşırlar)
+        report = check_translation(
+            strip_repeated_paragraph_markers(original_text), strip_repeated_paragraph_markers(stage_text), source_language, target_language,
+            glossary=parse_glossary(user_defined_terms), names=list(characters.keys())
+        )
+        if report["issues"] and progress_callback:
+            progress_callback("log_qa_stage_report", stage=stage_name, score=report["score"], issues=len(report["issues"]))
+        if report["severe"] and attempt < max_retries - 1:
+            raise QualityCheckError(stage_name, report)
+        return report
+
     def _handle_translation_error(self, e, stage_name, section_type, attempt, max_retries, retry_delay, progress_callback):
         """Hata yönetimi için yardımcı fonksiyon."""
         full_error_message = str(e)
@@ -717,6 +1494,13 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
             if actual_block_reason_match:
                 ui_display_message = f"API Engelleme Geri Bildirimi ({stage_name} / {section_type}): {feedback_details_part}"
         
+        if isinstance(e, QualityCheckError):
+            ui_display_message = f"Yerel kalite kontrolü başarısız ({stage_name} / {section_type}): {full_error_message}"
+        elif isinstance(e, TruncatedOutputError):
+            ui_display_message = f"Çıktı, {e.continuations} devam isteğinden sonra da token sınırında kesik kaldı ({stage_name} / {section_type}). Bölüm parçalara ayrılarak çevrilecek."
+        elif isinstance(e, SafetyBlockError) and not ui_display_message:
+            ui_display_message = f"İçerik güvenlik filtresince engellendi ({stage_name} / {section_type}). Bölüm parçalara ayrılarak çevrilecek."
+
         if not ui_display_message:
             if "The `response.parts` quick accessor" in full_error_message:
                 ui_display_message = f"API yanıtı '{stage_name}' için alınamadı (SDK teknik hatası). Lütfen logları kontrol edin."
@@ -730,6 +1514,9 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         if progress_callback:
             progress_callback(f"  - Çeviri Hatası (Deneme {attempt + 1}/{max_retries}): {ui_display_message}\n")
 
+        if isinstance(e, (SafetyBlockError, TruncatedOutputError)):
+            # Aynı içerikle yeniden denemek yine engellenir veya yine kesik kalır; bölme işlemi translate_section'da yapılır
+            raise e
         if attempt < max_retries - 1:
             logger.info(f"Retrying '{stage_name}' for '{section_type}' in {retry_delay} seconds...")
             time.sleep(retry_delay)
@@ -841,6 +1628,10 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
 
     def _extract_response_text(self, response, stage_name, progress_callback):
         """Helper to extract text from Gemini response and handle safety issues."""
+        return self._strip_response_markers(self._extract_raw_response_text(response, stage_name, progress_callback))
+
+    def _extract_raw_response_text(self, response, stage_name, progress_callback):
+        """Gemini yanıtındaki ham metni (işaretler temizlenmeden) döndürür; içerik yoksa güvenlik ayrıntılarıyla hata yükseltir."""
         
         prompt_feedback_details = []
         if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
@@ -883,7 +1674,7 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
             hasattr(response.parts[0], 'text') and
             response.parts[0].text is not None):
             
-            text_content = response.parts[0].text.strip()
+            text_content = response.parts[0].text
             # print(f"DEBUG: Successfully extracted text directly from parts[0] for {stage_name}. Length: {len(text_content)}")
 
         else: # Conditions for direct text extraction from parts[0].text not met
@@ -919,8 +1710,17 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
             if progress_callback:
                 progress_callback(f"Error in {stage_name}: {full_error_message}\n")
             print(f"RAISING EXCEPTION (from _extract_response_text due to unsuitable parts): {full_error_message}")
+            finish_reason = response.candidates[0].finish_reason if getattr(response, 'candidates', None) else None
+            if (hasattr(response, 'prompt_feedback') and response.prompt_feedback and response.prompt_feedback.block_reason) or \
+               getattr(finish_reason, 'name', str(finish_reason)) in SAFETY_FINISH_REASONS:
+                raise SafetyBlockError(full_error_message)
             raise Exception(full_error_message)
-        
+
+        return text_content
+
+    def _strip_response_markers(self, text_content: str) -> str:
+        """Yanıttaki ---BEGIN/---END işaretleri arasındaki metni alır; işaret yoksa yanıtı fallback ile temizler."""
+        text_content = text_content.strip()
         # If text_content is successfully extracted, proceed with marker cleaning
         # Try to extract content between markers, if markers exist
         start_marker_str = "---BEGIN"
@@ -1006,10 +1806,10 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                     target_language=target_language,
                     target_country=target_country, # Pass target_country here
                     progress_callback=progress_callback,
-                    stop_event=stop_event
+                    stop_event=stop_event,
+                    section_index=i
                 )
                 translated_sections_data.append({"type": section_data["type"], "text": translated_text})
-                self.translation_stages.extend(stages)
 
             return translated_sections_data
 
@@ -1025,11 +1825,12 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         """
         self.translation_memory[original] = translation
 
-    def get_translation_stages() -> List[Dict[str, str]]:
+    def get_translation_stages(self) -> List[Dict[str, Any]]:
         """
         Get the list of translation stages for the last translation.
+        Kayıtlar aşama metnini değil, metnin saklandığı bölüm alanını ("field") gösterir.
         """
-        return self.translation_stages
+        return list(self.translation_stages)
 
     def back_translate(self, translated_text: str, target_language: str, source_language: str, progress_callback=None, max_retries: int = 3, retry_delay: int = 5) -> str:
         """
@@ -1048,16 +1849,9 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
             try:
                 if progress_callback: progress_callback("log_back_translation_attempt", attempt=attempt + 1, max_retries=max_retries)
                 
-                if self.ai_model == "gemini":
-                    response = self.model.generate_content(current_back_translation_prompt, safety_settings=self.safety_settings)
-                    back_translated_text = self._extract_response_text(response, "Back Translation", progress_callback)
-                elif self.ai_model == "chatgpt":
-                    response = openai.chat.completions.create(
-                        model=self.model,
-                        messages=[{"role": "user", "content": current_back_translation_prompt}]
-                    )
-                    raw_response_text = response.choices[0].message.content.strip()
-                    back_translated_text = self._clean_ai_response_fallback(raw_response_text)
+                back_translated_text = self._generate_stage_text("back_translation", current_back_translation_prompt, "Back Translation", progress_callback)
+                if self.ai_model == "chatgpt":
+                    back_translated_text = self._clean_ai_response_fallback(back_translated_text)
                 
                 if progress_callback: progress_callback("log_back_translation_success")
                 return back_translated_text
@@ -1066,7 +1860,7 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                 error_message = f"Geri çeviri hatası (Deneme {attempt + 1}/{max_retries}): {str(e)}"
                 print(error_message)
                 if progress_callback: progress_callback("log_back_translation_error", error=str(e))
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and not isinstance(e, (SafetyBlockError, TruncatedOutputError)):
                     time.sleep(retry_delay)
                 else:
                     return f"[Back-translation failed after {max_retries} retries: {str(e)}]"
@@ -1086,6 +1880,14 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         """Geri çeviri promptunu günceller."""
         self.back_translation_prompt = new_prompt
 
+    def update_harmonization_prompt(self, new_prompt: str):
+        """Uyumlaştırma (ikinci geçiş) promptunu günceller."""
+        self.harmonization_prompt = new_prompt
+
+    def update_term_translation_prompt(self, new_prompt: str):
+        """Aday terim çevirisi (sözlük ön hazırlığı) promptunu günceller."""
+        self.term_translation_prompt = new_prompt
+
     # Çeviri promptlarını güncelleme metodları (Örnek olarak eklendi, diğerleri de benzer şekilde eklenebilir)
     def update_initial_translation_prompt(self, new_prompt: str):
         """İlk çeviri promptunu günceller."""
@@ -1099,6 +1901,10 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
         """Kültürel yerelleştirme promptunu günceller."""
         self.cultural_prompt = new_prompt
 
+    def update_fast_translation_prompt(self, new_prompt: str):
+        """Hızlı mod (tek çağrılı) çeviri promptunu günceller."""
+        self.fast_translation_prompt = new_prompt
+
     def get_all_prompts(self, default=False) -> Dict[str, str]:
         """Tüm düzenlenebilir promptları döndürür. default=True ise varsayılanları döndürür."""
         if default:
@@ -1106,18 +1912,24 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
                 "initial_translation": self.default_initial_prompt,
                 "line_edit": self.default_line_edit_prompt,
                 "cultural_localization": self.default_cultural_prompt,
+                "fast_translation": self.default_fast_translation_prompt,
                 "style_guide_generation": self.default_style_guide_generation_prompt,
                 "style_guide_update": self.default_style_guide_update_prompt,
-                "back_translation": self.default_back_translation_prompt
+                "back_translation": self.default_back_translation_prompt,
+                "harmonization": self.default_harmonization_prompt,
+                "term_translation": self.default_term_translation_prompt
             }
         else:
             return {
                 "initial_translation": self.initial_prompt,
                 "line_edit": self.line_edit_prompt,
                 "cultural_localization": self.cultural_prompt,
+                "fast_translation": self.fast_translation_prompt,
                 "style_guide_generation": self.style_guide_generation_prompt,
                 "style_guide_update": self.style_guide_update_prompt,
-                "back_translation": self.back_translation_prompt
+                "back_translation": self.back_translation_prompt,
+                "harmonization": self.harmonization_prompt,
+                "term_translation": self.term_translation_prompt
             }
 
     def set_all_prompts(self, prompts: Dict[str, str]):
@@ -1128,9 +1940,15 @@ YOUR RESPONSE MUST BEGIN WITH THE FIRST WORD OF THE BACK-TRANSLATION AND END WIT
             self.line_edit_prompt = prompts["line_edit"]
         if "cultural_localization" in prompts:
             self.cultural_prompt = prompts["cultural_localization"]
+        if "fast_translation" in prompts:
+            self.fast_translation_prompt = prompts["fast_translation"]
         if "style_guide_generation" in prompts:
             self.style_guide_generation_prompt = prompts["style_guide_generation"]
         if "style_guide_update" in prompts:
             self.style_guide_update_prompt = prompts["style_guide_update"]
         if "back_translation" in prompts:
             self.back_translation_prompt = prompts["back_translation"]
+        if "harmonization" in prompts:
+            self.harmonization_prompt = prompts["harmonization"]
+        if "term_translation" in prompts:
+            self.term_translation_prompt = prompts["term_translation"]